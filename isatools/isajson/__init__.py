@@ -5,5 +5,5 @@ https://isa-specs.readthedocs.io/en/latest/isajson.html
 """
 
 from isatools.isajson.load import load
-from isatools.isajson.dump import ISAJSONEncoder
-from isatools.isajson.validate import validate, batch_validate, default_config_dir, load_config
+from isatools.isajson.dump import ISAJSONEncoder, dump
+from isatools.isajson.validate import validate, batch_validate, iter_batch_validate, default_config_dir, load_config
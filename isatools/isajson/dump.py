@@ -1,5 +1,7 @@
 from json import JSONEncoder
 
+from isatools.model import Assay, Investigation, Study
+
 
 class ISAJSONEncoder(JSONEncoder):
     def default(self, o):
@@ -8,3 +10,123 @@ class ISAJSONEncoder(JSONEncoder):
             if callable(method):
                 return o.to_dict()
         return JSONEncoder.default(self, o)
+
+
+# The arrays written one item at a time by dump(..., stream=True), by JSON path
+_STREAMED_ARRAYS = (
+    (Investigation, {('studies',): 'studies'}),
+    (Study, {
+        ('materials', 'sources'): 'sources',
+        ('materials', 'samples'): 'samples',
+        ('materials', 'otherMaterials'): 'other_material',
+        ('processSequence',): 'process_sequence',
+        ('assays',): 'assays'
+    }),
+    (Assay, {
+        ('materials', 'otherMaterials'): 'other_material',
+        ('dataFiles',): 'data_files',
+        ('processSequence',): 'process_sequence'
+    })
+)
+
+
+class _StreamedArray(object):
+    """An array of the dict of an ISA object, whose items are encoded when
+    written"""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class _WithoutArrays(object):
+    """Forwards the attributes of an ISA object, but the streamed arrays that
+    are left empty, so its to_dict() does not serialize them"""
+
+    def __init__(self, isa_obj, attributes):
+        self._isa_obj = isa_obj
+        self._attributes = attributes
+
+    def __getattr__(self, name):
+        if name in self._attributes:
+            return []
+        return getattr(self._isa_obj, name)
+
+
+def _get_streamed_dict(isa_obj):
+    for isa_type, arrays in _STREAMED_ARRAYS:
+        if isinstance(isa_obj, isa_type):
+            break
+    else:
+        return None
+    isa_dict = type(isa_obj).to_dict(_WithoutArrays(isa_obj, set(arrays.values())))
+    for json_path, attribute in arrays.items():
+        parent = isa_dict
+        for key in json_path[:-1]:
+            parent = parent[key]
+        parent[json_path[-1]] = _StreamedArray(getattr(isa_obj, attribute))
+    return isa_dict
+
+
+def _has_streamed_array(value):
+    if isinstance(value, _StreamedArray):
+        return True
+    return isinstance(value, dict) and any(_has_streamed_array(item) for item in value.values())
+
+
+def _iterencode(encoder, value, indent, level):
+    isa_dict = _get_streamed_dict(value)
+    if isa_dict is not None:
+        value = isa_dict
+    if not _has_streamed_array(value):
+        chunk = encoder.encode(value)
+        yield chunk.replace('\n', '\n' + indent * level) if indent is not None else chunk
+        return
+    if isinstance(value, _StreamedArray):
+        if not value.items:
+            yield '[]'
+            return
+        items = ((None, item) for item in value.items)
+        begin, end = '[', ']'
+    else:
+        if not value:
+            yield '{}'
+            return
+        items = sorted(value.items()) if encoder.sort_keys else value.items()
+        begin, end = '{', '}'
+    yield begin
+    separator = encoder.item_separator
+    if indent is not None:
+        separator += '\n' + indent * (level + 1)
+        yield '\n' + indent * (level + 1)
+    for position, (key, item) in enumerate(items):
+        if position:
+            yield separator
+        if key is not None:
+            yield encoder.encode(key) + encoder.key_separator
+        yield from _iterencode(encoder, item, indent, level + 1)
+    if indent is not None:
+        yield '\n' + indent * level
+    yield end
+
+
+def dump(isa_obj, fp, stream=False, **kwargs):
+    """Writes an ISA object to a file as ISA-JSON, as
+    json.dump(isa_obj, fp, cls=ISAJSONEncoder, **kwargs) does
+
+    :param isa_obj: The ISA object to write, usually an Investigation
+    :param fp: A text file-like object
+    :param stream: Write the studies, assays, materials and processes one at
+    a time, so the dict of the whole investigation is never built. The JSON
+    written is the same.
+    :param kwargs: The options of json.dump(), such as indent or sort_keys
+    """
+    encoder = kwargs.pop('cls', ISAJSONEncoder)(**kwargs)
+    if not stream:
+        chunks = encoder.iterencode(isa_obj)
+    else:
+        indent = encoder.indent
+        if indent is not None and not isinstance(indent, str):
+            indent = ' ' * indent
+        chunks = _iterencode(encoder, isa_obj, indent, 0)
+    for chunk in chunks:
+        fp.write(chunk)
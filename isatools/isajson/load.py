@@ -1,15 +1,194 @@
 import json
+import re
+from codecs import getincrementaldecoder
 
 from isatools.model import Investigation
 
+try:
+    import orjson as fast_json
+except ImportError:
+    try:
+        import ujson as fast_json
+    except ImportError:
+        fast_json = None
 
-def load(fp):
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_END = re.compile(r'[0-9+\-.eE]*\Z')
+
+
+def loads(data):
+    """Parses a JSON document, with orjson or ujson when one of them is
+    installed. Documents they do not read, such as the ones with NaN values,
+    are parsed by the json module.
+
+    :param data: The JSON document, as a string or bytes
+    :return: The parsed document
+    """
+    if fast_json is not None:
+        try:
+            return fast_json.loads(data)
+        except (ValueError, OverflowError):
+            pass
+    return json.loads(data)
+
+
+class _JSONReader(object):
+    """Reads the values of a JSON document from a file one at a time, so
+    the values of a large array can be dropped once used
+
+    :param fp: A text or binary file-like object
+    :param chunk_size: The number of characters to read at once
+    """
+
+    def __init__(self, fp, chunk_size=1 << 20):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = None
+
+    def _fill(self):
+        data = None
+        while not data:
+            data = self.fp.read(max(self.chunk_size, len(self.buffer) - self.position))
+            if not isinstance(data, bytes):
+                break
+            if self.text_decoder is None:
+                self.text_decoder = getincrementaldecoder('utf-8-sig')()
+            if not data:
+                data = self.text_decoder.decode(b'', final=True)
+                break
+            data = self.text_decoder.decode(data)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return True
+
+    def peek(self):
+        """Skips the whitespace and gets the next character
+
+        :return: The next character, left unread
+        :raise JSONDecodeError: at the end of the file
+        """
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                raise json.JSONDecodeError('Expecting value', self.buffer, self.position)
+
+    def expect(self, characters):
+        """Reads the next character, one of the given ones
+
+        :param characters: The characters expected
+        :return: The character read
+        :raise JSONDecodeError: if another character is found
+        """
+        character = self.peek()
+        if character not in characters:
+            raise json.JSONDecodeError('Expecting one of {!r}'.format(characters), self.buffer, self.position)
+        self.position += 1
+        return character
+
+    def value(self):
+        """Reads the next JSON value
+
+        :return: The parsed value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number may go on in the part of the file not read yet
+            if isinstance(value, (int, float)) and _NUMBER_END.match(self.buffer, end) and self._fill():
+                continue
+            self.position = end
+            return value
+
+    def iter_object_keys(self):
+        """Yields the keys of the next JSON object. The value of each key
+        must be read before getting the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def iter_array(self):
+        """Yields the values of the next JSON array"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def _load_incremental(fp):
+    reader = _JSONReader(fp)
+    investigation_json = {}
+    keys = reader.iter_object_keys()
+    for key in keys:
+        # the studies reference the ontology sources, that must be loaded first
+        if key == 'studies' and 'ontologySourceReferences' in investigation_json:
+            break
+        investigation_json[key] = reader.value()
+    else:
+        investigation = Investigation()
+        investigation.from_dict(investigation_json)
+        return investigation
+
+    fields_after_studies = {}
+
+    def iter_studies():
+        for study_json in reader.iter_array():
+            yield study_json
+        for next_key in keys:
+            fields_after_studies[next_key] = reader.value()
+
+    investigation = Investigation()
+    investigation.from_dict(dict(investigation_json, studies=iter_studies()))
+    if fields_after_studies:
+        fields_json = dict(investigation_json, **fields_after_studies)
+        fields_json['studies'] = []
+        fields = Investigation()
+        fields.from_dict(fields_json)
+        for attribute in ('identifier', 'title', 'description', 'submission_date', 'public_release_date',
+                          'comments', 'contacts', 'publications'):
+            setattr(investigation, attribute, getattr(fields, attribute))
+    return investigation
+
+
+def load(fp, incremental=False):
     """Loads an ISA-JSON file and returns an Investigation object.
 
     :param fp: A file-like object or a string containing the JSON data.
+    :param incremental: Parse the studies one at a time, releasing the JSON of
+    each study once its objects are built, instead of parsing the whole file
+    first. The studies are parsed this way if the ontology source references
+    come before them in the file, as isatools writes them.
     :return: An Investigation object.
     """
-    investigation_json = json.load(fp)
+    if incremental:
+        return _load_incremental(fp)
+    investigation_json = loads(fp.read())
     investigation = Investigation()
     investigation.from_dict(investigation_json)
     return investigation
@@ -10,10 +10,21 @@ import json
 import logging
 import os
 import re
+import threading
+from codecs import BOM_UTF8
 from io import StringIO
+from urllib.parse import urljoin
 from jsonschema import Draft4Validator, RefResolver, ValidationError
 
-from isatools.isajson.load import load
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+from isatools.isajson.load import load, loads
+from isatools.model import Assay, FactorValue, OntologyAnnotation, OntologySource, Sample, Study, StudyFactor
+from isatools.model.loader_indexes import loader_states as indexes, use_store
+from isatools.utils import iter_process_results
 
 __author__ = 'djcomlab@gmail.com (David Johnson)'
 
@@ -28,6 +39,13 @@ _RX_DOI = re.compile("(10[.][0-9]{4,}(?:[.][0-9]+)*/(?:(?![%'#? ])\\S)+)")
 _RX_PMID = re.compile("[0-9]{8}")
 _RX_PMCID = re.compile("PMC[0-9]{8}")
 
+# Draft4Validator is used without a format checker, so the generated validator
+# must not check the formats either
+_UNCHECKED_FORMATS = ('date', 'date-time', 'email', 'hostname', 'ipv4', 'ipv6', 'regex', 'uri', 'uri-reference')
+
+_schema_validators = {}
+_schema_validators_lock = threading.Lock()
+
 
 """Everything below here is for the validator"""
 
@@ -70,8 +88,10 @@ def get_io_ids_in_process_sequence(study_json):
 
 def check_material_ids_declared_used(study_json, id_collector_func):
     """Used for rules 1015-1018"""
-    node_ids = id_collector_func(study_json)
-    io_ids_in_process_sequence = get_io_ids_in_process_sequence(study_json)
+    _check_material_ids_declared_used(id_collector_func(study_json), get_io_ids_in_process_sequence(study_json))
+
+
+def _check_material_ids_declared_used(node_ids, io_ids_in_process_sequence):
     is_node_ids_used = set(node_ids).issubset(set(io_ids_in_process_sequence))
     if not is_node_ids_used:
         warnings.append({
@@ -89,7 +109,10 @@ def check_material_ids_not_declared_used(study_json):
                + get_sample_ids(study_json) \
                + get_material_ids(study_json) \
                + get_data_file_ids(study_json)
-    io_ids_in_process_sequence = get_io_ids_in_process_sequence(study_json)
+    _check_material_ids_not_declared_used(node_ids, get_io_ids_in_process_sequence(study_json))
+
+
+def _check_material_ids_not_declared_used(node_ids, io_ids_in_process_sequence):
     if len(set(io_ids_in_process_sequence)) - len(set(node_ids)) > 0:
         diff = set(io_ids_in_process_sequence) - set(node_ids)
         errors.append({
@@ -104,32 +127,42 @@ def check_material_ids_not_declared_used(study_json):
 
 def check_process_sequence_links(process_sequence_json):
     """Used for rule 1006"""
+    _check_process_sequence_links(*get_process_sequence_links(process_sequence_json))
+
+
+def get_process_sequence_links(process_sequence_json):
+    """Used for rule 1006
+
+    :return: The ids of the processes, and the previousProcess and nextProcess
+    links as (link key, linked process id, process id) tuples
+    """
     process_ids = [process["@id"] for process in process_sequence_json]
+    links = list()
     for process in process_sequence_json:
-        try:
-            if process["previousProcess"]["@id"] not in process_ids:
-                errors.append({
-                    "message": "Missing Process link",
-                    "supplemental": "previousProcess {} in process {} does not refer to another process in "
-                                    "sequence".format(process["previousProcess"]["@id"], process["@id"]),
-                    "code": 1006
-                })
+        for link_key in ("previousProcess", "nextProcess"):
+            try:
+                links.append((link_key, process[link_key]["@id"], process["@id"]))
+            except KeyError:
+                pass
+    return process_ids, links
+
+
+def _check_process_sequence_links(process_ids, links):
+    process_ids = set(process_ids)
+    for link_key, linked_process_id, process_id in links:
+        if linked_process_id not in process_ids:
+            errors.append({
+                "message": "Missing Process link",
+                "supplemental": "{} {} in process {} does not refer to another process in "
+                                "sequence".format(link_key, linked_process_id, process_id),
+                "code": 1006
+            })
+            if link_key == "previousProcess":
                 log.error("(E) previousProcess link {} in process {} does not refer to another process in "
-                          "sequence".format(process["previousProcess"]["@id"], process["@id"]))
-        except KeyError:
-            pass
-        try:
-            if process["nextProcess"]["@id"] not in process_ids:
-                errors.append({
-                    "message": "Missing Process link",
-                    "supplemental": "nextProcess {} in process {} does not refer to another process in "
-                                    "sequence".format(process["nextProcess"]["@id"], process["@id"]),
-                    "code": 1006
-                })
+                          "sequence".format(linked_process_id, process_id))
+            else:
                 log.error("(E) nextProcess {} in process {} does not refer to another process in sequence".format(
-                    process["nextProcess"]["@id"], process["@id"]))
-        except KeyError:
-            pass
+                    linked_process_id, process_id))
 
 
 def get_study_protocol_ids(study_json):
@@ -154,6 +187,10 @@ def check_process_protocol_ids_usage(study_json):
                 protocol_ids_used.append(process["executesProtocol"]["@id"])
             except KeyError:
                 pass
+    _check_process_protocol_ids_usage(protocol_ids_declared, protocol_ids_used)
+
+
+def _check_process_protocol_ids_usage(protocol_ids_declared, protocol_ids_used):
     if len(set(protocol_ids_used) - set(protocol_ids_declared)) > 0:
         diff = set(protocol_ids_used) - set(protocol_ids_declared)
         errors.append({
@@ -196,9 +233,12 @@ def get_parameter_value_parameter_ids(study_json):
 
 def check_protocol_parameter_ids_usage(study_json):
     """Used for rule 1009 and 1020"""
-    protocols_declared = get_study_protocols_parameter_ids(study_json) + [
-        "#parameter/Array_Design_REF"]  # + special case
-    protocols_used = get_parameter_value_parameter_ids(study_json)
+    _check_protocol_parameter_ids_usage(get_study_protocols_parameter_ids(study_json),
+                                        get_parameter_value_parameter_ids(study_json))
+
+
+def _check_protocol_parameter_ids_usage(parameter_ids_declared, protocols_used):
+    protocols_declared = parameter_ids_declared + ["#parameter/Array_Design_REF"]  # + special case
     if len(set(protocols_used) - set(protocols_declared)) > 0:
         diff = set(protocols_used) - set(protocols_declared)
         errors.append({
@@ -256,6 +296,10 @@ def check_characteristic_category_ids_usage(studies_json):
         for assay in study_json["assays"]:
             characteristic_categories_used_in_assay = get_characteristic_category_ids_in_assay_materials(assay)
             characteristic_categories_used += characteristic_categories_used_in_assay
+    _check_characteristic_category_ids_usage(characteristic_categories_declared, characteristic_categories_used)
+
+
+def _check_characteristic_category_ids_usage(characteristic_categories_declared, characteristic_categories_used):
     if len(set(characteristic_categories_used) - set(characteristic_categories_declared)) > 0:
         diff = set(characteristic_categories_used) - set(characteristic_categories_declared)
         errors.append({
@@ -289,8 +333,11 @@ def get_study_factor_ids_in_sample_factor_values(study_json):
 
 def check_study_factor_usage(study_json):
     """Used for rules 1008 and 1021"""
-    factors_declared = get_study_factor_ids(study_json)
-    factors_used = get_study_factor_ids_in_sample_factor_values(study_json)
+    _check_study_factor_usage(get_study_factor_ids(study_json),
+                              get_study_factor_ids_in_sample_factor_values(study_json))
+
+
+def _check_study_factor_usage(factors_declared, factors_used):
     if len(set(factors_used) - set(factors_declared)) > 0:
         diff = set(factors_used) - set(factors_declared)
         errors.append({
@@ -366,6 +413,10 @@ def check_unit_category_ids_usage(study_json):
     log.info("Getting units used (assay)...")
     for assay in study_json["assays"]:
         units_used.extend(get_assay_unit_category_ids_in_materials_and_processes(assay))
+    _check_unit_category_ids_usage(units_declared, units_used)
+
+
+def _check_unit_category_ids_usage(units_declared, units_used):
     log.info("Comparing units declared vs units used...")
     if len(set(units_used) - set(units_declared)) > 0:
         diff = set(units_used) - set(units_declared)
@@ -386,27 +437,121 @@ def check_utf8(fp):
     """Used for rule 0010"""
     import chardet
     with open(fp.name, "rb") as fp:
-        charset = chardet.detect(fp.read())
-        if charset["encoding"].upper() != "UTF-8" and charset["encoding"].lower() != "ascii":
-            warnings.append({
-                "message": "File should be UTF8 encoding",
-                "supplemental": "Encoding is '{0}' with confidence {1}".format(charset["encoding"],
-                                                                               charset["confidence"]),
-                "code": 10
-            })
-            log.warning("(W) File should be UTF-8 encoding but found it is '{0}' encoding with {1} confidence"
-                        .format(charset["encoding"], charset["confidence"]))
-            raise SystemError()
+        _check_charset(chardet.detect(fp.read()))
+
+
+def read_utf8(fp, detect_size=1 << 16):
+    """Used for rule 0010
+
+    Reads the file once, as strict UTF-8. Only if it is not, its encoding is
+    detected, on the bytes around the first one that is not UTF-8, or on the
+    first bytes if the file starts with a byte order mark.
+
+    :param fp: A file-like object with a name
+    :param detect_size: The number of bytes the encoding is detected on
+    :return: The text of the file, or None if it is not strict UTF-8 but is
+    detected as UTF-8 or ASCII
+    :raise SystemError: if another encoding is detected
+    """
+    import chardet
+    with open(fp.name, "rb") as binary_fp:
+        data = binary_fp.read()
+    start = 0
+    if not data.startswith(BOM_UTF8):
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            start = max(0, e.start - detect_size // 2)
+    _check_charset(chardet.detect(data[start:start + detect_size]))
+    return None
+
+
+def _check_charset(charset):
+    if charset["encoding"].upper() != "UTF-8" and charset["encoding"].lower() != "ascii":
+        warnings.append({
+            "message": "File should be UTF8 encoding",
+            "supplemental": "Encoding is '{0}' with confidence {1}".format(charset["encoding"],
+                                                                           charset["confidence"]),
+            "code": 10
+        })
+        log.warning("(W) File should be UTF-8 encoding but found it is '{0}' encoding with {1} confidence"
+                    .format(charset["encoding"], charset["confidence"]))
+        raise SystemError()
+
+
+class SchemaValidator(object):
+    """Validates ISA-JSON against an investigation schema. The schema and the
+    schemas of its directory, that it references, are read once, so no $ref is
+    resolved from a file or from the network when validating.
+
+    If fastjsonschema is installed, the schemas are also compiled to a
+    generated validator. The documents it rejects are validated again by
+    jsonschema, which gives the error message.
+
+    :param investigation_schema_path: Path to investigation_schema.json
+    """
+
+    def __init__(self, investigation_schema_path):
+        with open(investigation_schema_path) as fp:
+            investigation_schema = json.load(fp)
+        # the $ref are resolved against the id of the schemas, their URL
+        base_uri = investigation_schema.get("id", "")
+        store = {}
+        for schema_path in glob.glob(os.path.join(os.path.dirname(investigation_schema_path), "*.json")):
+            with open(schema_path) as fp:
+                schema = json.load(fp)
+            store["file://" + schema_path] = schema
+            store[urljoin(base_uri, os.path.basename(schema_path))] = schema
+        resolver = RefResolver("file://" + investigation_schema_path, investigation_schema, store=store)
+        self.validator = Draft4Validator(investigation_schema, resolver=resolver)
+        # the resolver keeps the scope of the $ref being validated
+        self.lock = threading.Lock()
+        self.fast_validate = None
+        if fastjsonschema is not None:
+            definition = dict(investigation_schema)
+            definition["$schema"] = "http://json-schema.org/draft-04/schema#"
+            handlers = {scheme: store.__getitem__ for scheme in ("file", "http", "https")}
+            try:
+                self.fast_validate = fastjsonschema.compile(
+                    definition, handlers=handlers, formats={name: lambda value: True for name in _UNCHECKED_FORMATS})
+            except Exception as e:
+                log.debug("Could not compile {} with fastjsonschema: {}".format(investigation_schema_path, e))
+
+    def validate(self, isa_json):
+        """Validates ISA-JSON against the schemas
+
+        :param isa_json: The ISA-JSON dict
+        :raise ValidationError: if the JSON is not valid
+        """
+        if self.fast_validate is not None:
+            try:
+                self.fast_validate(isa_json)
+                return
+            except fastjsonschema.JsonSchemaException:
+                pass
+        with self.lock:
+            self.validator.validate(isa_json)
+
+
+def get_schema_validator(investigation_schema_path):
+    """Gets the SchemaValidator of an investigation schema, built once per
+    schema path in a process
+
+    :param investigation_schema_path: Path to investigation_schema.json
+    :return: A SchemaValidator
+    """
+    key = os.path.normpath(os.path.abspath(investigation_schema_path))
+    with _schema_validators_lock:
+        validator = _schema_validators.get(key)
+        if validator is None:
+            validator = _schema_validators[key] = SchemaValidator(key)
+    return validator
 
 
 def check_isa_schemas(isa_json, investigation_schema_path):
     """Used for rule 0003 and 4003"""
     try:
-        with open(investigation_schema_path) as fp:
-            investigation_schema = json.load(fp)
-            resolver = RefResolver("file://" + investigation_schema_path, investigation_schema)
-            validator = Draft4Validator(investigation_schema, resolver=resolver)
-            validator.validate(isa_json)
+        get_schema_validator(investigation_schema_path).validate(isa_json)
     except ValidationError as ve:
         errors.append({
             "message": "Invalid JSON against ISA-JSON schemas",
@@ -418,22 +563,24 @@ def check_isa_schemas(isa_json, investigation_schema_path):
         raise SystemError("(F) The JSON does not validate against the provided ISA-JSON schemas!")
 
 
-def check_date_formats(isa_json):
+def _check_iso8601_date(date_str):
     """Used for rule 3001"""
+    import iso8601
+    if date_str != "":
+        try:
+            iso8601.parse_date(date_str)
+        except iso8601.ParseError:
+            warnings.append({
+                "message": "Date is not ISO8601 formatted",
+                "supplemental": "Found {} in date field".format(date_str),
+                "code": 3001
+            })
+            log.warning("(W) Date {} does not conform to ISO8601 format".format(date_str))
 
-    def check_iso8601_date(date_str):
-        if date_str != "":
-            try:
-                iso8601.parse_date(date_str)
-            except iso8601.ParseError:
-                warnings.append({
-                    "message": "Date is not ISO8601 formatted",
-                    "supplemental": "Found {} in date field".format(date_str),
-                    "code": 3001
-                })
-                log.warning("(W) Date {} does not conform to ISO8601 format".format(date_str))
 
-    import iso8601
+def check_date_formats(isa_json):
+    """Used for rule 3001"""
+    check_iso8601_date = _check_iso8601_date
     try:
         check_iso8601_date(isa_json["publicReleaseDate"])
     except KeyError:
@@ -458,19 +605,21 @@ def check_date_formats(isa_json):
                 pass
 
 
-def check_dois(isa_json):
+def _check_doi(doi_str):
     """Used for rule 3002"""
+    if doi_str != "":
+        if not _RX_DOI.match(doi_str):
+            warnings.append({
+                "message": "DOI is not valid format",
+                "supplemental": "Found {} in DOI field".format(doi_str),
+                "code": 3002
+            })
+            log.warning("(W) DOI {} does not conform to DOI format".format(doi_str))
 
-    def check_doi(doi_str):
-        if doi_str != "":
-            if not _RX_DOI.match(doi_str):
-                warnings.append({
-                    "message": "DOI is not valid format",
-                    "supplemental": "Found {} in DOI field".format(doi_str),
-                    "code": 3002
-                })
-                log.warning("(W) DOI {} does not conform to DOI format".format(doi_str))
 
+def check_dois(isa_json):
+    """Used for rule 3002"""
+    check_doi = _check_doi
     for ipub in isa_json["publications"]:
         try:
             check_doi(ipub["doi"])
@@ -487,36 +636,48 @@ def check_dois(isa_json):
 def check_filenames_present(isa_json):
     """Used for rule 3005"""
     for s_pos, study in enumerate(isa_json["studies"]):
-        if study["filename"] == "":
-            warnings.append({
-                "message": "Missing study file name",
-                "supplemental": "At study position {}".format(s_pos),
-                "code": 3005
-            })
-            log.warning("(W) A study filename is missing")
+        _check_study_filename(study["filename"], s_pos)
         for a_pos, assay in enumerate(study["assays"]):
-            if assay["filename"] == "":
-                warnings.append({
-                    "message": "Missing assay file name",
-                    "supplemental": "At study position {}, assay position {}".format(s_pos, a_pos),
-                    "code": 3005
-                })
-                log.warning("(W) An assay filename is missing")
+            _check_assay_filename(assay["filename"], s_pos, a_pos)
 
 
-def check_pubmed_ids_format(isa_json):
+def _check_study_filename(filename, s_pos):
+    """Used for rule 3005"""
+    if filename == "":
+        warnings.append({
+            "message": "Missing study file name",
+            "supplemental": "At study position {}".format(s_pos),
+            "code": 3005
+        })
+        log.warning("(W) A study filename is missing")
+
+
+def _check_assay_filename(filename, s_pos, a_pos):
+    """Used for rule 3005"""
+    if filename == "":
+        warnings.append({
+            "message": "Missing assay file name",
+            "supplemental": "At study position {}, assay position {}".format(s_pos, a_pos),
+            "code": 3005
+        })
+        log.warning("(W) An assay filename is missing")
+
+
+def _check_pubmed_id(pubmed_id_str):
     """Used for rule 3003"""
+    if pubmed_id_str != "":
+        if (_RX_PMID.match(pubmed_id_str) is None) and (_RX_PMCID.match(pubmed_id_str) is None):
+            warnings.append({
+                "message": "PubMed ID is not valid format",
+                "supplemental": "Found PubMedID {}".format(pubmed_id_str),
+                "code": 3003
+            })
+            log.warning("(W) PubMed ID {} is not valid format".format(pubmed_id_str))
 
-    def check_pubmed_id(pubmed_id_str):
-        if pubmed_id_str != "":
-            if (_RX_PMID.match(pubmed_id_str) is None) and (_RX_PMCID.match(pubmed_id_str) is None):
-                warnings.append({
-                    "message": "PubMed ID is not valid format",
-                    "supplemental": "Found PubMedID {}".format(pubmed_id_str),
-                    "code": 3003
-                })
-                log.warning("(W) PubMed ID {} is not valid format".format(pubmed_id_str))
 
+def check_pubmed_ids_format(isa_json):
+    """Used for rule 3003"""
+    check_pubmed_id = _check_pubmed_id
     for ipub in isa_json["publications"]:
         check_pubmed_id(ipub["pubMedID"])
     for study in isa_json["studies"]:
@@ -528,14 +689,19 @@ def check_protocol_names(isa_json):
     """Used for rule 1010"""
     for study in isa_json["studies"]:
         for protocol in study["protocols"]:
-            if protocol["name"] == "":
-                warnings.append({
-                    "message": "Protocol missing name",
-                    "supplemental": "Protocol @id={}".format(protocol["@id"]),
-                    "code": 1010
-                })
-                log.warning("(W) A Protocol {} is missing Protocol Name, so can't be referenced in ISA-tab"
-                            .format(protocol["@id"]))
+            _check_protocol_name(protocol)
+
+
+def _check_protocol_name(protocol):
+    """Used for rule 1010"""
+    if protocol["name"] == "":
+        warnings.append({
+            "message": "Protocol missing name",
+            "supplemental": "Protocol @id={}".format(protocol["@id"]),
+            "code": 1010
+        })
+        log.warning("(W) A Protocol {} is missing Protocol Name, so can't be referenced in ISA-tab"
+                    .format(protocol["@id"]))
 
 
 def check_protocol_parameter_names(isa_json):
@@ -543,40 +709,55 @@ def check_protocol_parameter_names(isa_json):
     for study in isa_json["studies"]:
         for protocol in study["protocols"]:
             for parameter in protocol["parameters"]:
-                if parameter["parameterName"] == "":
-                    warnings.append({
-                        "message": "Protocol Parameter missing name",
-                        "supplemental": "Protocol Parameter @id={}".format(parameter["@id"]),
-                        "code": 1011
-                    })
-                    log.warning("(W) A Protocol Parameter {} is missing name, so can't be referenced in ISA-tab"
-                                .format(parameter["@id"]))
+                _check_protocol_parameter_name(parameter)
+
+
+def _check_protocol_parameter_name(parameter):
+    """Used for rule 1011"""
+    if parameter["parameterName"] == "":
+        warnings.append({
+            "message": "Protocol Parameter missing name",
+            "supplemental": "Protocol Parameter @id={}".format(parameter["@id"]),
+            "code": 1011
+        })
+        log.warning("(W) A Protocol Parameter {} is missing name, so can't be referenced in ISA-tab"
+                    .format(parameter["@id"]))
 
 
 def check_study_factor_names(isa_json):
     """Used for rule 1012"""
     for study in isa_json["studies"]:
         for factor in study["factors"]:
-            if factor["factorName"] == "":
-                warnings.append({
-                    "message": "Study Factor missing name",
-                    "supplemental": "Study Factor @id={}".format(factor["@id"]),
-                    "code": 1012
-                })
-                log.warning("(W) A Study Factor is missing name, so can't be referenced in ISA-tab"
-                            .format(factor["@id"]))
+            _check_study_factor_name(factor)
+
+
+def _check_study_factor_name(factor):
+    """Used for rule 1012"""
+    if factor["factorName"] == "":
+        warnings.append({
+            "message": "Study Factor missing name",
+            "supplemental": "Study Factor @id={}".format(factor["@id"]),
+            "code": 1012
+        })
+        log.warning("(W) A Study Factor is missing name, so can't be referenced in ISA-tab"
+                    .format(factor["@id"]))
 
 
 def check_ontology_sources(isa_json):
     """Used for rule 3008"""
     for ontology_source in isa_json["ontologySourceReferences"]:
-        if ontology_source["name"] == "":
-            warnings.append({
-                "message": "Ontology Source missing name ref",
-                "supplemental": "name={}".format(ontology_source["name"]),
-                "code": 3008
-            })
-            log.warning("(W) An Ontology Source Reference is missing Term Source Name, so can't be referenced")
+        _check_ontology_source(ontology_source)
+
+
+def _check_ontology_source(ontology_source):
+    """Used for rule 3008"""
+    if ontology_source["name"] == "":
+        warnings.append({
+            "message": "Ontology Source missing name ref",
+            "supplemental": "name={}".format(ontology_source["name"]),
+            "code": 3008
+        })
+        log.warning("(W) An Ontology Source Reference is missing Term Source Name, so can't be referenced")
 
 
 def get_ontology_source_refs(isa_json):
@@ -609,6 +790,10 @@ def check_term_source_refs(isa_json):
     term_sources_declared = get_ontology_source_refs(isa_json)
     collector = list()
     walk_and_get_annotations(isa_json, collector)
+    _check_term_source_refs(term_sources_declared, collector)
+
+
+def _check_term_source_refs(term_sources_declared, collector):
     term_sources_used = [annotation["termSource"] for annotation in collector if annotation["termSource"] != ""]
     if len(set(term_sources_used) - set(term_sources_declared)) > 0:
         diff = set(term_sources_used) - set(term_sources_declared)
@@ -634,6 +819,10 @@ def check_term_accession_used_no_source_ref(isa_json):
     """Used for rule 3010"""
     collector = list()
     walk_and_get_annotations(isa_json, collector)
+    _check_term_accession_used_no_source_ref(collector)
+
+
+def _check_term_accession_used_no_source_ref(collector):
     terms_using_accession_no_source_ref = [
         annotation for annotation in collector if annotation["termAccession"] != "" and annotation["termSource"] == ""
     ]
@@ -648,6 +837,254 @@ def check_term_accession_used_no_source_ref(isa_json):
                     .format(terms_using_accession_no_source_ref))
 
 
+_ANNOTATION_KEYS = ({"annotationValue", "termAccession", "termSource"},
+                    {"@id", "annotationValue", "termAccession", "termSource"})
+
+
+def _iter_annotations(isa_json):
+    """Used for rules 3007, 3009 and 3010
+
+    Yields the ontology annotations of the JSON in the order
+    walk_and_get_annotations() collects them, without recursion
+    """
+    stack = [isa_json] if isinstance(isa_json, (dict, list)) else []
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if "termSource" in value and set(value.keys()) in _ANNOTATION_KEYS:
+                yield value
+            value = value.values()
+        # only the dicts and lists are walked further
+        stack.extend(reversed([item for item in value if isinstance(item, (dict, list))]))
+
+
+class _StudyIndex(object):
+    """The ids, references and values of a study and of its assays read by the
+    validation rules, in the order the get_* functions list them"""
+
+    def __init__(self, study_json):
+        self.filename = study_json["filename"]
+        self.dates = [study_json[key] for key in ("publicReleaseDate", "submissionDate") if key in study_json]
+        self.publications = study_json["publications"]
+        self.protocols = study_json["protocols"]
+        self.protocol_ids = [protocol["@id"] for protocol in self.protocols]
+        self.parameters = [parameter for protocol in self.protocols for parameter in protocol["parameters"]]
+        self.parameter_ids = [parameter["@id"] for parameter in self.parameters]
+        self.factors = study_json["factors"]
+        self.factor_ids = [factor["@id"] for factor in self.factors]
+        self.characteristic_category_ids = get_characteristic_category_ids(study_json)
+        self.unit_ids = get_unit_category_ids(study_json)
+
+        materials = study_json["materials"]
+        self.source_ids = [source["@id"] for source in materials["sources"]]
+        self.sample_ids = [sample["@id"] for sample in materials["samples"]]
+        self.characteristic_category_ids_used = []
+        characteristic_unit_ids = []
+        for material in materials["sources"] + materials["samples"]:
+            for characteristic in material["characteristics"]:
+                self.characteristic_category_ids_used.append(
+                    characteristic["category"]["@id"].replace("#ontology_annotation", "#characteristic_category"))
+                if "unit" in characteristic.keys():
+                    characteristic_unit_ids.append(characteristic["unit"]["@id"])
+        self.factor_value_ids = []
+        factor_value_unit_ids = []
+        for sample in materials["samples"]:
+            for factor_value in sample["factorValues"]:
+                self.factor_value_ids.append(factor_value["category"]["@id"])
+                if "unit" in factor_value.keys():
+                    factor_value_unit_ids.append(factor_value["unit"]["@id"])
+
+        self.io_ids = []
+        self.protocol_ids_used = []
+        self.parameter_value_ids = []
+        self.process_sequence_links = [get_process_sequence_links(study_json["processSequence"])]
+        parameter_value_unit_ids = self._read_process_sequence(study_json["processSequence"])
+        for process in study_json["processSequence"]:
+            try:
+                self.dates.append(process["date"])
+            except KeyError:
+                pass
+        unit_ids_used = characteristic_unit_ids + factor_value_unit_ids + parameter_value_unit_ids
+        self.unit_ids_used = [unit_id for unit_id in unit_ids_used if unit_id is not None]
+
+        self.material_ids = []
+        self.data_file_ids = []
+        self.assay_filenames = []
+        for assay_json in study_json["assays"]:
+            self.material_ids.extend([material["@id"] for material in assay_json["materials"]["otherMaterials"]])
+            self.data_file_ids.extend([data_file["@id"] for data_file in assay_json["dataFiles"]])
+            self.assay_filenames.append(assay_json["filename"])
+            self.characteristic_category_ids.extend(get_characteristic_category_ids(assay_json))
+            self.characteristic_category_ids_used.extend(
+                get_characteristic_category_ids_in_assay_materials(assay_json))
+            self.unit_ids.extend(get_unit_category_ids(assay_json))
+            self.process_sequence_links.append(get_process_sequence_links(assay_json["processSequence"]))
+            characteristic_unit_ids = [
+                characteristic["unit"]["@id"] if "unit" in characteristic.keys() else None
+                for material in assay_json["materials"]["otherMaterials"]
+                for characteristic in material["characteristics"]
+            ]
+            parameter_value_unit_ids = self._read_process_sequence(assay_json["processSequence"])
+            self.unit_ids_used.extend([unit_id for unit_id in characteristic_unit_ids + parameter_value_unit_ids
+                                       if unit_id is not None])
+
+    def _read_process_sequence(self, process_sequence_json):
+        parameter_value_unit_ids = []
+        for process in process_sequence_json:
+            self.io_ids.extend([input_["@id"] for input_ in process["inputs"]])
+            self.io_ids.extend([output["@id"] for output in process["outputs"]])
+            try:
+                self.protocol_ids_used.append(process["executesProtocol"]["@id"])
+            except KeyError:
+                pass
+            for parameter_value in process["parameterValues"]:
+                self.parameter_value_ids.append(parameter_value["category"]["@id"])
+                parameter_value_unit_ids.append(
+                    parameter_value["unit"]["@id"] if "unit" in parameter_value.keys() else None)
+        return parameter_value_unit_ids
+
+
+class ISAJSONIndex(object):
+    """The declarations and references of an ISA-JSON document checked by the
+    validation rules, read in one pass over the studies and one walk of the
+    document for the ontology annotations. check_rules() then evaluates the
+    rules against these lists, with the same findings, in the same order, as
+    the check_* functions reading the JSON.
+
+    :param isa_json: The ISA-JSON dict
+    :raise KeyError: if the JSON misses a key read by the rules
+    """
+
+    def __init__(self, isa_json):
+        self.ontology_sources = isa_json["ontologySourceReferences"]
+        self.dates = [isa_json[key] for key in ("publicReleaseDate", "submissionDate") if key in isa_json]
+        self.publications = isa_json["publications"]
+        self.studies = [_StudyIndex(study_json) for study_json in isa_json["studies"]]
+        self.annotations = list(_iter_annotations(isa_json))
+
+    def check_rules(self):
+        """Evaluates the rules 1002-1022, 3001-3010 on the index"""
+        for study in self.studies:
+            _check_material_ids_not_declared_used(
+                study.source_ids + study.sample_ids + study.material_ids + study.data_file_ids,
+                study.io_ids)  # Rules 1002-1005
+        for study in self.studies:
+            for node_ids in (study.source_ids, study.sample_ids, study.material_ids, study.data_file_ids):
+                _check_material_ids_declared_used(node_ids, study.io_ids)  # Rules 1015-1018
+        log.info("Checking characteristic categories usage...")
+        _check_characteristic_category_ids_usage(
+            [category_id for study in self.studies for category_id in study.characteristic_category_ids],
+            [category_id for study in self.studies for category_id in study.characteristic_category_ids_used]
+        )  # Rules 1013 and 1022
+        log.info("Checking study factor usage...")
+        for study in self.studies:
+            _check_study_factor_usage(study.factor_ids, study.factor_value_ids)  # Rules 1008 and 1021
+        log.info("Checking protocol parameter usage...")
+        for study in self.studies:
+            _check_protocol_parameter_ids_usage(study.parameter_ids, study.parameter_value_ids)  # Rules 1009 and 1020
+        log.info("Checking unit category usage...")
+        for study in self.studies:
+            _check_unit_category_ids_usage(study.unit_ids, study.unit_ids_used)  # Rules 1014 and 1022
+        log.info("Checking process sequences (study)...")
+        for study in self.studies:
+            for process_ids, links in study.process_sequence_links:
+                _check_process_sequence_links(process_ids, links)  # Rule 1006
+        log.info("Checking process protocol usage...")
+        for study in self.studies:
+            _check_process_protocol_ids_usage(study.protocol_ids, study.protocol_ids_used)  # Rules 1007 and 1019
+        log.info("Checking date formats...")
+        for date_str in self.dates + [date_str for study in self.studies for date_str in study.dates]:
+            _check_iso8601_date(date_str)  # Rule 3001
+        log.info("Checking DOI formats...")
+        publications = self.publications + [publication for study in self.studies for publication in
+                                            study.publications]
+        for publication in publications:
+            try:
+                _check_doi(publication["doi"])  # Rule 3002
+            except KeyError:
+                pass
+        log.info("Checking Pubmed ID formats...")
+        for publication in publications:
+            _check_pubmed_id(publication["pubMedID"])  # Rule 3003
+        log.info("Checking filenames are present...")
+        for s_pos, study in enumerate(self.studies):
+            _check_study_filename(study.filename, s_pos)  # Rule 3005
+            for a_pos, filename in enumerate(study.assay_filenames):
+                _check_assay_filename(filename, s_pos, a_pos)
+        log.info("Checking protocol names...")
+        for study in self.studies:
+            for protocol in study.protocols:
+                _check_protocol_name(protocol)  # Rule 1010
+        log.info("Checking protocol parameter names...")
+        for study in self.studies:
+            for parameter in study.parameters:
+                _check_protocol_parameter_name(parameter)  # Rule 1011
+        log.info("Checking study factor names...")
+        for study in self.studies:
+            for factor in study.factors:
+                _check_study_factor_name(factor)  # Rule 1012
+        log.info("Checking ontology sources...")
+        for ontology_source in self.ontology_sources:
+            _check_ontology_source(ontology_source)  # Rule 3008
+        log.info("Checking term source REFs...")
+        _check_term_source_refs([ontology_source["name"] for ontology_source in self.ontology_sources],
+                                self.annotations)  # Rules 3007 and 3009
+        log.info("Checking missing term source REFs...")
+        _check_term_accession_used_no_source_ref(self.annotations)  # Rule 3010
+
+
+def check_rules(isa_json):
+    """Evaluates the rules 1002-1022, 3001-3010 reading the JSON for each
+    rule"""
+    for study_json in isa_json["studies"]:
+        check_material_ids_not_declared_used(study_json)  # Rules 1002-1005
+    for study_json in isa_json["studies"]:
+        check_material_ids_declared_used(study_json, get_source_ids)  # Rule 1015
+        check_material_ids_declared_used(study_json, get_sample_ids)  # Rule 1016
+        check_material_ids_declared_used(study_json, get_material_ids)  # Rule 1017
+        check_material_ids_declared_used(study_json, get_data_file_ids)  # Rule 1018
+    log.info("Checking characteristic categories usage...")
+    check_characteristic_category_ids_usage(isa_json["studies"])  # Rules 1013 and 1022
+    log.info("Checking study factor usage...")
+    for study_json in isa_json["studies"]:
+        check_study_factor_usage(study_json)  # Rules 1008 and 1021
+    log.info("Checking protocol parameter usage...")
+    for study_json in isa_json["studies"]:
+        check_protocol_parameter_ids_usage(study_json)  # Rules 1009 and 1020
+    log.info("Checking unit category usage...")
+    for study_json in isa_json["studies"]:
+        check_unit_category_ids_usage(study_json)  # Rules 1014 and 1022
+    log.info("Checking process sequences (study)...")
+    for study_json in isa_json["studies"]:
+        check_process_sequence_links(study_json["processSequence"])  # Rule 1006
+        log.info("Checking process sequences (assay)...")
+        for assay_json in study_json["assays"]:
+            check_process_sequence_links(assay_json["processSequence"])  # Rule 1006
+    log.info("Checking process protocol usage...")
+    for study_json in isa_json["studies"]:
+        check_process_protocol_ids_usage(study_json)  # Rules 1007 and 1019
+    log.info("Checking date formats...")
+    check_date_formats(isa_json)  # Rule 3001
+    log.info("Checking DOI formats...")
+    check_dois(isa_json)  # Rule 3002
+    log.info("Checking Pubmed ID formats...")
+    check_pubmed_ids_format(isa_json)  # Rule 3003
+    log.info("Checking filenames are present...")
+    check_filenames_present(isa_json)  # Rule 3005
+    log.info("Checking protocol names...")
+    check_protocol_names(isa_json)  # Rule 1010
+    log.info("Checking protocol parameter names...")
+    check_protocol_parameter_names(isa_json)  # Rule 1011
+    log.info("Checking study factor names...")
+    check_study_factor_names(isa_json)  # Rule 1012
+    log.info("Checking ontology sources...")
+    check_ontology_sources(isa_json)  # Rule 3008
+    log.info("Checking term source REFs...")
+    check_term_source_refs(isa_json)  # Rules 3007 and 3009
+    log.info("Checking missing term source REFs...")
+    check_term_accession_used_no_source_ref(isa_json)  # Rule 3010
+
+
 def load_config(config_dir):
     print('CONFIG at: ', config_dir)
     import json
@@ -691,53 +1128,95 @@ def check_measurement_technology_types(assay_json, configs):
                   .format(measurement_type, technology_type))
 
 
-def check_study_and_assay_graphs(study_json, configs):
-    def check_assay_graph(process_sequence_json, config):
+def check_study_and_assay_graphs(study_json, configs, protocol_sequences=None):
+    """Checks that the protocols of each chain of processes follow the
+    protocol sequence of the study or assay configuration. Used for rule 4004
+
+    :param study_json: The study, as a dict
+    :param configs: The configurations, as returned by load_config()
+    :param protocol_sequences: A dict where the protocol sequence of each
+    configuration is cached, by configuration key, to share it across studies
+    """
+    if protocol_sequences is None:
+        protocol_sequences = dict()
+
+    def get_process_protocol_sequence(process):
+        process_graph = list()
+        if "outputs" in process.keys():
+            outputs = process["outputs"]
+            if len(outputs) > 0:
+                for output in outputs:
+                    output_id = output["@id"]
+                    process_graph.append(output_id)
+        protocol_id = protocols_and_types[process["executesProtocol"]["@id"]]
+        process_graph.append(protocol_id)
+        if "inputs" in process.keys():
+            inputs = process["inputs"]
+            if len(inputs) > 0:
+                for input_ in inputs:
+                    input_id = input_["@id"]
+                    process_graph.append(input_id)
+        process_graph.reverse()
+        return [i for i in process_graph if not i.startswith("#")]
+
+    def check_assay_graph(process_sequence_json, config_key):
+        config = configs[config_key]
         list_of_last_processes_in_sequence = [i for i in process_sequence_json if "nextProcess" not in i.keys()]
         log.info("Checking against assay protocol sequence configuration {}".format(config["description"]))
-        config_protocol_sequence = [i["protocol"] for i in config["protocols"]]
+        if config_key not in protocol_sequences:
+            protocol_sequences[config_key] = [i["protocol"] for i in config["protocols"]]
+        config_protocol_sequence = protocol_sequences[config_key]
+        processes = dict()
+        for process in process_sequence_json:
+            processes.setdefault(process["@id"], process)
+        # the protocol sequence of the chain ending at each process already walked, by id() of the process
+        chains = dict()
+        # the configuration check of each protocol sequence found, as (squished sequence of interest, matches)
+        checks = dict()
         for process in list_of_last_processes_in_sequence:  # build graphs backwards
-            assay_graph = list()
+            walked = list()
+            assay_protocol_sequence = list()
+            on_chain = set()
             try:
-                while True:
-                    process_graph = list()
-                    if "outputs" in process.keys():
-                        outputs = process["outputs"]
-                        if len(outputs) > 0:
-                            for output in outputs:
-                                output_id = output["@id"]
-                                process_graph.append(output_id)
-                    protocol_id = protocols_and_types[process["executesProtocol"]["@id"]]
-                    process_graph.append(protocol_id)
-                    if "inputs" in process.keys():
-                        inputs = process["inputs"]
-                        if len(inputs) > 0:
-                            for input_ in inputs:
-                                input_id = input_["@id"]
-                                process_graph.append(input_id)
-                    process_graph.reverse()
-                    assay_graph.append(process_graph)
-                    process = [i for i in process_sequence_json if i["@id"] == process["previousProcess"]["@id"]][0]
-                    if process['@id'] == process["previousProcess"]["@id"]:
+                while id(process) not in chains:
+                    process_protocol_sequence = get_process_protocol_sequence(process)
+                    walked.append((process, process_protocol_sequence))
+                    on_chain.add(id(process))
+                    previous_id = process["previousProcess"]["@id"]
+                    if previous_id not in processes:
+                        raise IndexError("list index out of range")
+                    process = processes[previous_id]
+                    if process['@id'] == process["previousProcess"]["@id"] or id(process) in on_chain:
                         log.fatal(
                             "Previous process is same as current process, which forms a loop!!!!!"
                             " Cannot find start node!!!!!!!")
                         break
+                else:
+                    assay_protocol_sequence = chains[id(process)]
             except KeyError:  # this happens when we can"t find a previousProcess
                 pass
-            assay_graph.reverse()
-            assay_protocol_sequence = [[j for j in i if not j.startswith("#")] for i in assay_graph]
-            assay_protocol_sequence = [i for j in assay_protocol_sequence for i in j]  # flatten list
-            assay_protocol_sequence_of_interest = [i for i in assay_protocol_sequence if i in config_protocol_sequence]
-            #  filter out protocols in sequence that are not of interest (additional ones to required by config)
-            squished_assay_protocol_sequence_of_interest = list()
-            prev_prot = None
-            for prot in assay_protocol_sequence_of_interest:  # remove consecutive same protocols
-                if prev_prot != prot:
-                    squished_assay_protocol_sequence_of_interest.append(prot)
-                prev_prot = prot
-            from isatools.utils import contains
-            if not contains(squished_assay_protocol_sequence_of_interest, config_protocol_sequence):
+            for walked_process, process_protocol_sequence in reversed(walked):
+                assay_protocol_sequence = assay_protocol_sequence + process_protocol_sequence
+                chains[id(walked_process)] = assay_protocol_sequence
+            sequence_key = tuple(assay_protocol_sequence)
+            if sequence_key not in checks:
+                assay_protocol_sequence_of_interest = [
+                    i for i in assay_protocol_sequence if i in config_protocol_sequence
+                ]
+                #  filter out protocols in sequence that are not of interest (additional ones to required by config)
+                squished_assay_protocol_sequence_of_interest = list()
+                prev_prot = None
+                for prot in assay_protocol_sequence_of_interest:  # remove consecutive same protocols
+                    if prev_prot != prot:
+                        squished_assay_protocol_sequence_of_interest.append(prot)
+                    prev_prot = prot
+                from isatools.utils import contains
+                checks[sequence_key] = (
+                    squished_assay_protocol_sequence_of_interest,
+                    contains(squished_assay_protocol_sequence_of_interest, config_protocol_sequence)
+                )
+            squished_assay_protocol_sequence_of_interest, matches = checks[sequence_key]
+            if not matches:
                 warnings.append({
                     "message": "Process sequence is not valid against configuration",
                     "supplemental": "Config protocol sequence {} does not in assay protocol sequence {}".format(
@@ -751,14 +1230,61 @@ def check_study_and_assay_graphs(study_json, configs):
     protocols_and_types = dict([(i["@id"], i["protocolType"]["annotationValue"]) for i in study_json["protocols"]])
     # first check study graph
     log.info("Loading configuration (study)")
-    config = configs["study"]
-    check_assay_graph(study_json["processSequence"], config)
+    check_assay_graph(study_json["processSequence"], "study")
     for assay_json in study_json["assays"]:
         m = assay_json["measurementType"]["annotationValue"]
         t = assay_json["technologyType"]["annotationValue"]
         log.info("Loading configuration ({}, {})".format(m, t))
-        config = configs[(m, t)]
-        check_assay_graph(assay_json["processSequence"], config)
+        check_assay_graph(assay_json["processSequence"], (m, t))
+
+
+def load_study_groups(isa_json):
+    """Builds the studies and assays of an ISA-JSON dict with only what
+    check_study_groups() reads: their identifier, comments and samples, with
+    the factor values of the samples. The JSON is not loaded into a whole
+    Investigation.
+
+    :param isa_json: The ISA-JSON dict
+    :return: A list of Study objects, with their assays
+    """
+    studies = []
+    with use_store():
+        for ontology_source_data in isa_json.get('ontologySourceReferences', []):
+            ontology_source = OntologySource('')
+            ontology_source.from_dict(ontology_source_data)
+            indexes.add_term_source(ontology_source)
+        for study_data in isa_json.get('studies', []):
+            study = Study(identifier=study_data.get('identifier', ''))
+            study.load_comments(study_data.get('comments', []))
+            for unit_data in study_data.get('unitCategories', []):
+                unit = OntologyAnnotation()
+                unit.from_dict(unit_data)
+                indexes.add_unit(unit)
+            for factor_data in study_data.get('factors', []):
+                factor = StudyFactor()
+                factor.from_dict(factor_data)
+                indexes.add_factor(factor)
+            samples = {}
+            for sample_data in study_data.get('materials', {}).get('samples', []):
+                sample = Sample()
+                for factor_value_data in sample_data.get('factorValues', []):
+                    factor_value = FactorValue()
+                    factor_value.from_dict(factor_value_data)
+                    sample.factor_values.append(factor_value)
+                study.samples.append(sample)
+                samples[sample_data.get('@id', '')] = sample
+            for assay_data in study_data.get('assays', []):
+                assay = Assay()
+                assay.load_comments(assay_data.get('comments', []))
+                for unit_data in assay_data.get('unitCategories', []):
+                    unit = OntologyAnnotation()
+                    unit.from_dict(unit_data)
+                    indexes.add_unit(unit)
+                assay.samples = [samples[sample_data['@id']]
+                                 for sample_data in assay_data.get('materials', {}).get('samples', [])]
+                study.assays.append(assay)
+            studies.append(study)
+    return studies
 
 
 def check_study_groups(study_or_assay):
@@ -809,8 +1335,21 @@ def validate(
         fp,
         config_dir=default_config_dir,
         log_level=None,
-        base_schemas_dir="isa_model_version_1_0_schemas"
+        base_schemas_dir="isa_model_version_1_0_schemas",
+        parse_once=False
 ):
+    """Validates an ISA-JSON file
+
+    :param fp: The ISA-JSON file, opened from a path
+    :param config_dir: The directory of the JSON configurations
+    :param log_level: The log level of the validation messages
+    :param base_schemas_dir: The directory of the ISA-JSON schemas
+    :param parse_once: Read and parse the file once: it is decoded as strict
+    UTF-8, its encoding is only detected, on a bounded part of it, if it is
+    not, and the study groups are counted from the parsed JSON instead of
+    loading the file again into an Investigation
+    :return: The validation report
+    """
     if config_dir is None:
         config_dir = default_config_dir
     if log_level in (
@@ -827,62 +1366,26 @@ def validate(
         global warnings
         warnings = list()
         log.info("Checking if encoding is UTF8")
-        check_utf8(fp=fp)  # Rule 0010
+        isa_json_text = None
+        if parse_once:
+            isa_json_text = read_utf8(fp=fp)  # Rule 0010
+        else:
+            check_utf8(fp=fp)  # Rule 0010
         log.info("Loading json from " + fp.name)
-        isa_json = json.load(fp=fp)  # Rule 0002
+        isa_json = loads(isa_json_text) if isa_json_text is not None else json.load(fp=fp)  # Rule 0002
         log.info("Validating JSON against schemas using Draft4Validator")
         check_isa_schemas(isa_json=isa_json,
                           investigation_schema_path=os.path.join(BASE_DIR,
                                                                  "..", "resources", "schemas", base_schemas_dir,
                                                                  "core", "investigation_schema.json"))  # Rule 0003
         log.info("Checking if material IDs used are declared...")
-        for study_json in isa_json["studies"]:
-            check_material_ids_not_declared_used(study_json)  # Rules 1002-1005
-        for study_json in isa_json["studies"]:
-            check_material_ids_declared_used(study_json, get_source_ids)  # Rule 1015
-            check_material_ids_declared_used(study_json, get_sample_ids)  # Rule 1016
-            check_material_ids_declared_used(study_json, get_material_ids)  # Rule 1017
-            check_material_ids_declared_used(study_json, get_data_file_ids)  # Rule 1018
-        log.info("Checking characteristic categories usage...")
-        check_characteristic_category_ids_usage(isa_json["studies"])  # Rules 1013 and 1022
-        log.info("Checking study factor usage...")
-        for study_json in isa_json["studies"]:
-            check_study_factor_usage(study_json)  # Rules 1008 and 1021
-        log.info("Checking protocol parameter usage...")
-        for study_json in isa_json["studies"]:
-            check_protocol_parameter_ids_usage(study_json)  # Rules 1009 and 1020
-        log.info("Checking unit category usage...")
-        for study_json in isa_json["studies"]:
-            check_unit_category_ids_usage(study_json)  # Rules 1014 and 1022
-        log.info("Checking process sequences (study)...")
-        for study_json in isa_json["studies"]:
-            check_process_sequence_links(study_json["processSequence"])  # Rule 1006
-            log.info("Checking process sequences (assay)...")
-            for assay_json in study_json["assays"]:
-                check_process_sequence_links(assay_json["processSequence"])  # Rule 1006
-        log.info("Checking process protocol usage...")
-        for study_json in isa_json["studies"]:
-            check_process_protocol_ids_usage(study_json)  # Rules 1007 and 1019
-        log.info("Checking date formats...")
-        check_date_formats(isa_json)  # Rule 3001
-        log.info("Checking DOI formats...")
-        check_dois(isa_json)  # Rule 3002
-        log.info("Checking Pubmed ID formats...")
-        check_pubmed_ids_format(isa_json)  # Rule 3003
-        log.info("Checking filenames are present...")
-        check_filenames_present(isa_json)  # Rule 3005
-        log.info("Checking protocol names...")
-        check_protocol_names(isa_json)  # Rule 1010
-        log.info("Checking protocol parameter names...")
-        check_protocol_parameter_names(isa_json)  # Rule 1011
-        log.info("Checking study factor names...")
-        check_study_factor_names(isa_json)  # Rule 1012
-        log.info("Checking ontology sources...")
-        check_ontology_sources(isa_json)  # Rule 3008
-        log.info("Checking term source REFs...")
-        check_term_source_refs(isa_json)  # Rules 3007 and 3009
-        log.info("Checking missing term source REFs...")
-        check_term_accession_used_no_source_ref(isa_json)  # Rule 3010
+        try:
+            index = ISAJSONIndex(isa_json)
+        except (KeyError, TypeError, AttributeError):
+            # each rule reads the JSON, so the missing key is reported after the findings of the rules before
+            check_rules(isa_json)  # Rules 1002-1022, 3001-3010
+        else:
+            index.check_rules()  # Rules 1002-1022, 3001-3010
         log.info("Loading configurations from " + config_dir)
         configs = load_config(config_dir)  # Rule 4001
         log.info("Checking measurement and technology types...")
@@ -904,13 +1407,14 @@ def validate(
             return stream
         fp.seek(0)  # reset file pointer
         log.info("Checking study and assay graphs...")
+        protocol_sequences = dict()
         for study_json in isa_json["studies"]:
-            check_study_and_assay_graphs(study_json, configs)  # Rule 4004
+            check_study_and_assay_graphs(study_json, configs, protocol_sequences)  # Rule 4004
         fp.seek(0)
         # try load and do study groups check
         log.info("Checking study groups...")
-        isa = load(fp)
-        for study in isa.studies:
+        studies = load_study_groups(isa_json) if parse_once else load(fp).studies
+        for study in studies:
             check_study_groups(study)
             for assay in study.assays:
                 check_study_groups(assay)
@@ -947,9 +1451,75 @@ def validate(
         }
 
 
-def batch_validate(json_file_list):
+def _validate_json_file(json_file):
+    """Validates an ISA-JSON file in a batch worker process
+
+    :param json_file: Path to the ISA-JSON file
+    :return: The validation report
+    """
+    with open(json_file) as fp:
+        return validate(fp)
+
+
+def iter_batch_validate(json_file_list, workers=None, ordered=True, timeout=None):
+    """Validate a batch of ISA-JSON files, yielding the report of each file as
+    it completes
+
+    :param json_file_list: List of file paths to the ISA-JSON files to validate
+    :param workers: Number of worker processes validating files concurrently.
+    By default, the files are validated one after another in this process
+    :param ordered: Whether to yield the reports in the order of
+    json_file_list, instead of as soon as they complete. Only used with
+    workers or timeout
+    :param timeout: Time in seconds after which the validation of a file is
+    stopped and reported as an error. Each file is then validated in a worker
+    process, even if workers is not set
+    :return: A generator of {"filename": ..., "report": ...} dictionaries
+    """
+    json_files = []
+    for json_file in json_file_list:
+        log.info("***Validating {}***\n".format(json_file))
+        if not os.path.isfile(json_file):
+            log.warning("Could not find ISA-JSON file, skipping {}".format(json_file))
+        else:
+            json_files.append(json_file)
+    if not (workers or timeout):
+        for json_file in json_files:
+            yield {"filename": json_file, "report": _validate_json_file(json_file)}
+        return
+    results = iter_process_results(_validate_json_file, json_files,
+                                   workers=workers or 1, timeout=timeout, ordered=ordered)
+    for index, report, error in results:
+        if isinstance(error, TimeoutError):
+            report = {
+                "errors": [{
+                    "message": "Validation timed out",
+                    "supplemental": "The validation of {} did not finish within {} seconds".format(
+                        json_files[index], timeout),
+                    "code": 0
+                }],
+                "warnings": [],
+                "validation_finished": False
+            }
+        elif error is not None:
+            report = {
+                "errors": [{
+                    "message": "Unknown/System Error",
+                    "supplemental": str(error),
+                    "code": 0
+                }],
+                "warnings": [],
+                "validation_finished": False
+            }
+        yield {"filename": json_files[index], "report": report}
+
+
+def batch_validate(json_file_list, workers=None, ordered=True, timeout=None):
     """ Validate a batch of ISA-JSON files
         :param json_file_list: List of file paths to the ISA-JSON files to validate
+        :param workers: Number of worker processes validating files concurrently
+        :param ordered: Whether to keep the reports in the order of json_file_list
+        :param timeout: Time in seconds after which the validation of a file is stopped and reported as an error
         :return: Dict of reports
 
         Example:
@@ -958,21 +1528,11 @@ def batch_validate(json_file_list):
                 "/path/to/study1.json",
                 "/path/to/study2.json"
             ]
-            my_reports = isajson.batch_validate(my_jsons)
+            my_reports = isajson.batch_validate(my_jsons, workers=4, timeout=600)
         """
     batch_report = {
         "batch_report": []
     }
-    for json_file in json_file_list:
-        log.info("***Validating {}***\n".format(json_file))
-        if not os.path.isfile(json_file):
-            log.warning("Could not find ISA-JSON file, skipping {}".format(json_file))
-        else:
-            with open(json_file) as fp:
-                batch_report["batch_report"].append(
-                    {
-                        "filename": fp.name,
-                        "report": validate(fp)
-                    }
-                )
+    for file_report in iter_batch_validate(json_file_list, workers=workers, ordered=ordered, timeout=timeout):
+        batch_report["batch_report"].append(file_report)
     return batch_report
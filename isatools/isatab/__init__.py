@@ -3,6 +3,7 @@ from isatools.isatab.dump import (
     dumps,
     write_study_table_files,
     write_assay_table_files,
+    write_table_files_concurrently,
     write_value_columns,
     dump_tables_to_dataframes
 )
@@ -13,11 +14,13 @@ from isatools.isatab.load import (
     preprocess,
     ProcessSequenceFactory,
     read_tfile,
-    load_table
+    load_table,
+    TableCache,
+    set_table_cache
 )
 from isatools.isatab.defaults import default_config_dir
 from isatools.isatab.utils import IsaTabDataFrame, TransposedTabParser
-from isatools.isatab.validate import validate, batch_validate
+from isatools.isatab.validate import validate, batch_validate, iter_batch_validate
 from isatools.isatab.deprecated import (
     get_multiple_index,
     find_in_between,
@@ -1,2 +1,7 @@
 from isatools.isatab.dump.core import dump, dumps, dump_tables_to_dataframes
-from isatools.isatab.dump.write import write_study_table_files, write_assay_table_files, write_value_columns
+from isatools.isatab.dump.write import (
+    write_study_table_files,
+    write_assay_table_files,
+    write_table_files_concurrently,
+    write_value_columns
+)
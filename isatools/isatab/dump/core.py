@@ -1,14 +1,16 @@
 from os import path
-from glob import iglob
-from tempfile import mkdtemp
-from shutil import rmtree
 from pandas import DataFrame
 
 from isatools.model import Investigation
 from isatools.isatab.defaults import _RX_I_FILE_NAME, log
-from isatools.utils import utf8_text_file_open
-from isatools.isatab.load import read_tfile
-from isatools.isatab.dump.write import write_study_table_files, write_assay_table_files
+from isatools.isatab.load import read_tfile_fp
+from isatools.isatab.dump.write import (
+    write_study_table_files,
+    write_assay_table_files,
+    write_table_files_concurrently,
+    open_output_file,
+    _is_sink
+)
 from isatools.isatab.dump.utils import (
     _build_ontology_reference_section,
     _build_contacts_section_df,
@@ -23,16 +25,22 @@ from isatools.isatab.dump.utils import (
 def dump(isa_obj, output_path,
          i_file_name='i_investigation.txt',
          skip_dump_tables=False,
-         write_factor_values_in_assay_table=False):
+         write_factor_values_in_assay_table=False,
+         workers=None):
     """Serializes ISA objects to ISA-Tab
 
     :param isa_obj: An ISA Investigation object
-    :param output_path: Path to write the ISA-Tab files to
+    :param output_path: Path to write the ISA-Tab files to, or a sink: a dict
+    which the files are added to as StringIO buffers by file name, or a
+    function returning a writable text file for a file name
     :param i_file_name: Overrides the default name for the investigation file
     :param skip_dump_tables: Boolean flag on whether or not to write the
     study sample table files and assay table files
     :param write_factor_values_in_assay_table: Boolean flag indicating whether
     or not to write Factor Values in the assay table files
+    :param workers: Number of worker processes used to write the study and
+    assay table files concurrently. By default, the tables are written one
+    after another in this process
     :return: None
     """
 
@@ -40,8 +48,8 @@ def dump(isa_obj, output_path,
         log.debug('investigation filename=', i_file_name)
         raise NameError('Investigation file must match pattern i_*.txt, got {}'.format(i_file_name))
 
-    if path.exists(output_path):
-        fp = open(path.join(output_path, i_file_name), 'w', encoding='utf-8')
+    if _is_sink(output_path) or path.exists(output_path):
+        fp = open_output_file(output_path, i_file_name, encoding='utf-8')
     else:
         log.debug('output_path=', i_file_name)
         raise FileNotFoundError("Can't find " + output_path)
@@ -166,6 +174,8 @@ def dump(isa_obj, output_path,
 
     if skip_dump_tables:
         pass
+    elif workers:
+        write_table_files_concurrently(investigation, output_path, write_factor_values_in_assay_table, workers)
     else:
         write_study_table_files(investigation, output_path)
         write_assay_table_files(investigation, output_path, write_factor_values_in_assay_table)
@@ -184,30 +194,16 @@ def dumps(isa_obj, skip_dump_tables=False,
         or not to write Factor Values in the assay table files
     :return: String output of the ISA-Tab files
     """
-    tmp = None
-    output = str()
-    try:
-        tmp = mkdtemp()
-        dump(isa_obj=isa_obj, output_path=tmp,
-             skip_dump_tables=skip_dump_tables,
-             write_factor_values_in_assay_table=write_fvs_in_assay_table)
-        with utf8_text_file_open(path.join(tmp, 'i_investigation.txt')) as i_fp:
-            output += path.join(tmp, 'i_investigation.txt') + '\n'
-            output += i_fp.read()
-        for s_file in iglob(path.join(tmp, 's_*')):
-            with utf8_text_file_open(s_file) as s_fp:
-                output += "--------\n"
-                output += s_file + '\n'
-                output += s_fp.read()
-        for a_file in iglob(path.join(tmp, 'a_*')):
-            with utf8_text_file_open(a_file) as a_fp:
-                output += "--------\n"
-                output += a_file + '\n'
-                output += a_fp.read()
-    finally:
-        if tmp is not None:
-            rmtree(tmp)
-    return output
+    buffers = {}
+    dump(isa_obj=isa_obj, output_path=buffers,
+         skip_dump_tables=skip_dump_tables,
+         write_factor_values_in_assay_table=write_fvs_in_assay_table)
+    output = ['i_investigation.txt\n', buffers.pop('i_investigation.txt').getvalue()]
+    for prefix in ('s_', 'a_'):
+        for file_name, buffer in buffers.items():
+            if file_name.startswith(prefix):
+                output += ["--------\n", file_name + '\n', buffer.getvalue()]
+    return ''.join(output)
 
 
 def dump_tables_to_dataframes(isa_obj):
@@ -217,16 +213,11 @@ def dump_tables_to_dataframes(isa_obj):
     :return: A dictionary containing ISA table filenames as keys and the
     corresponding tables as DataFrames as the values
     """
-    tmp = None
+    buffers = {}
+    dump(isa_obj=isa_obj, output_path=buffers, skip_dump_tables=False)
     output = dict()
-    try:
-        tmp = mkdtemp()
-        dump(isa_obj=isa_obj, output_path=tmp, skip_dump_tables=False)
-        for s_file in iglob(path.join(tmp, 's_*')):
-            output[path.basename(s_file)] = read_tfile(s_file)
-        for a_file in iglob(path.join(tmp, 'a_*')):
-            output[path.basename(a_file)] = read_tfile(a_file)
-    finally:
-        if tmp is not None:
-            rmtree(tmp)
+    for prefix in ('s_', 'a_'):
+        for file_name, buffer in buffers.items():
+            if file_name.startswith(prefix):
+                output[file_name] = read_tfile_fp(buffer)
     return output
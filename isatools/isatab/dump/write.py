@@ -1,7 +1,8 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
 from os import path
-
-from pandas import DataFrame
-from numpy import nan
+from pickle import dumps, loads
 
 from isatools.constants import SYNONYMS
 from isatools.model import (
@@ -12,10 +13,11 @@ from isatools.model import (
     Sample,
     load_protocol_types_info,
     DataFile,
-    Material
+    Material,
+    _build_process_graph
 )
 from isatools.isatab.defaults import log
-from isatools.isatab.graph import _all_end_to_end_paths, _longest_path_and_attrs
+from isatools.isatab.graph import _iter_end_to_end_paths, _longest_end_to_end_path
 from isatools.isatab.utils import (
     get_comment_column,
     get_pv_columns,
@@ -37,443 +39,595 @@ def write_study_table_files(inv_obj, output_dir):
     which should be equivalent to studySample.xml in default config
 
     :param inv_obj: An Investigation object containing ISA content
-    :param output_dir: A path to a directory to write the ISA-Tab study files
+    :param output_dir: A path to a directory to write the ISA-Tab study files,
+    or a sink, see open_output_file()
     :return: None
     """
     if not isinstance(inv_obj, Investigation):
         raise NotImplementedError
     for study_obj in inv_obj.studies:
-        s_graph = study_obj.graph
+        s_graph = study_obj.process_graph
 
         if s_graph is None:
             break
-        protrefcount = 0
-        protnames = dict()
-
-        def flatten(current_list):
-            return [item for sublist in current_list for item in sublist]
+        _write_study_table(s_graph, output_dir, study_obj.filename)
 
-        columns = []
 
-        # start_nodes, end_nodes = _get_start_end_nodes(s_graph)
-        paths = _all_end_to_end_paths(
-            s_graph,
-            [x for x in s_graph.nodes() if isinstance(s_graph.indexes[x], Source)])
-        log.warning(s_graph.nodes())
+def _write_study_table(s_graph, output_dir, file_name):
+    """Writes out the table file of a study
 
+    :param s_graph: The graph of the study
+    :param output_dir: The directory or sink to write the file to
+    :param file_name: The name of the study table file
+    :return: None
+    """
+    protrefcount = 0
+    protnames = dict()
+
+    def flatten(current_list):
+        return [item for sublist in current_list for item in sublist]
+
+    columns = []
+
+    # start_nodes, end_nodes = _get_start_end_nodes(s_graph)
+    start_nodes = [x for x in s_graph.nodes() if isinstance(s_graph.indexes[x], Source)]
+    log.warning(s_graph.nodes())
+
+    sample_in_path_count = 0
+    longest_path = _longest_end_to_end_path(s_graph, start_nodes)
+
+    for node_index in longest_path:
+        node = s_graph.indexes[node_index]
+        if isinstance(node, Source):
+            olabel = "Source Name"
+            columns.append(olabel)
+            columns += flatten(
+                map(lambda x: get_characteristic_columns(olabel, x),
+                    node.characteristics))
+            columns += flatten(
+                map(lambda x: get_comment_column(
+                    olabel, x), node.comments))
+        elif isinstance(node, Process):
+            olabel = "Protocol REF.{}".format(node.executes_protocol.name)
+            columns.append(olabel)
+            if node.executes_protocol.name not in protnames.keys():
+                protnames[node.executes_protocol.name] = protrefcount
+                protrefcount += 1
+            columns += flatten(map(lambda x: get_pv_columns(olabel, x),
+                                   node.parameter_values))
+            if node.date is not None:
+                columns.append(olabel + ".Date")
+            if node.performer is not None:
+                columns.append(olabel + ".Performer")
+            columns += flatten(
+                map(lambda x: get_comment_column(
+                    olabel, x), node.comments))
+
+        elif isinstance(node, Sample):
+            olabel = "Sample Name.{}".format(sample_in_path_count)
+            columns.append(olabel)
+            sample_in_path_count += 1
+            columns += flatten(
+                map(lambda x: get_characteristic_columns(olabel, x),
+                    node.characteristics))
+            columns += flatten(
+                map(lambda x: get_comment_column(
+                    olabel, x), node.comments))
+            columns += flatten(map(lambda x: get_fv_columns(olabel, x),
+                                   node.factor_values))
+
+    # the rows are sorted on their first column, the name of their start
+    # node
+    start_nodes = _sort_by_name(s_graph, start_nodes)
+    row_columns = list(columns)
+    omap = get_object_column_map(columns, columns)
+    column_keys = flatten(omap)
+
+    def render_row(path_):
+        # load into dictionary
+        df_dict = dict(map(lambda k: (k, [""]), column_keys))
         sample_in_path_count = 0
-        longest_path = _longest_path_and_attrs(paths, s_graph.indexes)
-
-        for node_index in longest_path:
+        for node_index in path_:
             node = s_graph.indexes[node_index]
             if isinstance(node, Source):
                 olabel = "Source Name"
-                columns.append(olabel)
-                columns += flatten(
-                    map(lambda x: get_characteristic_columns(olabel, x),
-                        node.characteristics))
-                columns += flatten(
-                    map(lambda x: get_comment_column(
-                        olabel, x), node.comments))
+                df_dict[olabel][-1] = node.name
+                for c in node.characteristics:
+                    category_label = c.category.term if isinstance(c.category.term, str) \
+                        else c.category.term["annotationValue"]
+                    clabel = "{0}.Characteristics[{1}]".format(
+                        olabel, category_label)
+                    write_value_columns(df_dict, clabel, c)
+                for co in node.comments:
+                    colabel = "{0}.Comment[{1}]".format(olabel, co.name)
+                    df_dict[colabel][-1] = co.value
+
             elif isinstance(node, Process):
-                olabel = "Protocol REF.{}".format(node.executes_protocol.name)
-                columns.append(olabel)
-                if node.executes_protocol.name not in protnames.keys():
-                    protnames[node.executes_protocol.name] = protrefcount
-                    protrefcount += 1
-                columns += flatten(map(lambda x: get_pv_columns(olabel, x),
-                                       node.parameter_values))
+                olabel = "Protocol REF.{}".format(
+                    node.executes_protocol.name)
+                df_dict[olabel][-1] = node.executes_protocol.name
+                for pv in node.parameter_values:
+                    pvlabel = "{0}.Parameter Value[{1}]".format(
+                        olabel, pv.category.parameter_name.term)
+                    write_value_columns(df_dict, pvlabel, pv)
                 if node.date is not None:
-                    columns.append(olabel + ".Date")
+                    df_dict[olabel + ".Date"][-1] = node.date
                 if node.performer is not None:
-                    columns.append(olabel + ".Performer")
-                columns += flatten(
-                    map(lambda x: get_comment_column(
-                        olabel, x), node.comments))
+                    df_dict[olabel + ".Performer"][-1] = node.performer
+                for co in node.comments:
+                    colabel = "{0}.Comment[{1}]".format(olabel, co.name)
+                    df_dict[colabel][-1] = co.value
 
             elif isinstance(node, Sample):
                 olabel = "Sample Name.{}".format(sample_in_path_count)
-                columns.append(olabel)
                 sample_in_path_count += 1
-                columns += flatten(
-                    map(lambda x: get_characteristic_columns(olabel, x),
-                        node.characteristics))
-                columns += flatten(
-                    map(lambda x: get_comment_column(
-                        olabel, x), node.comments))
-                columns += flatten(map(lambda x: get_fv_columns(olabel, x),
-                                       node.factor_values))
+                df_dict[olabel][-1] = node.name
+                for c in node.characteristics:
+                    category_label = c.category.term if isinstance(c.category.term, str) \
+                        else c.category.term["annotationValue"]
+                    clabel = "{0}.Characteristics[{1}]".format(
+                        olabel, category_label)
+                    write_value_columns(df_dict, clabel, c)
+                for co in node.comments:
+                    colabel = "{0}.Comment[{1}]".format(olabel, co.name)
+                    df_dict[colabel][-1] = co.value
+                for fv in node.factor_values:
+                    fvlabel = "{0}.Factor Value[{1}]".format(
+                        olabel, fv.factor_name.name)
+                    write_value_columns(df_dict, fvlabel, fv)
+
+        return [df_dict[k][-1] for k in row_columns]
+
+    paths = list(_iter_end_to_end_paths(s_graph, start_nodes))
+
+    def render_rows():
+        return map(render_row, paths)
+
+    for dup_item in set([x for x in columns if columns.count(x) > 1]):
+        for j, each in enumerate(
+                [i for i, x in enumerate(columns) if x == dup_item]):
+            columns[each] = dup_item + str(j)
+
+    for i, col in enumerate(columns):
+        if "Comment[" in col:
+            columns[i] = col[col.rindex(".") + 1:]
+        elif col.endswith("Term Source REF"):
+            columns[i] = "Term Source REF"
+        elif col.endswith("Term Accession Number"):
+            columns[i] = "Term Accession Number"
+        elif col.endswith("Unit"):
+            columns[i] = "Unit"
+        elif "Characteristics[" in col:
+            if "material type" in col.lower():
+                columns[i] = "Material Type"
+            else:
+                columns[i] = col[col.rindex(".") + 1:]
+        elif "Factor Value[" in col:
+            columns[i] = col[col.rindex(".") + 1:]
+        elif "Parameter Value[" in col:
+            columns[i] = col[col.rindex(".") + 1:]
+        elif col.endswith("Date"):
+            columns[i] = "Date"
+        elif col.endswith("Performer"):
+            columns[i] = "Performer"
+        elif "Protocol REF" in col:
+            columns[i] = "Protocol REF"
+        elif col.startswith("Sample Name."):
+            columns[i] = "Sample Name"
+
+    with open_output_file(output_dir, file_name) as out_fp:
+        num_rows = _write_table(out_fp, columns, render_rows)
+    log.debug("Wrote {} rows".format(num_rows))
 
-        omap = get_object_column_map(columns, columns)
-        # load into dictionary
-        df_dict = dict(map(lambda k: (k, []), flatten(omap)))
-
-        for path_ in paths:
-            for k in df_dict.keys():  # add a row per path
-                df_dict[k].extend([""])
-
-            sample_in_path_count = 0
-            for node_index in path_:
-                node = s_graph.indexes[node_index]
-                if isinstance(node, Source):
-                    olabel = "Source Name"
-                    df_dict[olabel][-1] = node.name
-                    for c in node.characteristics:
-                        category_label = c.category.term if isinstance(c.category.term, str) \
-                            else c.category.term["annotationValue"]
-                        clabel = "{0}.Characteristics[{1}]".format(
-                            olabel, category_label)
-                        write_value_columns(df_dict, clabel, c)
-                    for co in node.comments:
-                        colabel = "{0}.Comment[{1}]".format(olabel, co.name)
-                        df_dict[colabel][-1] = co.value
 
-                elif isinstance(node, Process):
-                    olabel = "Protocol REF.{}".format(
-                        node.executes_protocol.name)
-                    df_dict[olabel][-1] = node.executes_protocol.name
-                    for pv in node.parameter_values:
-                        pvlabel = "{0}.Parameter Value[{1}]".format(
-                            olabel, pv.category.parameter_name.term)
-                        write_value_columns(df_dict, pvlabel, pv)
-                    if node.date is not None:
-                        df_dict[olabel + ".Date"][-1] = node.date
-                    if node.performer is not None:
-                        df_dict[olabel + ".Performer"][-1] = node.performer
-                    for co in node.comments:
-                        colabel = "{0}.Comment[{1}]".format(olabel, co.name)
-                        df_dict[colabel][-1] = co.value
+def write_assay_table_files(inv_obj, output_dir, write_factor_values=False):
+    """Writes out assay table files according to pattern defined by
 
-                elif isinstance(node, Sample):
-                    olabel = "Sample Name.{}".format(sample_in_path_count)
-                    sample_in_path_count += 1
-                    df_dict[olabel][-1] = node.name
-                    for c in node.characteristics:
-                        category_label = c.category.term if isinstance(c.category.term, str) \
-                            else c.category.term["annotationValue"]
-                        clabel = "{0}.Characteristics[{1}]".format(
-                            olabel, category_label)
-                        write_value_columns(df_dict, clabel, c)
-                    for co in node.comments:
-                        colabel = "{0}.Comment[{1}]".format(olabel, co.name)
-                        df_dict[colabel][-1] = co.value
-                    for fv in node.factor_values:
-                        fvlabel = "{0}.Factor Value[{1}]".format(
-                            olabel, fv.factor_name.name)
-                        write_value_columns(df_dict, fvlabel, fv)
-        """if isinstance(pbar, ProgressBar):
-            pbar.finish()"""
+    Sample Name,
+    Protocol Ref: 'sample collection', [ ParameterValue[], ... ],
+    Material Name, [ Characteristics[], ... ]
+    [ FactorValue[], ... ]
 
-        DF = DataFrame(columns=columns)
-        DF = DF.from_dict(data=df_dict)
-        DF = DF[columns]  # reorder columns
-        DF = DF.sort_values(by=DF.columns[0], ascending=True)
-        # arbitrary sort on column 0
+    :param inv_obj: An Investigation object containing ISA content
+    :param output_dir: A path to a directory to write the ISA-Tab assay files,
+    or a sink, see open_output_file()
+    :param write_factor_values: Flag to indicate whether or not to write out
+    the Factor Value columns in the assay tables
+    :return: None
+    """
 
-        for dup_item in set([x for x in columns if columns.count(x) > 1]):
-            for j, each in enumerate(
-                    [i for i, x in enumerate(columns) if x == dup_item]):
-                columns[each] = dup_item + str(j)
+    if not isinstance(inv_obj, Investigation):
+        raise NotImplementedError
+    protocol_types_dict = load_protocol_types_info()
+    for study_obj in inv_obj.studies:
+        for assay_obj in study_obj.assays:
+            a_graph = assay_obj.process_graph
+            if a_graph is None:
+                break
+            _write_assay_table(a_graph, output_dir, assay_obj.filename, write_factor_values, protocol_types_dict)
 
-        DF.columns = columns  # reset columns after checking for dups
 
-        for i, col in enumerate(columns):
-            if "Comment[" in col:
-                columns[i] = col[col.rindex(".") + 1:]
-            elif col.endswith("Term Source REF"):
-                columns[i] = "Term Source REF"
-            elif col.endswith("Term Accession Number"):
-                columns[i] = "Term Accession Number"
-            elif col.endswith("Unit"):
-                columns[i] = "Unit"
-            elif "Characteristics[" in col:
-                if "material type" in col.lower():
-                    columns[i] = "Material Type"
-                else:
-                    columns[i] = col[col.rindex(".") + 1:]
-            elif "Factor Value[" in col:
-                columns[i] = col[col.rindex(".") + 1:]
-            elif "Parameter Value[" in col:
-                columns[i] = col[col.rindex(".") + 1:]
-            elif col.endswith("Date"):
-                columns[i] = "Date"
-            elif col.endswith("Performer"):
-                columns[i] = "Performer"
-            elif "Protocol REF" in col:
-                columns[i] = "Protocol REF"
-            elif col.startswith("Sample Name."):
-                columns[i] = "Sample Name"
+def _write_assay_table(a_graph, output_dir, file_name, write_factor_values, protocol_types_dict):
+    """Writes out the table file of an assay
 
-        log.debug("Rendered {} paths".format(len(DF.index)))
+    :param a_graph: The graph of the assay
+    :param output_dir: The directory or sink to write the file to
+    :param file_name: The name of the assay table file
+    :param write_factor_values: Flag to indicate whether or not to write out
+    the Factor Value columns
+    :param protocol_types_dict: The protocol types, from
+    load_protocol_types_info()
+    :return: None
+    """
 
-        DF_no_dups = DF.drop_duplicates()
-        if len(DF.index) > len(DF_no_dups.index):
-            log.debug("Dropping duplicates...")
-            DF = DF_no_dups
+    protrefcount = 0
+    protnames = dict()
+
+    def flatten(current_list):
+        return [item for sublist in current_list for item in sublist]
+
+    columns = []
+
+    # start_nodes, end_nodes = _get_start_end_nodes(a_graph)
+    start_nodes = [x for x in a_graph.nodes() if isinstance(a_graph.indexes[x], Sample)]
+    longest_path = _longest_end_to_end_path(a_graph, start_nodes)
+    if longest_path is None:
+        log.info("No paths found, skipping writing assay file")
+        return
+    for node_index in longest_path:
+        node = a_graph.indexes[node_index]
+        if isinstance(node, Sample):
+            olabel = "Sample Name"
+            # olabel = "Sample Name.{}".format(sample_in_path_count)
+            # sample_in_path_count += 1
+            columns.append(olabel)
+            columns += flatten(
+                map(lambda x: get_comment_column(olabel, x),
+                    node.comments))
+            if write_factor_values:
+                columns += flatten(
+                    map(lambda x: get_fv_columns(olabel, x),
+                        node.factor_values))
+
+        elif isinstance(node, Process):
+            olabel = "Protocol REF.{}".format(
+                node.executes_protocol.name)
+            columns.append(olabel)
+            if node.executes_protocol.name not in protnames.keys():
+                protnames[node.executes_protocol.name] = protrefcount
+                protrefcount += 1
+            if node.date is not None:
+                columns.append(olabel + ".Date")
+            if node.performer is not None:
+                columns.append(olabel + ".Performer")
+            columns += flatten(map(lambda x: get_pv_columns(olabel, x),
+                                   node.parameter_values))
+            if node.executes_protocol.protocol_type:
+                oname_label = get_column_header(
+                    node.executes_protocol.protocol_type.term,
+                    protocol_types_dict
+                )
+                if oname_label is not None:
+                    columns.append(oname_label)
+                elif node.executes_protocol.protocol_type.term.lower() \
+                        in protocol_types_dict["nucleic acid hybridization"][SYNONYMS]:
+                    columns.extend(
+                        ["Hybridization Assay Name",
+                         "Array Design REF"])
+            columns += flatten(
+                map(lambda x: get_comment_column(olabel, x),
+                    node.comments))
+            for output in [x for x in node.outputs if
+                           isinstance(x, DataFile)]:
+                columns.append(output.label)
+                columns += flatten(
+                    map(lambda x: get_comment_column(output.label, x),
+                        output.comments))
+
+        elif isinstance(node, Material):
+            olabel = node.type
+            columns.append(olabel)
+            columns += flatten(
+                map(lambda x: get_characteristic_columns(olabel, x),
+                    node.characteristics))
+            columns += flatten(
+                map(lambda x: get_comment_column(olabel, x),
+                    node.comments))
+
+        elif isinstance(node, DataFile):
+            pass  # handled in process
+
+    # the rows are sorted on their first column, the name of their
+    # start node
+    start_nodes = _sort_by_name(a_graph, start_nodes)
+    row_columns = list(columns)
+    omap = get_object_column_map(columns, columns)
+    column_keys = flatten(omap)
+
+    def render_row(path_):
+        # load into dictionary
+        df_dict = dict(map(lambda k: (k, [""]), column_keys))
+        for node_index in path_:
+            node = a_graph.indexes[node_index]
+            if isinstance(node, Process):
+                olabel = "Protocol REF.{}".format(
+                    node.executes_protocol.name
+                )
+                df_dict[olabel][-1] = node.executes_protocol.name
+                if node.executes_protocol.protocol_type:
+                    oname_label = get_column_header(
+                        node.executes_protocol.protocol_type.term,
+                        protocol_types_dict
+                    )
+                    if oname_label is not None:
+                        df_dict[oname_label][-1] = node.name
+                    elif node.executes_protocol.protocol_type.term.lower() in \
+                            protocol_types_dict["nucleic acid hybridization"][SYNONYMS]:
+                        df_dict["Hybridization Assay Name"][-1] = \
+                            node.name
+                        df_dict["Array Design REF"][-1] = \
+                            node.array_design_ref
+                if node.date is not None:
+                    df_dict[olabel + ".Date"][-1] = node.date
+                if node.performer is not None:
+                    df_dict[olabel + ".Performer"][-1] = node.performer
+                for pv in node.parameter_values:
+                    pvlabel = "{0}.Parameter Value[{1}]".format(
+                        olabel, pv.category.parameter_name.term)
+                    write_value_columns(df_dict, pvlabel, pv)
+                for co in node.comments:
+                    colabel = "{0}.Comment[{1}]".format(
+                        olabel, co.name)
+                    df_dict[colabel][-1] = co.value
+                for output in [x for x in node.outputs if
+                               isinstance(x, DataFile)]:
+                    olabel = output.label
+                    df_dict[olabel][-1] = output.filename
+                    for co in output.comments:
+                        colabel = "{0}.Comment[{1}]".format(
+                            olabel, co.name)
+                        df_dict[colabel][-1] = co.value
 
-        log.debug("Writing {} rows".format(len(DF.index)))
-        # reset columns, replace nan with empty string, drop empty columns
-        DF.columns = columns
-        DF = DF.replace('', nan)
-        DF = DF.dropna(axis=1, how='all')
+            elif isinstance(node, Sample):
+                olabel = "Sample Name"
+                # olabel = "Sample Name.{}".format(sample_in_path_count)
+                # sample_in_path_count += 1
+                df_dict[olabel][-1] = node.name
+                for co in node.comments:
+                    colabel = "{0}.Comment[{1}]".format(
+                        olabel, co.name)
+                    df_dict[colabel][-1] = co.value
+                if write_factor_values:
+                    for fv in node.factor_values:
+                        fvlabel = "{0}.Factor Value[{1}]".format(
+                            olabel, fv.factor_name.name)
+                        write_value_columns(df_dict, fvlabel, fv)
 
-        with open(path.join(output_dir, study_obj.filename), 'w') as out_fp:
-            DF.to_csv(
-                path_or_buf=out_fp, index=False, sep='\t', encoding='utf-8')
+            elif isinstance(node, Material):
+                olabel = node.type
+                df_dict[olabel][-1] = node.name
+                for c in node.characteristics:
+                    category_label = c.category.term if isinstance(c.category.term, str) \
+                        else c.category.term["annotationValue"]
+                    clabel = "{0}.Characteristics[{1}]".format(
+                        olabel, category_label)
+                    write_value_columns(df_dict, clabel, c)
+                for co in node.comments:
+                    colabel = "{0}.Comment[{1}]".format(
+                        olabel, co.name)
+                    df_dict[colabel][-1] = co.value
+
+            elif isinstance(node, DataFile):
+                pass  # handled in process
+
+        return [df_dict[k][-1] for k in row_columns]
+
+    paths = list(_iter_end_to_end_paths(a_graph, start_nodes))
+
+    def render_rows():
+        return map(render_row, paths)
+
+    for dup_item in set([x for x in columns if columns.count(x) > 1]):
+        for j, each in enumerate(
+                [i for i, x in enumerate(columns) if x == dup_item]):
+            columns[each] = ".".join([dup_item, str(j)])
+
+    for i, col in enumerate(columns):
+        if col.endswith("Term Source REF"):
+            columns[i] = "Term Source REF"
+        elif col.endswith("Term Accession Number"):
+            columns[i] = "Term Accession Number"
+        elif col.endswith("Unit"):
+            columns[i] = "Unit"
+        elif "Characteristics[" in col:
+            if "material type" in col.lower():
+                columns[i] = "Material Type"
+            elif "label" in col.lower():
+                columns[i] = "Label"
+            else:
+                columns[i] = col[col.rindex(".") + 1:]
+        elif "Factor Value[" in col:
+            columns[i] = col[col.rindex(".") + 1:]
+        elif "Parameter Value[" in col:
+            columns[i] = col[col.rindex(".") + 1:]
+        elif col.endswith("Date"):
+            columns[i] = "Date"
+        elif col.endswith("Performer"):
+            columns[i] = "Performer"
+        elif "Comment[" in col:
+            columns[i] = col[col.rindex(".") + 1:]
+        elif "Protocol REF" in col:
+            columns[i] = "Protocol REF"
+        elif "." in col:
+            columns[i] = col[:col.rindex(".")]
+
+    with open_output_file(output_dir, file_name) as out_fp:
+        num_rows = _write_table(out_fp, columns, render_rows)
+    log.debug("Wrote {} rows".format(num_rows))
+
+
+def _write_table_file(pickled_process_sequence, output_dir, file_name, is_assay, write_factor_values):
+    """Writes out a study or assay table file in a worker process
+
+    :param pickled_process_sequence: The pickled process sequence of the study
+    or assay
+    :param output_dir: A path to the directory to write the file to, or None
+    to return its contents
+    :param file_name: The name of the table file
+    :param is_assay: Whether the table is an assay table
+    :param write_factor_values: Flag to indicate whether or not to write out
+    the Factor Value columns in an assay table
+    :return: The contents of the table if no output_dir is given and the
+    table is written, else None
+    """
+    buffers = {}
+    graph = _build_process_graph(loads(pickled_process_sequence))
+    if is_assay:
+        _write_assay_table(graph, output_dir or buffers, file_name, write_factor_values, load_protocol_types_info())
+    else:
+        _write_study_table(graph, output_dir or buffers, file_name)
+    if file_name in buffers:
+        return buffers[file_name].getvalue()
+    return None
 
 
-def write_assay_table_files(inv_obj, output_dir, write_factor_values=False):
-    """Writes out assay table files according to pattern defined by
+def write_table_files_concurrently(inv_obj, output_dir, write_factor_values=False, workers=None):
+    """Writes out the study and assay table files as write_study_table_files()
+    and write_assay_table_files() do, each table in a worker process
 
-    Sample Name,
-    Protocol Ref: 'sample collection', [ ParameterValue[], ... ],
-    Material Name, [ Characteristics[], ... ]
-    [ FactorValue[], ... ]
+    The process sequence of each study and assay is pickled for a worker to
+    build its graph and write its table, so the files are the same as the
+    ones written one after another. The tables to write to a sink are sent
+    back to this process.
 
     :param inv_obj: An Investigation object containing ISA content
-    :param output_dir: A path to a directory to write the ISA-Tab assay files
+    :param output_dir: A path to a directory to write the ISA-Tab table files,
+    or a sink, see open_output_file()
     :param write_factor_values: Flag to indicate whether or not to write out
     the Factor Value columns in the assay tables
+    :param workers: Number of worker processes. By default, the number of
+    processors of the machine
     :return: None
     """
-
     if not isinstance(inv_obj, Investigation):
         raise NotImplementedError
-    protocol_types_dict = load_protocol_types_info()
+    tables = []
+    for study_obj in inv_obj.studies:
+        if len(study_obj.process_sequence) == 0:
+            break
+        tables.append((study_obj.process_sequence, study_obj.filename, False))
     for study_obj in inv_obj.studies:
         for assay_obj in study_obj.assays:
-            a_graph = assay_obj.graph
-            if a_graph is None:
+            if len(assay_obj.process_sequence) == 0:
                 break
-            protrefcount = 0
-            protnames = dict()
-
-            def flatten(current_list):
-                return [item for sublist in current_list for item in sublist]
-
-            columns = []
-
-            # start_nodes, end_nodes = _get_start_end_nodes(a_graph)
-            paths = _all_end_to_end_paths(
-                a_graph, [x for x in a_graph.nodes()
-                          if isinstance(a_graph.indexes[x], Sample)])
-            if len(paths) == 0:
-                log.info("No paths found, skipping writing assay file")
-                continue
-            if _longest_path_and_attrs(paths, a_graph.indexes) is None:
-                raise IOError(
-                    "Could not find any valid end-to-end paths in assay graph")
-            for node_index in _longest_path_and_attrs(paths, a_graph.indexes):
-                node = a_graph.indexes[node_index]
-                if isinstance(node, Sample):
-                    olabel = "Sample Name"
-                    # olabel = "Sample Name.{}".format(sample_in_path_count)
-                    # sample_in_path_count += 1
-                    columns.append(olabel)
-                    columns += flatten(
-                        map(lambda x: get_comment_column(olabel, x),
-                            node.comments))
-                    if write_factor_values:
-                        columns += flatten(
-                            map(lambda x: get_fv_columns(olabel, x),
-                                node.factor_values))
-
-                elif isinstance(node, Process):
-                    olabel = "Protocol REF.{}".format(
-                        node.executes_protocol.name)
-                    columns.append(olabel)
-                    if node.executes_protocol.name not in protnames.keys():
-                        protnames[node.executes_protocol.name] = protrefcount
-                        protrefcount += 1
-                    if node.date is not None:
-                        columns.append(olabel + ".Date")
-                    if node.performer is not None:
-                        columns.append(olabel + ".Performer")
-                    columns += flatten(map(lambda x: get_pv_columns(olabel, x),
-                                           node.parameter_values))
-                    if node.executes_protocol.protocol_type:
-                        oname_label = get_column_header(
-                            node.executes_protocol.protocol_type.term,
-                            protocol_types_dict
-                        )
-                        if oname_label is not None:
-                            columns.append(oname_label)
-                        elif node.executes_protocol.protocol_type.term.lower() \
-                                in protocol_types_dict["nucleic acid hybridization"][SYNONYMS]:
-                            columns.extend(
-                                ["Hybridization Assay Name",
-                                 "Array Design REF"])
-                    columns += flatten(
-                        map(lambda x: get_comment_column(olabel, x),
-                            node.comments))
-                    for output in [x for x in node.outputs if
-                                   isinstance(x, DataFile)]:
-                        columns.append(output.label)
-                        columns += flatten(
-                            map(lambda x: get_comment_column(output.label, x),
-                                output.comments))
-
-                elif isinstance(node, Material):
-                    olabel = node.type
-                    columns.append(olabel)
-                    columns += flatten(
-                        map(lambda x: get_characteristic_columns(olabel, x),
-                            node.characteristics))
-                    columns += flatten(
-                        map(lambda x: get_comment_column(olabel, x),
-                            node.comments))
-
-                elif isinstance(node, DataFile):
-                    pass  # handled in process
-
-            omap = get_object_column_map(columns, columns)
-
-            # load into dictionary
-            df_dict = dict(map(lambda k: (k, []), flatten(omap)))
-
-            def pbar(x):
-                return x
-
-            for path_ in pbar(paths):
-                for k in df_dict.keys():  # add a row per path
-                    df_dict[k].extend([""])
-
-                for node_index in path_:
-                    node = a_graph.indexes[node_index]
-                    if isinstance(node, Process):
-                        olabel = "Protocol REF.{}".format(
-                            node.executes_protocol.name
-                        )
-                        df_dict[olabel][-1] = node.executes_protocol.name
-                        if node.executes_protocol.protocol_type:
-                            oname_label = get_column_header(
-                                node.executes_protocol.protocol_type.term,
-                                protocol_types_dict
-                            )
-                            if oname_label is not None:
-                                df_dict[oname_label][-1] = node.name
-                            elif node.executes_protocol.protocol_type.term.lower() in \
-                                    protocol_types_dict["nucleic acid hybridization"][SYNONYMS]:
-                                df_dict["Hybridization Assay Name"][-1] = \
-                                    node.name
-                                df_dict["Array Design REF"][-1] = \
-                                    node.array_design_ref
-                        if node.date is not None:
-                            df_dict[olabel + ".Date"][-1] = node.date
-                        if node.performer is not None:
-                            df_dict[olabel + ".Performer"][-1] = node.performer
-                        for pv in node.parameter_values:
-                            pvlabel = "{0}.Parameter Value[{1}]".format(
-                                olabel, pv.category.parameter_name.term)
-                            write_value_columns(df_dict, pvlabel, pv)
-                        for co in node.comments:
-                            colabel = "{0}.Comment[{1}]".format(
-                                olabel, co.name)
-                            df_dict[colabel][-1] = co.value
-                        for output in [x for x in node.outputs if
-                                       isinstance(x, DataFile)]:
-                            olabel = output.label
-                            df_dict[olabel][-1] = output.filename
-                            for co in output.comments:
-                                colabel = "{0}.Comment[{1}]".format(
-                                    olabel, co.name)
-                                df_dict[colabel][-1] = co.value
-
-                    elif isinstance(node, Sample):
-                        olabel = "Sample Name"
-                        # olabel = "Sample Name.{}".format(sample_in_path_count)
-                        # sample_in_path_count += 1
-                        df_dict[olabel][-1] = node.name
-                        for co in node.comments:
-                            colabel = "{0}.Comment[{1}]".format(
-                                olabel, co.name)
-                            df_dict[colabel][-1] = co.value
-                        if write_factor_values:
-                            for fv in node.factor_values:
-                                fvlabel = "{0}.Factor Value[{1}]".format(
-                                    olabel, fv.factor_name.name)
-                                write_value_columns(df_dict, fvlabel, fv)
-
-                    elif isinstance(node, Material):
-                        olabel = node.type
-                        df_dict[olabel][-1] = node.name
-                        for c in node.characteristics:
-                            category_label = c.category.term if isinstance(c.category.term, str) \
-                                else c.category.term["annotationValue"]
-                            clabel = "{0}.Characteristics[{1}]".format(
-                                olabel, category_label)
-                            write_value_columns(df_dict, clabel, c)
-                        for co in node.comments:
-                            colabel = "{0}.Comment[{1}]".format(
-                                olabel, co.name)
-                            df_dict[colabel][-1] = co.value
-
-                    elif isinstance(node, DataFile):
-                        pass  # handled in process
-
-            DF = DataFrame(columns=columns)
-            DF = DF.from_dict(data=df_dict)
-            DF = DF[columns]  # reorder columns
-            try:
-                DF = DF.sort_values(by=DF.columns[0], ascending=True)
-            except ValueError as e:
-                log.critical('Error thrown: column labels are: {}'.format(DF.columns))
-                log.critical('Error thrown: data is: {}'.format(DF))
-                raise e
-            # arbitrary sort on column 0
-
-            for dup_item in set([x for x in columns if columns.count(x) > 1]):
-                for j, each in enumerate(
-                        [i for i, x in enumerate(columns) if x == dup_item]):
-                    columns[each] = ".".join([dup_item, str(j)])
-
-            DF.columns = columns
-
-            for i, col in enumerate(columns):
-                if col.endswith("Term Source REF"):
-                    columns[i] = "Term Source REF"
-                elif col.endswith("Term Accession Number"):
-                    columns[i] = "Term Accession Number"
-                elif col.endswith("Unit"):
-                    columns[i] = "Unit"
-                elif "Characteristics[" in col:
-                    if "material type" in col.lower():
-                        columns[i] = "Material Type"
-                    elif "label" in col.lower():
-                        columns[i] = "Label"
-                    else:
-                        columns[i] = col[col.rindex(".") + 1:]
-                elif "Factor Value[" in col:
-                    columns[i] = col[col.rindex(".") + 1:]
-                elif "Parameter Value[" in col:
-                    columns[i] = col[col.rindex(".") + 1:]
-                elif col.endswith("Date"):
-                    columns[i] = "Date"
-                elif col.endswith("Performer"):
-                    columns[i] = "Performer"
-                elif "Comment[" in col:
-                    columns[i] = col[col.rindex(".") + 1:]
-                elif "Protocol REF" in col:
-                    columns[i] = "Protocol REF"
-                elif "." in col:
-                    columns[i] = col[:col.rindex(".")]
-
-            log.debug("Rendered {} paths".format(len(DF.index)))
-            if len(DF.index) > 1:
-                if len(DF.index) > len(DF.drop_duplicates().index):
-                    log.debug("Dropping duplicates...")
-                    DF = DF.drop_duplicates()
-
-            log.debug("Writing {} rows".format(len(DF.index)))
-            # reset columns, replace nan with empty string, drop empty columns
-            DF.columns = columns
-            DF = DF.replace('', nan)
-            DF = DF.dropna(axis=1, how='all')
-
-            with open(path.join(
-                    output_dir, assay_obj.filename), 'w') as out_fp:
-                DF.to_csv(path_or_buf=out_fp, index=False, sep='\t',
-                          encoding='utf-8')
+            tables.append((assay_obj.process_sequence, assay_obj.filename, True))
+
+    worker_output_dir = None if _is_sink(output_dir) else output_dir
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_table_file, dumps(process_sequence), worker_output_dir, filename,
+                                   is_assay, write_factor_values)
+                   for process_sequence, filename, is_assay in tables]
+        for future, (_, filename, _) in zip(futures, tables):
+            contents = future.result()
+            if contents is not None:
+                with open_output_file(output_dir, filename) as out_fp:
+                    out_fp.write(contents)
+
+
+class _SinkBuffer(StringIO):
+    """A StringIO buffer that can still be read once closed"""
+
+    def close(self):
+        pass
+
+
+def _is_sink(output):
+    return isinstance(output, dict) or callable(output)
+
+
+def open_output_file(output, file_name, encoding=None):
+    """Opens an ISA-Tab file to write
+
+    The ISA-Tab files can be written to a directory or to a sink: either a
+    dict, which the files are added to as StringIO buffers by file name, or
+    a function returning a writable text file for a file name, which is closed
+    once written.
+
+    :param output: A path to a directory, or a sink
+    :param file_name: The name of the file
+    :param encoding: The encoding of a file written to a directory
+    :return: A writable text file
+    """
+    if isinstance(output, dict):
+        output[file_name] = _SinkBuffer()
+        return output[file_name]
+    if callable(output):
+        return output(file_name)
+    return open(path.join(output, file_name), 'w', encoding=encoding)
+
+
+def _sort_by_name(graph, nodes):
+    """Sorts nodes on their name, keeping the order of the nodes with the same
+    name and putting the nameless ones last"""
+    def key(node):
+        name = graph.indexes[node].name
+        return name is None, name or ""
+    return sorted(nodes, key=key)
+
+
+def _is_empty(value):
+    return value is None or value == "" or value != value
+
+
+def _write_table(out_fp, columns, rows):
+    """Writes a table out row by row, tab separated
+
+    The rows are rendered twice. The first pass keeps a flag per column, set
+    when a value is not empty, and works out the numeric columns mixing
+    integers with floats or missing values, whose integers are written as
+    floats. The second one writes the header and rows of the non-empty columns,
+    skipping the rows already written. As the rows are sorted on their first
+    value, only the rows with the same first value are kept to find them.
+
+    :param out_fp: A file-like object to write the table to
+    :param columns: The header labels
+    :param rows: A function returning a new iterator on the rows, sorted on
+    their first value
+    :return: The number of rows written
+    """
+    non_empty = [False] * len(columns)
+    numeric = [True] * len(columns)
+    has_int = [False] * len(columns)
+    has_float = [False] * len(columns)
+    for row in rows():
+        for i, value in enumerate(row):
+            if value is None or isinstance(value, float):
+                has_float[i] = True
+            elif isinstance(value, int) and not isinstance(value, bool):
+                has_int[i] = True
+            else:
+                numeric[i] = False
+            if not non_empty[i] and not _is_empty(value):
+                non_empty[i] = True
+    kept = [i for i in range(len(columns)) if non_empty[i]]
+    as_float = [numeric[i] and has_int[i] and has_float[i] for i in range(len(columns))]
+
+    writer = csv.writer(out_fp, delimiter='\t', lineterminator='\n')
+    writer.writerow([columns[i] for i in kept])
+    num_rows = 0
+    first_value = seen = None
+    for row in rows():
+        if seen is None or row[0] != first_value:
+            first_value = row[0]
+            seen = set()
+        values = tuple(row)
+        if values in seen:
+            continue
+        seen.add(values)
+        writer.writerow(["" if _is_empty(row[i]) else str(float(row[i])) if as_float[i] else str(row[i])
+                         for i in kept])
+        num_rows += 1
+    return num_rows
 
 
 def write_value_columns(df_dict, label, x):
@@ -1,56 +1,148 @@
 from networkx import algorithms
 
 from isatools.model import Source, Sample, Process, Material, DataFile
+from isatools.model.graph import ProcessGraph, SOURCE, SAMPLE, MATERIAL, PROCESS, _node_type
 from isatools.isatab.defaults import log
 
 
+def _descendants(G, node):
+    if isinstance(G, ProcessGraph):
+        return G.descendants(node)
+    return algorithms.descendants(G, node)
+
+
+def _successors(G):
+    if isinstance(G, ProcessGraph):
+        return G.successor_ids
+    return G.successors
+
+
+def _node_types(G):
+    if isinstance(G, ProcessGraph):
+        return G.node_type
+    return lambda node_index: _node_type(G.indexes[node_index])
+
+
+def _node_length(n, node_type):
+    """Gets the length a node adds to a path when looking for the most
+    appropriate ISA-Tab header: one for the node itself plus the number of
+    attributes needed to describe it
+
+    :param n: A node of the graph
+    :param node_type: The type of the node, as in ProcessGraph.node_types
+    :return: The length of the node
+    """
+    length = 1
+    if node_type == SOURCE:
+        length += len(n.characteristics)
+    elif node_type == SAMPLE:
+        length += (len(n.characteristics) + len(n.factor_values))
+    elif node_type == MATERIAL:
+        length += (len(n.characteristics))
+    elif node_type == PROCESS:
+        length += len(
+            [o for o in n.outputs if isinstance(o, DataFile)])
+        if n.date is not None:
+            length += 1
+        if n.performer is not None:
+            length += 1
+        if n.name != '':
+            length += 1
+    if n.comments is not None:
+        length += len(n.comments)
+    return length
+
+
+def _iter_end_to_end_paths(G, start_nodes, lengths=False):
+    """Generates the end-to-end complete paths, in the same order as
+    _all_end_to_end_paths(), with a single depth-first search per start node.
+    Only the paths of the current start node are held, grouped by end node.
+
+    :param G: A ProcessGraph or a DiGraph of all the assay graphs from the
+    process sequences
+    :param start_nodes: A list of start nodes
+    :param lengths: Also generate the length of each path, as computed by
+    _longest_path_and_attrs(), summed along the search
+    :return: A generator of paths, or of (path, length) tuples if lengths is
+    True
+    """
+    successors = _successors(G)
+    node_type = _node_types(G)
+    node_lengths = {}
+
+    def node_length(node_index):
+        if node_index not in node_lengths:
+            node_lengths[node_index] = _node_length(G.indexes[node_index], node_type(node_index))
+        return node_lengths[node_index]
+
+    for start in start_nodes:
+        start_type = node_type(start)
+        if start_type == SOURCE:
+            # only look for Sample ends if start is a Source
+            ends = [x for x in _descendants(G, start) if
+                    node_type(x) == SAMPLE and len(G.out_edges(x)) == 0]
+        elif start_type == SAMPLE:
+            # only look for Process ends if start is a Sample
+            ends = [x for x in _descendants(G, start) if
+                    node_type(x) == PROCESS and G.indexes[x].next_process is None]
+        else:
+            continue
+        if len(ends) == 0:
+            continue
+        paths_by_end = dict((end, []) for end in ends)
+        path = [start]
+        path_lengths = [node_length(start)]
+        stack = [iter(successors(start))]
+        while stack:
+            node_index = next(stack[-1], None)
+            if node_index is None:
+                stack.pop()
+                path.pop()
+                path_lengths.pop()
+            elif node_index not in path:
+                path.append(node_index)
+                path_lengths.append(path_lengths[-1] + node_length(node_index))
+                if node_index in paths_by_end:
+                    paths_by_end[node_index].append((list(path), path_lengths[-1]))
+                stack.append(iter(successors(node_index)))
+        for end in ends:
+            for path_and_length in paths_by_end[end]:
+                yield path_and_length if lengths else path_and_length[0]
+
+
 def _all_end_to_end_paths(G, start_nodes):
-    """Find all the end-to-end complete paths using a networkx algorithm that
-    uses a modified depth-first search to generate the paths
+    """Find all the end-to-end complete paths using a modified depth-first
+    search to generate the paths
 
-    :param G: A DiGraph of all the assay graphs from the process sequences
+    :param G: A ProcessGraph or a DiGraph of all the assay graphs from the
+    process sequences
     :param start_nodes: A list of start nodes
     :return: A list of paths from the start nodes
     """
     # we know graphs start with Source or Sample and end with Process
-    paths = []
-    num_start_nodes = len(start_nodes)
-    message = 'Calculating for paths for {} start nodes: '.format(
-        num_start_nodes)
     log.info(start_nodes)
-    start_node = G.indexes[start_nodes[0]]
-    if isinstance(start_node, Source):
-        message = 'Calculating for paths for {} sources: '.format(
-            num_start_nodes)
-    elif isinstance(start_node, Sample):
-        message = 'Calculating for paths for {} samples: '.format(
-            num_start_nodes)
-    """if isa_logging.show_pbars:
-        pbar = ProgressBar(
-            min_value=0, max_value=num_start_nodes, widgets=[
-                message, SimpleProgress(), Bar(left=" |", right="| "),
-                ETA()]).start()
-    else:
-        def pbar(x): return x"""
-    for start in start_nodes:
-        # Find ends
-        node = G.indexes[start]
-        if isinstance(node, Source):
-            # only look for Sample ends if start is a Source
-            for end in [x for x in algorithms.descendants(G, start) if
-                        isinstance(G.indexes[x], Sample) and len(G.out_edges(x)) == 0]:
-                paths += list(algorithms.all_simple_paths(G, start, end))
-        elif isinstance(node, Sample):
-            # only look for Process ends if start is a Sample
-            for end in [x for x in algorithms.descendants(G, start) if
-                        isinstance(G.indexes[x], Process) and G.indexes[x].next_process is None]:
-                paths += list(algorithms.all_simple_paths(G, start, end))
-    # log.info("Found {} paths!".format(len(paths)))
+    paths = list(_iter_end_to_end_paths(G, start_nodes))
     if len(paths) == 0:
         log.debug([G.indexes[x].name for x in start_nodes])
     return paths
 
 
+def _longest_end_to_end_path(G, start_nodes):
+    """Finds the path returned by _longest_path_and_attrs() for the
+    end-to-end paths of the graph, without holding the paths
+
+    :param G: A ProcessGraph or a DiGraph of all the assay graphs from the
+    process sequences
+    :param start_nodes: A list of start nodes
+    :return: The longest path and attributes, or None if there are no paths
+    """
+    longest = (0, None)
+    for path, length in _iter_end_to_end_paths(G, start_nodes, lengths=True):
+        if length > longest[0]:
+            longest = (length, path)
+    return longest[1]
+
+
 def _longest_path_and_attrs(paths, indexes):
     """Function to find the longest paths and attributes to determine the
     most appropriate ISA-Tab header. This is calculated by adding up the length
@@ -63,26 +155,7 @@ def _longest_path_and_attrs(paths, indexes):
     longest = (0, None)
     log.info(paths)
     for path in paths:
-        length = len(path)
-        for node in path:
-            n = indexes[node]
-            if isinstance(n, Source):
-                length += len(n.characteristics)
-            elif isinstance(n, Sample):
-                length += (len(n.characteristics) + len(n.factor_values))
-            elif isinstance(n, Material):
-                length += (len(n.characteristics))
-            elif isinstance(n, Process):
-                length += len(
-                    [o for o in n.outputs if isinstance(o, DataFile)])
-                if n.date is not None:
-                    length += 1
-                if n.performer is not None:
-                    length += 1
-                if n.name != '':
-                    length += 1
-            if n.comments is not None:
-                length += len(n.comments)
+        length = sum(_node_length(indexes[node], _node_type(indexes[node])) for node in path)
         if length > longest[0]:
             longest = (length, path)
     return longest[1]
@@ -1,4 +1,13 @@
-from isatools.isatab.utils import process_keygen, find_lt, find_gt, pairwise,  get_object_column_map, get_value
+from pandas import DataFrame, concat
+
+from isatools.isatab.utils import (
+    ProcessKeyIndex,
+    find_lt,
+    find_gt,
+    pairwise,
+    get_object_column_map,
+    get_value
+)
 from isatools.isatab.defaults import (
     log,
     _RX_COMMENT,
@@ -62,6 +71,141 @@ def preprocess(DF):
     return DF
 
 
+def _add_characteristics(material, column_group, object_series, deja_vu, characteristic_categories,
+                         ontology_source_map, unit_categories):
+    """Adds the Characteristics found in a row of a material column group to
+    the material, raising if the row conflicts with an already seen state
+
+    :param material: The Material being parsed
+    :param column_group: The material's column group
+    :param object_series: The row, as a Series or a column to value mapping
+    :param deja_vu: Characteristic values already seen in the column group
+    :param characteristic_categories: A map of characteristic categories
+    :param ontology_source_map: A map of the OntologySource objects
+    :param unit_categories: A map of unit categories to reference
+    :return: None
+    """
+    for charac_column in [c for c in column_group if c.startswith('Characteristics[')]:
+        category_key = next(iter(_RX_CHARACTERISTICS.findall(charac_column)))
+        try:
+            category = characteristic_categories[category_key]
+        except KeyError:
+            category = OntologyAnnotation(term=category_key)
+            characteristic_categories[category_key] = category
+        characteristic = Characteristic(category=category)
+
+        (characteristic.value,
+         characteristic.unit) = get_value(charac_column, column_group,
+                                          object_series, ontology_source_map, unit_categories)
+
+        characteristic_category_terms = [x.category.term for x in material.characteristics]
+
+        if characteristic.category.term not in characteristic_category_terms:
+            material.characteristics.append(characteristic)
+            if isinstance(characteristic.value, OntologyAnnotation):
+                deja_vu[characteristic.category.term] = [characteristic.value.term]
+            else:
+                deja_vu[characteristic.category.term] = [characteristic.value]
+
+        if characteristic.category.term in deja_vu.keys():
+            if isinstance(characteristic.value, OntologyAnnotation):
+                if characteristic.value.term not in deja_vu[characteristic.category.term]:
+                    deja_vu[characteristic.category.term].append(characteristic.value.term)
+            else:
+                deja_vu[characteristic.category.term] = [characteristic.value]
+            if len(deja_vu[characteristic.category.term]) > 1:
+                error = ("Two simultaneous states for a given characteristics is not allowed "
+                         "for Material: {} in Characteristics[{}] : {}"
+                         ).format(material.name, str(characteristic.category.term),
+                                  str(deja_vu[characteristic.category.term]))
+                raise ValueError(error)
+
+
+def _add_comments(isa_object, column_group, object_series):
+    """Adds the Comments found in a row of a column group to an object, unless
+    a comment of the same name is already there
+
+    :param isa_object: A Commentable ISA object
+    :param column_group: The object's column group
+    :param object_series: The row, as a Series or a column to value mapping
+    :return: None
+    """
+    for comment_column in [c for c in column_group if c.startswith('Comment[')]:
+        comment_key = next(iter(_RX_COMMENT.findall(comment_column)))
+        if comment_key not in [x.name for x in isa_object.comments]:
+            isa_object.comments.append(Comment(name=comment_key, value=str(object_series[comment_column])))
+
+
+def _add_factor_values(material, columns, object_series, factors, ontology_source_map, unit_categories):
+    """Adds the Factor Values found in a table row to a sample
+
+    :param material: The Sample being parsed
+    :param columns: All the table columns
+    :param object_series: The row, as a Series or a column to value mapping
+    :param factors: The Study Factors to resolve Factor Values against
+    :param ontology_source_map: A map of the OntologySource objects
+    :param unit_categories: A map of unit categories to reference
+    :return: None
+    """
+    for fv_column in [c for c in columns if c.startswith('Factor Value[')]:
+        category_key = next(iter(_RX_FACTOR_VALUE.findall(fv_column)))
+        factor_hits = [f for f in factors if f.name == category_key]
+
+        if len(factor_hits) != 1:
+            raise ValueError('Could not resolve Study Factor from Factor Value ', category_key)
+
+        factor = factor_hits[0]
+        fv = FactorValue(factor_name=factor)
+        v, u = get_value(fv_column, columns, object_series, ontology_source_map, unit_categories)
+        fv.value = v
+        fv.unit = u
+        fv_set = set(material.factor_values)
+        fv_set.add(fv)
+        material.factor_values = list(fv_set)
+
+
+def _add_parameter_values(process, protocol_ref, column_group, object_series, protocol_map,
+                          ontology_source_map, unit_categories):
+    """Adds the Parameter Values found in a row of a Protocol REF column group
+    to a process, unless the process already has a value for the parameter
+
+    :param process: The Process being parsed
+    :param protocol_ref: The Protocol REF value of the row
+    :param column_group: The process' column group
+    :param object_series: The row, as a Series or a column to value mapping
+    :param protocol_map: A map of the study Protocols
+    :param ontology_source_map: A map of the OntologySource objects
+    :param unit_categories: A map of unit categories to reference
+    :return: None
+    """
+    for pv_column in [c for c in column_group if c.startswith('Parameter Value[')]:
+        category_key = next(iter(_RX_PARAMETER_VALUE.findall(pv_column)))
+        if category_key not in [x.category.parameter_name.term for x in process.parameter_values]:
+            try:
+                protocol = protocol_map[protocol_ref]
+            except KeyError:
+                raise KeyError('Could not find protocol matching ', protocol_ref)
+
+            param_hits = [p for p in protocol.parameters if p.parameter_name.term == category_key]
+
+            if len(param_hits) == 1:
+                category = param_hits[0]
+            else:
+                raise ValueError(
+                    'Could not resolve Protocol parameter '
+                    'from Parameter Value ', category_key)
+
+            parameter_value = ParameterValue(category=category)
+            v, u = get_value(pv_column,
+                             column_group,
+                             object_series,
+                             ontology_source_map,
+                             unit_categories)
+            parameter_value.value = v
+            parameter_value.unit = u
+            process.parameter_values.append(parameter_value)
+
+
 class ProcessSequenceFactory:
     """The ProcessSequenceFactory is used to parse the tables and build the
     process sequences representing the experimental graphs"""
@@ -73,24 +217,20 @@ class ProcessSequenceFactory:
         self.protocols = study_protocols
         self.factors = study_factors
 
-    def create_from_df(self, DF):
-        """Create the process sequences from the table DataFrame
+    def _create_nodes(self, DF):
+        """Create the material and data nodes referenced in the table DataFrame
 
         :param DF: Table DataFrame
-        :return: List of Processes coressponding to the process sequences. The
-        Processes are linked appropriately to all other ISA content objects,
-        such as Samples, DataFiles, and to each other.
+        :return: A tuple of the ontology source map, the protocol map and the
+        sources, samples, other materials, data files and characteristic
+        categories maps
         """
-        DF = preprocess(DF=DF)
-
         ontology_source_map = {}
         protocol_map = {}
         sources = {}
         other_material = {}
         data = {}
-        processes = {}
         characteristic_categories = {}
-        unit_categories = {}
         samples = {}
 
         if self.ontology_sources is not None:
@@ -150,8 +290,32 @@ class ProcessSequenceFactory:
             filenames = [x for x in DF[data_col].drop_duplicates() if x != '']
             data.update(dict(map(lambda x: (':'.join([data_col, x]), DataFile(filename=x, label=data_col)), filenames)))
 
+        return ontology_source_map, protocol_map, sources, samples, other_material, data, characteristic_categories
+
+    def create_from_df(self, DF, columnar=False):
+        """Create the process sequences from the table DataFrame
+
+        :param DF: Table DataFrame
+        :param columnar: Whether to use the column-oriented engine, which
+        computes the node and process keys once per column group instead of
+        walking the table row by row. Both engines build the same objects.
+        :return: List of Processes coressponding to the process sequences. The
+        Processes are linked appropriately to all other ISA content objects,
+        such as Samples, DataFiles, and to each other.
+        """
+        if columnar:
+            return self._create_from_df_columnar(DF)
+
+        DF = preprocess(DF=DF)
+
+        processes = {}
+        unit_categories = {}
+        (ontology_source_map, protocol_map, sources, samples, other_material, data,
+         characteristic_categories) = self._create_nodes(DF)
+
         node_cols = [i for i, c in enumerate(DF.columns) if c in _LABELS_MATERIAL_NODES + _LABELS_DATA_NODES]
         proc_cols = [i for i, c in enumerate(DF.columns) if c.startswith("Protocol REF")]
+        process_key_index = ProcessKeyIndex(DF)
 
         try:
             object_column_map = get_object_column_map(DF.isatab_header, DF.columns)
@@ -199,46 +363,9 @@ class ProcessSequenceFactory:
                             pass  # skip if object not found
 
                     if material is not None:
-                        for charac_column in [c for c in column_group if c.startswith('Characteristics[')]:
-                            category_key = next(iter(_RX_CHARACTERISTICS.findall(charac_column)))
-                            try:
-                                category = characteristic_categories[category_key]
-                            except KeyError:
-                                category = OntologyAnnotation(term=category_key)
-                                characteristic_categories[category_key] = category
-                            characteristic = Characteristic(category=category)
-
-                            (characteristic.value,
-                             characteristic.unit) = get_value(charac_column, column_group,
-                                                              object_series, ontology_source_map, unit_categories)
-
-                            characteristic_category_terms = [x.category.term for x in material.characteristics]
-
-                            if characteristic.category.term not in characteristic_category_terms:
-                                material.characteristics.append(characteristic)
-                                if isinstance(characteristic.value, OntologyAnnotation):
-                                    deja_vu[characteristic.category.term] = [characteristic.value.term]
-                                else:
-                                    deja_vu[characteristic.category.term] = [characteristic.value]
-
-                            if characteristic.category.term in deja_vu.keys():
-                                if isinstance(characteristic.value, OntologyAnnotation):
-                                    if characteristic.value.term not in deja_vu[characteristic.category.term]:
-                                        deja_vu[characteristic.category.term].append(characteristic.value.term)
-                                else:
-                                    deja_vu[characteristic.category.term] = [characteristic.value]
-                                if len(deja_vu[characteristic.category.term]) > 1:
-                                    error = ("Two simultaneous states for a given characteristics is not allowed "
-                                             "for Material: {} in Characteristics[{}] : {}"
-                                             ).format(material.name, str(characteristic.category.term),
-                                                      str(deja_vu[characteristic.category.term]))
-                                    raise ValueError(error)
-
-                        for comment_column in [c for c in column_group if c.startswith('Comment[')]:
-                            comment_key = next(iter(_RX_COMMENT.findall(comment_column)))
-                            if comment_key not in [x.name for x in material.comments]:
-                                comment = Comment(name=comment_key, value=str(object_series[comment_column]))
-                                material.comments.append(comment)
+                        _add_characteristics(material, column_group, object_series, deja_vu,
+                                             characteristic_categories, ontology_source_map, unit_categories)
+                        _add_comments(material, column_group, object_series)
 
                 for _, object_series in DF.drop_duplicates().iterrows():
                     node_name = str(object_series['Sample Name'])
@@ -250,31 +377,14 @@ class ProcessSequenceFactory:
                         pass  # skip if object not found
 
                     if isinstance(material, Sample) and self.factors is not None:
-                        for fv_column in [c for c in DF.columns if c.startswith('Factor Value[')]:
-                            category_key = next(iter(_RX_FACTOR_VALUE.findall(fv_column)))
-                            factor_hits = [f for f in self.factors if f.name == category_key]
-
-                            if len(factor_hits) != 1:
-                                raise ValueError('Could not resolve Study Factor from Factor Value ', category_key)
-
-                            factor = factor_hits[0]
-                            fv = FactorValue(factor_name=factor)
-                            v, u = get_value(fv_column, DF.columns, object_series, ontology_source_map, unit_categories)
-                            fv.value = v
-                            fv.unit = u
-                            fv_set = set(material.factor_values)
-                            fv_set.add(fv)
-                            material.factor_values = list(fv_set)
+                        _add_factor_values(material, DF.columns, object_series, self.factors,
+                                           ontology_source_map, unit_categories)
 
             elif object_label in _LABELS_DATA_NODES:
                 for _, object_series in DF[column_group].drop_duplicates().iterrows():
                     try:
                         data_file = get_node_by_label_and_key(object_label, str(object_series[object_label]))
-                        for comment_column in [c for c in column_group if c.startswith('Comment[')]:
-                            comment_key = next(iter(_RX_COMMENT.findall(comment_column)))
-                            if comment_key not in [x.name for x in data_file.comments]:
-                                comment = Comment(name=comment_key, value=str(object_series[comment_column]))
-                                data_file.comments.append(comment)
+                        _add_comments(data_file, column_group, object_series)
                     except KeyError:
                         pass  # skip if object not found
 
@@ -284,7 +394,7 @@ class ProcessSequenceFactory:
                 # don't drop duplicates
                 for _, object_series in DF.iterrows():
                     protocol_ref = str(object_series[object_label])
-                    process_key = process_keygen(protocol_ref, column_group, _cg, DF.columns, object_series, _, DF)
+                    process_key = process_key_index.get(column_group, _cg, _)
 
                     # TODO: Keep process key sequence here to reduce number of
                     # passes on Protocol REF columns?
@@ -343,37 +453,9 @@ class ProcessSequenceFactory:
                     if len(name_column_hits) == 1:
                         process.name = str(object_series[name_column_hits[0]])
 
-                    for pv_column in [c for c in column_group if c.startswith('Parameter Value[')]:
-                        category_key = next(iter(_RX_PARAMETER_VALUE.findall(pv_column)))
-                        if category_key not in [x.category.parameter_name.term for x in process.parameter_values]:
-                            try:
-                                protocol = protocol_map[protocol_ref]
-                            except KeyError:
-                                raise KeyError('Could not find protocol matching ', protocol_ref)
-
-                            param_hits = [p for p in protocol.parameters if p.parameter_name.term == category_key]
-
-                            if len(param_hits) == 1:
-                                category = param_hits[0]
-                            else:
-                                raise ValueError(
-                                    'Could not resolve Protocol parameter '
-                                    'from Parameter Value ', category_key)
-
-                            parameter_value = ParameterValue(category=category)
-                            v, u = get_value(pv_column,
-                                             column_group,
-                                             object_series,
-                                             ontology_source_map,
-                                             unit_categories)
-                            parameter_value.value = v
-                            parameter_value.unit = u
-                            process.parameter_values.append(parameter_value)
-
-                    for comment_column in [c for c in column_group if c.startswith('Comment[')]:
-                        comment_key = next(iter(_RX_COMMENT.findall(comment_column)))
-                        if comment_key not in [x.name for x in process.comments]:
-                            process.comments.append(Comment(name=comment_key, value=str(object_series[comment_column])))
+                    _add_parameter_values(process, protocol_ref, column_group, object_series, protocol_map,
+                                          ontology_source_map, unit_categories)
+                    _add_comments(process, column_group, object_series)
 
         for _, object_series in DF.iterrows():  # don't drop duplicates
             process_key_sequence = list()
@@ -399,9 +481,7 @@ class ProcessSequenceFactory:
                             sample_node_context.derives_from.append(source_node_context)
 
                 if object_label.startswith('Protocol REF'):
-                    protocol_ref = str(object_series[object_label])
-                    process_key = process_keygen(protocol_ref, column_group, _cg, DF.columns, object_series, _, DF)
-                    process_key_sequence.append(process_key)
+                    process_key_sequence.append(process_key_index.get(column_group, _cg, _))
 
                 if object_label.endswith(' File'):
                     data_node = None
@@ -420,3 +500,208 @@ class ProcessSequenceFactory:
                 plink(left, r)
 
         return sources, samples, other_material, data, processes, characteristic_categories, unit_categories
+
+    def _create_from_df_columnar(self, DF):
+        """Create the process sequences from the table DataFrame, working on
+        whole columns rather than on rows.
+
+        Node and process keys are computed once per column group, rows are
+        grouped by key and every object is built from the first (or, for
+        process names, the last) row of its group. The result is the same as
+        the one of the row-oriented engine.
+
+        :param DF: Table DataFrame
+        :return: See create_from_df()
+        """
+        DF = preprocess(DF=DF)
+
+        processes = {}
+        unit_categories = {}
+        (ontology_source_map, protocol_map, sources, samples, other_material, data,
+         characteristic_categories) = self._create_nodes(DF)
+
+        columns = DF.columns
+        node_cols = [i for i, c in enumerate(columns) if c in _LABELS_MATERIAL_NODES + _LABELS_DATA_NODES]
+        proc_cols = [i for i, c in enumerate(columns) if c.startswith("Protocol REF")]
+        process_key_index = ProcessKeyIndex(DF)
+
+        try:
+            object_column_map = get_object_column_map(DF.isatab_header, columns)
+        except AttributeError:
+            object_column_map = get_object_column_map(columns, columns)
+
+        def get_node_map(labl):
+            if labl == 'Source Name':
+                return sources
+            if labl == 'Sample Name':
+                return samples
+            if labl in ('Extract Name', 'Labeled Extract Name'):
+                return other_material
+            if labl.endswith(' File'):
+                return data
+            return None
+
+        def get_nodes(labl):
+            """Resolves the node referenced on each row of a node column,
+            None where there is no such node"""
+            node_map = get_node_map(labl) or {}
+            return [node_map.get(labl + ':' + value) for value in DF[labl].map(str).tolist()]
+
+        def get_unique_rows(cols):
+            """Yields the distinct rows over the given columns, in table
+            order, as column to value mappings"""
+            cols = list(cols)
+            for values in DF[cols].drop_duplicates().itertuples(index=False, name=None):
+                yield dict(zip(cols, values))
+
+        linked_nodes = {}
+
+        def link_node(isa_object, attribute, node):
+            """Appends a node to a list attribute of an object unless it is
+            already there. Nodes are unique per table so they are compared by
+            identity, and by value only against what the list held before."""
+            try:
+                existing, seen = linked_nodes[id(isa_object), attribute]
+            except KeyError:
+                existing, seen = linked_nodes[id(isa_object), attribute] = (list(getattr(isa_object, attribute)), set())
+            if id(node) not in seen:
+                seen.add(id(node))
+                if node not in existing:
+                    getattr(isa_object, attribute).append(node)
+
+        process_keys = {}
+        factor_values_parsed = False
+
+        for _cg, column_group in enumerate(object_column_map):
+            # for each object, parse column group
+            object_label = column_group[0]
+
+            if object_label in _LABELS_MATERIAL_NODES:
+                node_map = get_node_map(object_label)
+                deja_vu = {}
+                for object_row in get_unique_rows(column_group):
+                    material = node_map.get(":".join([object_label, str(object_row[object_label])]))
+                    if material is not None:
+                        _add_characteristics(material, column_group, object_row, deja_vu,
+                                             characteristic_categories, ontology_source_map, unit_categories)
+                        _add_comments(material, column_group, object_row)
+
+                # Factor Values only depend on the Sample Name and Factor Value
+                # columns so they are parsed once, on the distinct rows of those
+                if not factor_values_parsed:
+                    factor_values_parsed = True
+                    fv_column_indices = [i for i, c in enumerate(columns) if c.startswith('Factor Value[')]
+                    if self.factors is not None and fv_column_indices:
+                        fv_row_columns = ['Sample Name']
+                        for i in fv_column_indices:
+                            fv_row_columns.extend(columns[i:i + 4])
+                        for object_row in get_unique_rows(dict.fromkeys(fv_row_columns)):
+                            material = samples.get(":".join(['Sample Name', str(object_row['Sample Name'])]))
+                            if isinstance(material, Sample):
+                                _add_factor_values(material, columns, object_row, self.factors,
+                                                   ontology_source_map, unit_categories)
+
+            elif object_label in _LABELS_DATA_NODES:
+                for object_row in get_unique_rows(column_group):
+                    data_file = data.get(object_label + ':' + str(object_row[object_label]))
+                    if data_file is not None:
+                        _add_comments(data_file, column_group, object_row)
+
+            elif object_label.startswith('Protocol REF'):
+                object_label_index = list(columns).index(object_label)
+                keys = process_key_index.keys(column_group, _cg)
+                process_keys[_cg] = keys
+                protocol_refs = DF[object_label].map(str).tolist()
+                group_values = {c: DF[c].tolist() for c in column_group}
+
+                # one Process per distinct key, in order of first appearance,
+                # and parsed from its first row
+                first_rows = DataFrame({'key': keys, 'protocol_ref': protocol_refs}).drop_duplicates(subset='key')
+                for i, process_key, protocol_ref in first_rows.itertuples(name=None):
+                    try:
+                        process = processes[process_key]
+                    except KeyError:
+                        process = Process(executes_protocol=protocol_ref)
+                        processes.update(dict([(process_key, process)]))
+                    object_row = {c: group_values[c][i] for c in column_group}
+                    _add_parameter_values(process, protocol_ref, column_group, object_row, protocol_map,
+                                          ontology_source_map, unit_categories)
+                    _add_comments(process, column_group, object_row)
+
+                name_column_hits = [n for n in column_group if n in _LABELS_ASSAY_NODES]
+                if len(name_column_hits) == 1:
+                    # the name of the process is the one of its last row
+                    for process_key, name in zip(keys, DF[name_column_hits[0]].map(str).tolist()):
+                        processes[process_key].name = name
+
+                output_node_index = find_gt(node_cols, object_label_index)
+                output_proc_index = find_gt(proc_cols, object_label_index)
+                post_chained_protocol = any(
+                    col_name for col_name in columns[(object_label_index + 1): output_node_index].values
+                    if col_name.startswith('Protocol REF')
+                )
+                if (output_proc_index < output_node_index > -1 and not post_chained_protocol) \
+                        or (output_proc_index > output_node_index):
+                    for process_key, output_node in zip(keys, get_nodes(columns[output_node_index])):
+                        if output_node is not None:
+                            link_node(processes[process_key], 'outputs', output_node)
+
+                input_node_index = find_lt(node_cols, object_label_index)
+                input_proc_index = find_lt(proc_cols, object_label_index)
+                previous_chained_protocol = any(
+                    col_name for col_name in columns[input_node_index: (object_label_index - 1)].values
+                    if col_name.startswith('Protocol REF')
+                )
+                if input_proc_index < input_node_index > -1 and not previous_chained_protocol:
+                    for process_key, input_node in zip(keys, get_nodes(columns[input_node_index])):
+                        if input_node is not None:
+                            link_node(processes[process_key], 'inputs', input_node)
+
+        # Link Samples to their Sources and DataFiles to their Samples, on the
+        # distinct combinations of node values only
+        node_groups = [(_cg, column_group[0]) for _cg, column_group in enumerate(object_column_map)
+                       if column_group[0].startswith(('Source Name', 'Sample Name'))
+                       or column_group[0].endswith(' File')]
+        if node_groups:
+            node_values = DataFrame({_cg: DF[labl].map(str).tolist() for _cg, labl in node_groups})
+            for values in node_values.drop_duplicates().itertuples(index=False, name=None):
+                source_node_context = None
+                sample_node_context = None
+                for (_cg, object_label), value in zip(node_groups, values):
+                    node_map = get_node_map(object_label)
+                    if object_label.startswith('Source Name'):
+                        if node_map is None:
+                            source_node_context = None
+                        elif object_label + ':' + value in node_map:
+                            source_node_context = node_map[object_label + ':' + value]
+
+                    if object_label.startswith('Sample Name'):
+                        if node_map is None:
+                            sample_node_context = None
+                        elif object_label + ':' + value in node_map:
+                            sample_node_context = node_map[object_label + ':' + value]
+                        if source_node_context is not None:
+                            link_node(sample_node_context, 'derives_from', source_node_context)
+
+                    if object_label.endswith(' File'):
+                        data_node = node_map.get(object_label + ':' + value)
+                        if sample_node_context is not None and data_node is not None:
+                            link_node(data_node, 'generated_from', sample_node_context)
+
+        # Link the processes in each sequence. When a process is followed by
+        # different processes across rows, the last row wins.
+        protocol_groups = [_cg for _cg, column_group in enumerate(object_column_map)
+                           if column_group[0].startswith('Protocol REF')]
+        pair_frames = [
+            DataFrame({'left': process_keys[left_cg], 'right': process_keys[right_cg],
+                       'row': range(len(DF)), 'position': position})
+            for position, (left_cg, right_cg) in enumerate(pairwise(protocol_groups))
+        ]
+        if pair_frames:
+            pairs = concat(pair_frames, ignore_index=True) \
+                .drop_duplicates(subset=['left', 'right'], keep='last') \
+                .sort_values(by=['row', 'position'])
+            for left_key, right_key in zip(pairs['left'].tolist(), pairs['right'].tolist()):
+                plink(processes[left_key], processes[right_key])
+
+        return sources, samples, other_material, data, processes, characteristic_categories, unit_categories
@@ -1,3 +1,4 @@
-from isatools.isatab.load.read import read_investigation_file, read_tfile
+from isatools.isatab.load.read import read_investigation_file, read_tfile, read_tfile_fp
 from isatools.isatab.load.ProcessSequenceFactory import ProcessSequenceFactory, preprocess
+from isatools.isatab.load.cache import TableCache, set_table_cache
 from isatools.isatab.load.core import load, merge_study_with_assay_tables, load_table
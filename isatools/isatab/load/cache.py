@@ -0,0 +1,137 @@
+"""Opt-in on-disk cache of parsed ISA-Tab study and assay tables.
+
+Parsed tables are stored as Feather (Arrow IPC) files, together with their
+ISA-Tab header, and are read back memory-mapped. An entry is keyed by the
+absolute path, the size and the modification time of the table file, and
+optionally by a hash of its contents, so an edited file is parsed again.
+
+The cache needs pyarrow. When it is not installed, tables are parsed as if
+no cache was set.
+"""
+from os import path, makedirs, replace, stat, getpid
+from hashlib import sha256
+from json import dumps, loads
+
+from isatools.isatab.defaults import log
+
+
+_CACHE_VERSION = '1'
+_HEADER_KEY = b'isatools.isatab_header'
+
+_default_cache = None
+_feather = None
+
+
+class TableCache(object):
+    """Directory of parsed ISA-Tab tables
+
+    :param cache_dir: The directory where cached tables are written
+    :param hash_content: Also key the entries on the SHA-256 of the file
+    contents, for file systems where size and mtime are not reliable
+    """
+
+    def __init__(self, cache_dir, hash_content=False):
+        self.cache_dir = cache_dir
+        self.hash_content = hash_content
+
+    def key(self, file_path, reader):
+        """Get the cache key of a table file
+
+        :param file_path: Path to the table file
+        :param reader: Name of the reader, with its options, that parsed the
+        table
+        :return: A hexadecimal key
+        """
+        file_path = path.abspath(file_path)
+        file_stat = stat(file_path)
+        parts = [_CACHE_VERSION, reader, file_path, str(file_stat.st_size), str(file_stat.st_mtime_ns)]
+        if self.hash_content:
+            content_hash = sha256()
+            with open(file_path, 'rb') as fp:
+                for chunk in iter(lambda: fp.read(1 << 20), b''):
+                    content_hash.update(chunk)
+            parts.append(content_hash.hexdigest())
+        return sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Get a cached table
+
+        :param key: The cache key of the table file
+        :return: A tuple of the DataFrame and its ISA-Tab header, or None if
+        the table is not cached
+        """
+        cache_path = path.join(self.cache_dir, key + '.feather')
+        if not path.exists(cache_path):
+            return None
+        try:
+            table = _import_feather().read_table(cache_path, memory_map=True)
+            header = loads(table.schema.metadata[_HEADER_KEY].decode('utf-8'))
+            df = table.to_pandas()
+        except Exception as e:
+            log.warning("Could not read cached table %s: %s", cache_path, e)
+            return None
+        log.debug("Read cached table %s", cache_path)
+        return df, header
+
+    def put(self, key, df, isatab_header):
+        """Cache a parsed table
+
+        :param key: The cache key of the table file, computed before it was
+        read
+        :param df: The parsed DataFrame
+        :param isatab_header: The ISA-Tab header of the table
+        """
+        from pyarrow import Table
+        cache_path = path.join(self.cache_dir, key + '.feather')
+        tmp_path = '{}.{}.tmp'.format(cache_path, getpid())
+        try:
+            makedirs(self.cache_dir, exist_ok=True)
+            table = Table.from_pandas(df)
+            metadata = dict(table.schema.metadata or {})
+            metadata[_HEADER_KEY] = dumps(isatab_header).encode('utf-8')
+            _import_feather().write_feather(
+                table.replace_schema_metadata(metadata), tmp_path, compression='uncompressed')
+            replace(tmp_path, cache_path)
+        except Exception as e:
+            log.warning("Could not write cached table %s: %s", cache_path, e)
+
+
+def _import_feather():
+    global _feather
+    if _feather is None:
+        try:
+            from pyarrow import feather
+            _feather = feather
+        except ImportError:
+            log.warning("pyarrow is not installed, the ISA-Tab table cache is disabled")
+            _feather = False
+    return _feather or None
+
+
+def set_table_cache(cache_dir, hash_content=False):
+    """Set the table cache used when none is given to read_tfile() or
+    load_table()
+
+    :param cache_dir: The cache directory, or None to disable the cache
+    :param hash_content: Also key the entries on the file contents
+    :return: The TableCache, or None
+    """
+    global _default_cache
+    _default_cache = TableCache(cache_dir, hash_content=hash_content) if cache_dir else None
+    return _default_cache
+
+
+def get_table_cache(cache=None):
+    """Get the table cache to use
+
+    :param cache: A TableCache, a cache directory, False to bypass the cache,
+    or None for the cache set with set_table_cache()
+    :return: A TableCache, or None
+    """
+    if cache is None:
+        cache = _default_cache
+    elif cache is not False and not isinstance(cache, TableCache):
+        cache = TableCache(cache)
+    if not cache or _import_feather() is None:
+        return None
+    return cache
@@ -1,15 +1,20 @@
 from os import path
 from glob import glob
+from functools import partial
 from re import compile
+from io import BytesIO
+from pickle import Pickler, Unpickler, dumps, loads
+from concurrent.futures import ProcessPoolExecutor
 
 from pandas import merge, read_csv
 from numpy import nan
 
 from isatools.utils import utf8_text_file_open
 from isatools.isatab.load.read import read_tfile, read_investigation_file
+from isatools.isatab.load.cache import get_table_cache
 from isatools.isatab.load.ProcessSequenceFactory import ProcessSequenceFactory
 from isatools.isatab.defaults import _RX_COMMENT, log
-from isatools.isatab.utils import strip_comments
+from isatools.isatab.utils import strip_comments, IsaTabDataFrame
 from isatools.model import (
     OntologyAnnotation,
     Publication,
@@ -25,12 +30,118 @@ from isatools.model import (
 )
 
 
-def load(isatab_path_or_ifile, skip_load_tables=False):
+class _SharedObjectsPickler(Pickler):
+    """Pickles the objects shared between the study and the assay tables as
+    references to their position in the list of shared objects"""
+
+    def __init__(self, file, shared_objects):
+        super().__init__(file)
+        self.shared_ids = {id(obj): i for i, obj in enumerate(shared_objects)}
+
+    def persistent_id(self, obj):
+        return self.shared_ids.get(id(obj))
+
+
+class _SharedObjectsUnpickler(Unpickler):
+    """Resolves the references written by _SharedObjectsPickler to the
+    shared objects of this process"""
+
+    def __init__(self, file, shared_objects):
+        super().__init__(file)
+        self.shared_objects = shared_objects
+
+    def persistent_load(self, pid):
+        return self.shared_objects[pid]
+
+
+def _get_shared_objects(ontology_sources, study_samples, study_protocols, study_factors):
+    """Lists the study objects an assay table can reference, in a stable order
+
+    :param ontology_sources: The investigation OntologySources
+    :param study_samples: The study Samples
+    :param study_protocols: The study Protocols
+    :param study_factors: The study StudyFactors
+    :return: A list of the shared objects
+    """
+    parameters = [parameter for protocol in study_protocols for parameter in protocol.parameters]
+    return list(ontology_sources) + list(study_samples) + list(study_protocols) + parameters + list(study_factors)
+
+
+def _create_from_assay_table(table_path, pickled_study_objects, columnar=False, cache=False):
+    """Builds the process sequence of an assay table in a worker process
+
+    The study Samples referenced by the table are updated by the
+    ProcessSequenceFactory, so their state is returned alongside the
+    factory result for the parent process to merge back.
+
+    :param table_path: Path to the assay table file
+    :param pickled_study_objects: The pickled investigation OntologySources
+    and study Samples, Protocols and StudyFactors
+    :param columnar: Whether to use the column-oriented engine
+    :param cache: The TableCache to read the table from, or False
+    :return: The pickled factory result and sample states, with the shared
+    objects pickled as references
+    """
+    ontology_sources, study_samples, study_protocols, study_factors = loads(pickled_study_objects)
+    result = ProcessSequenceFactory(
+        ontology_sources=ontology_sources,
+        study_samples=study_samples,
+        study_protocols=study_protocols,
+        study_factors=study_factors).create_from_df(read_tfile(table_path, cache=cache), columnar=columnar)
+    sample_states = [(sample, sample.characteristics, sample.comments, sample.factor_values, sample.derives_from)
+                     for sample in result[1].values()]
+    buffer = BytesIO()
+    _SharedObjectsPickler(buffer, _get_shared_objects(
+        ontology_sources, study_samples, study_protocols, study_factors)).dump((result, sample_states))
+    return buffer.getvalue()
+
+
+def _merge_assay_table_result(pickled_result, shared_objects):
+    """Unpickles the result of _create_from_assay_table() and merges the
+    updates of the study Samples back into this process' Samples, as loading
+    the assay table in this process would have
+
+    :param pickled_result: The result of _create_from_assay_table()
+    :param shared_objects: The shared objects, as given by
+    _get_shared_objects()
+    :return: The ProcessSequenceFactory result for the assay table
+    """
+    result, sample_states = _SharedObjectsUnpickler(BytesIO(pickled_result), shared_objects).load()
+    for sample, characteristics, comments, factor_values, derives_from in sample_states:
+        characteristic_category_terms = [x.category.term for x in sample.characteristics]
+        sample.characteristics.extend(
+            [x for x in characteristics if x.category.term not in characteristic_category_terms])
+        comment_names = [x.name for x in sample.comments]
+        sample.comments.extend([x for x in comments if x.name not in comment_names])
+        new_factor_values = [x for x in factor_values if x not in sample.factor_values]
+        if new_factor_values:
+            sample.factor_values = list(set(sample.factor_values).union(new_factor_values))
+        for source in derives_from:
+            if source not in sample.derives_from:
+                sample.derives_from.append(source)
+    return result
+
+
+def load(isatab_path_or_ifile, skip_load_tables=False, columnar=False, workers=None, lazy=False, cache=None):
     """Load an ISA-Tab into ISA Data Model objects
 
     :param isatab_path_or_ifile: Full path to an ISA-Tab directory or file-like
     buffer object pointing to an investigation file
     :param skip_load_tables: Whether or not to skip loading the table files
+    :param columnar: Whether to build the process sequences with the
+    column-oriented engine of the ProcessSequenceFactory, much faster on large
+    tables
+    :param workers: Number of worker processes used to build the assay tables
+    of a study concurrently. By default, the tables are built one after
+    another in this process
+    :param lazy: Whether to defer loading each study and assay table file
+    until the sources, samples, process sequence or other attributes built
+    from it are first accessed. Loading an assay table also loads its study
+    table, and the study samples only get the annotations found in an assay
+    table once that assay is loaded. Ignores workers
+    :param cache: A TableCache or a cache directory to read the parsed study
+    and assay tables from, False to bypass the cache, or None for the cache
+    set with set_table_cache()
     :return: Investigation objects
     """
 
@@ -178,6 +289,109 @@ def load(isatab_path_or_ifile, skip_load_tables=False):
             comments.append(comment)
         return comments
 
+    def resolve_protocols(study, process_sequence, protocol_map):
+        """Sets the Protocol executed by each process from its Protocol REF,
+        falling back to an 'unknown protocol' added to the study
+
+        :param study: The Study the processes belong to
+        :param process_sequence: A list of Process objects
+        :param protocol_map: The study Protocols by name
+        :return: None
+        """
+        description = "This protocol was auto-generated where a protocol could not be determined."
+        for process in process_sequence:
+            try:
+                process.executes_protocol = protocol_map[process.executes_protocol]
+            except KeyError:
+                try:
+                    unknown_protocol = protocol_map['unknown']
+                except KeyError:
+                    protocol_map['unknown'] = Protocol(name="unknown protocol", description=description)
+                    unknown_protocol = protocol_map['unknown']
+                    study.protocols.append(unknown_protocol)
+                process.executes_protocol = unknown_protocol
+
+    def load_study_table(study, protocol_map):
+        """Builds the materials and process sequence of a study from its
+        table file
+
+        :param study: The Study to build
+        :param protocol_map: The study Protocols by name
+        :return: None
+        """
+        study_tfile_df = read_tfile(path.join(path.dirname(FP.name), study.filename), cache=table_cache)
+        iosrs = investigation.ontology_source_references
+        sources, samples, _, __, processes, characteristic_categories, unit_categories = \
+            ProcessSequenceFactory(
+                ontology_sources=iosrs,
+                study_protocols=study.protocols,
+                study_factors=study.factors
+            ).create_from_df(study_tfile_df, columnar=columnar)
+        study.sources = sorted(list(sources.values()), key=lambda x: x.name, reverse=False)
+        study.samples = sorted(list(samples.values()), key=lambda x: x.name, reverse=False)
+        study.process_sequence = list(processes.values())
+        study.characteristic_categories = sorted(
+            list(characteristic_categories.values()),
+            key=lambda x: x.term,
+            reverse=False)
+        study.units = sorted(list(unit_categories.values()), key=lambda x: x.term, reverse=False)
+        resolve_protocols(study, study.process_sequence, protocol_map)
+
+    def create_from_assay_table(study, assay):
+        """Runs the ProcessSequenceFactory on an assay table file
+
+        :param study: The Study the assay belongs to
+        :param assay: The Assay to build
+        :return: The ProcessSequenceFactory result for the assay table
+        """
+        return ProcessSequenceFactory(
+            ontology_sources=investigation.ontology_source_references,
+            study_samples=study.samples,
+            study_protocols=study.protocols,
+            study_factors=study.factors).create_from_df(
+            read_tfile(path.join(path.dirname(FP.name), assay.filename), cache=table_cache),
+            columnar=columnar)
+
+    def set_assay_table(assay, assay_table, study, protocol_map):
+        """Sets the materials and process sequence of an assay from the
+        ProcessSequenceFactory result for its table file
+
+        :param assay: The Assay to build
+        :param assay_table: The ProcessSequenceFactory result
+        :param study: The Study the assay belongs to
+        :param protocol_map: The study Protocols by name
+        :return: None
+        """
+        _, samples, other, data, processes, characteristic_categories, unit_categories = assay_table
+        assay.samples = sorted(
+            list(samples.values()), key=lambda x: x.name,
+            reverse=False)
+        assay.other_material = sorted(
+            list(other.values()), key=lambda x: x.name,
+            reverse=False)
+        assay.data_files = sorted(
+            list(data.values()), key=lambda x: x.filename,
+            reverse=False)
+        assay.process_sequence = list(processes.values())
+        assay.characteristic_categories = sorted(
+            list(characteristic_categories.values()),
+            key=lambda x: x.term, reverse=False)
+        assay.units = sorted(
+            list(unit_categories.values()), key=lambda x: x.term,
+            reverse=False)
+        resolve_protocols(study, assay.process_sequence, protocol_map)
+
+    def load_assay_table(assay, study, protocol_map):
+        """Builds the materials and process sequence of an assay from its
+        table file
+
+        :param assay: The Assay to build
+        :param study: The Study the assay belongs to
+        :param protocol_map: The study Protocols by name
+        :return: None
+        """
+        set_assay_table(assay, create_from_assay_table(study, assay), study, protocol_map)
+
     FP = None
 
     if isinstance(isatab_path_or_ifile, str):
@@ -190,6 +404,11 @@ def load(isatab_path_or_ifile, skip_load_tables=False):
     else:
         raise IOError("Cannot resolve input file")
 
+    table_cache = get_table_cache(cache) or False
+    executor = None
+    if workers and not (skip_load_tables or lazy):
+        executor = ProcessPoolExecutor(max_workers=workers)
+
     try:
         df_dict = read_investigation_file(FP)
         investigation = Investigation()
@@ -272,36 +491,10 @@ def load(isatab_path_or_ifile, skip_load_tables=False):
             study.protocols = list(protocol_map.values())
             if skip_load_tables:
                 pass
+            elif lazy:
+                study.set_table_loader(partial(load_study_table, protocol_map=protocol_map))
             else:
-                study_tfile_df = read_tfile(path.join(path.dirname(FP.name), study.filename))
-                iosrs = investigation.ontology_source_references
-                sources, samples, _, __, processes, characteristic_categories, unit_categories = \
-                    ProcessSequenceFactory(
-                        ontology_sources=iosrs,
-                        study_protocols=study.protocols,
-                        study_factors=study.factors
-                    ).create_from_df(study_tfile_df)
-                study.sources = sorted(list(sources.values()), key=lambda x: x.name, reverse=False)
-                study.samples = sorted(list(samples.values()), key=lambda x: x.name, reverse=False)
-                study.process_sequence = list(processes.values())
-                study.characteristic_categories = sorted(
-                    list(characteristic_categories.values()),
-                    key=lambda x: x.term,
-                    reverse=False)
-                study.units = sorted(list(unit_categories.values()), key=lambda x: x.term, reverse=False)
-
-                for process in study.process_sequence:
-                    try:
-                        process.executes_protocol = protocol_map[process.executes_protocol]
-                    except KeyError:
-                        try:
-                            unknown_protocol = protocol_map['unknown']
-                        except KeyError:
-                            description = "This protocol was auto-generated where a protocol could not be determined."
-                            protocol_map['unknown'] = Protocol(name="unknown protocol", description=description)
-                            unknown_protocol = protocol_map['unknown']
-                            study.protocols.append(unknown_protocol)
-                        process.executes_protocol = unknown_protocol
+                load_study_table(study, protocol_map)
 
             for _, row in df_dict['s_assays'][i].iterrows():
                 assay = Assay()
@@ -317,52 +510,34 @@ def load(isatab_path_or_ifile, skip_load_tables=False):
                     row['Study Assay Technology Type Term Source REF']
                 )
                 assay.technology_platform = row['Study Assay Technology Platform']
-                if skip_load_tables:
-                    pass
-                else:
-                    iosrs = investigation.ontology_source_references
-                    assay_tfile_df = read_tfile(path.join(path.dirname(FP.name), assay.filename))
-                    _, samples, other, data, processes, characteristic_categories, unit_categories = \
-                        ProcessSequenceFactory(
-                            ontology_sources=iosrs,
-                            study_samples=study.samples,
-                            study_protocols=study.protocols,
-                            study_factors=study.factors).create_from_df(
-                            assay_tfile_df)
-                    assay.samples = sorted(
-                        list(samples.values()), key=lambda x: x.name,
-                        reverse=False)
-                    assay.other_material = sorted(
-                        list(other.values()), key=lambda x: x.name,
-                        reverse=False)
-                    assay.data_files = sorted(
-                        list(data.values()), key=lambda x: x.filename,
-                        reverse=False)
-                    assay.process_sequence = list(processes.values())
-                    assay.characteristic_categories = sorted(
-                        list(characteristic_categories.values()),
-                        key=lambda x: x.term, reverse=False)
-                    assay.units = sorted(
-                        list(unit_categories.values()), key=lambda x: x.term,
-                        reverse=False)
-
-                    description = "This protocol was auto-generated where a protocol could not be determined."
-                    for process in assay.process_sequence:
-                        try:
-                            process.executes_protocol = protocol_map[process.executes_protocol]
-                        except KeyError:
-                            try:
-                                unknown_protocol = protocol_map['unknown']
-                            except KeyError:
-                                protocol_map['unknown'] = Protocol(name="unknown protocol", description=description)
-                                unknown_protocol = protocol_map['unknown']
-                                study.protocols.append(unknown_protocol)
-                            process.executes_protocol = unknown_protocol
-
                 study.assays.append(assay)
+
+            if skip_load_tables:
+                pass
+            elif lazy:
+                for assay in study.assays:
+                    assay.set_table_loader(partial(load_assay_table, study=study, protocol_map=protocol_map))
+            elif executor is None:
+                for assay in study.assays:
+                    load_assay_table(assay, study, protocol_map)
+            else:
+                iosrs = investigation.ontology_source_references
+                study_objects = (iosrs, study.samples, study.protocols, study.factors)
+                pickled_study_objects = dumps(study_objects)
+                futures = [executor.submit(_create_from_assay_table,
+                                           path.join(path.dirname(FP.name), assay.filename),
+                                           pickled_study_objects, columnar, table_cache)
+                           for assay in study.assays]
+                shared_objects = _get_shared_objects(*study_objects)
+                for assay, future in zip(study.assays, futures):
+                    set_assay_table(assay, _merge_assay_table_result(future.result(), shared_objects),
+                                    study, protocol_map)
+
             investigation.studies.append(study)
     finally:
         FP.close()
+        if executor is not None:
+            executor.shutdown()
     return investigation
 
 
@@ -390,19 +565,33 @@ def merge_study_with_assay_tables(study_file_path, assay_file_path, target_file_
         merged_DF.to_csv(fp, sep='\t', index=False, header=study_DF.isatab_header + assay_DF.isatab_header[1:])
 
 
-def load_table(fp):
+def load_table(fp, cache=None):
     """Loads a ISA table file into a DataFrame
 
     :param fp: A file-like buffer object
+    :param cache: A TableCache or a cache directory to read the parsed table
+    from, False to bypass the cache, or None for the cache set with
+    set_table_cache(). Only file objects opened from a path are cached
     :return: DataFrame of the study or assay table
     """
-    try:
-        fp = strip_comments(fp)
-        df = read_csv(fp, dtype=str, sep='\t', encoding='utf-8').replace(nan, '')
-    except UnicodeDecodeError:
-        log.warning("Could not load file with UTF-8, trying ISO-8859-1")
-        fp = strip_comments(fp)
-        df = read_csv(fp, dtype=str, sep='\t', encoding='latin1').replace(nan, '')
+    table_cache = get_table_cache(cache)
+    file_path = getattr(fp, 'name', None)
+    if table_cache and not (isinstance(file_path, str) and path.isfile(file_path)):
+        table_cache = None
+    key = table_cache.key(file_path, 'load_table') if table_cache else None
+    cached = table_cache.get(key) if table_cache else None
+    if cached is not None:
+        df = cached[0]
+    else:
+        try:
+            fp = strip_comments(fp)
+            df = read_csv(fp, dtype=str, sep='\t', encoding='utf-8').replace(nan, '')
+        except UnicodeDecodeError:
+            log.warning("Could not load file with UTF-8, trying ISO-8859-1")
+            fp = strip_comments(fp)
+            df = read_csv(fp, dtype=str, sep='\t', encoding='latin1').replace(nan, '')
+        if table_cache:
+            table_cache.put(key, df, IsaTabDataFrame(df).isatab_header)
     labels = df.columns
     new_labels = []
     for label in labels:
@@ -1,11 +1,71 @@
-from io import StringIO
+from csv import reader as csv_reader, Error as CSVError
 
-from pandas import read_csv
-from numpy import nan
+from pandas import read_csv, DataFrame
+from pandas.errors import ParserError
 
 from isatools.utils import utf8_text_file_open
 from isatools.isatab.defaults import log
 from isatools.isatab.utils import strip_comments, IsaTabDataFrame
+from isatools.isatab.load.cache import get_table_cache
+
+
+# Values read as empty cells, as pandas.read_csv() does by default
+_NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A',
+    'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+# Section keys of the investigation file, in order, with their key in the
+# dictionary returned by read_investigation_file()
+_INVESTIGATION_SECTIONS = [
+    ('ONTOLOGY SOURCE REFERENCE', 'ontology_sources'),
+    ('INVESTIGATION', 'investigation'),
+    ('INVESTIGATION PUBLICATIONS', 'i_publications'),
+    ('INVESTIGATION CONTACTS', 'i_contacts')
+]
+_STUDY_SECTIONS = [
+    ('STUDY', 'studies'),
+    ('STUDY DESIGN DESCRIPTORS', 's_design_descriptors'),
+    ('STUDY PUBLICATIONS', 's_publications'),
+    ('STUDY FACTORS', 's_factors'),
+    ('STUDY ASSAYS', 's_assays'),
+    ('STUDY PROTOCOLS', 's_protocols'),
+    ('STUDY CONTACTS', 's_contacts')
+]
+
+
+def _read_investigation_rows(fp):
+    """Tokenizes an investigation file into rows of cells, skipping comment
+    and blank lines. Quoted cells may span several lines
+
+    :param fp: A file-like buffer object of the investigation file
+    :return: A generator of the rows, as lists of str
+    :raises ParserError: If a cell is not quoted properly
+    """
+    lines = (line.rstrip() + '\n' for line in fp if not line.lstrip().startswith('#'))
+    try:
+        for row in csv_reader(lines, delimiter='\t', quotechar='"', strict=True):
+            if row:
+                yield row
+    except CSVError as e:
+        raise ParserError(str(e))
+
+
+def _build_section_df(rows):
+    """Builds the DataFrame of an investigation file section from its rows.
+    Each row label becomes a column, and each non-empty column of the section
+    becomes a DataFrame row, e.g. one DataFrame row per contact
+
+    :param rows: The rows of the section, as lists of str
+    :return: A DataFrame corresponding to the file section, whose first
+    column, labelled 0, holds the position of each entry in the file
+    """
+    rows = [['' if cell in _NA_VALUES else cell for cell in row] for row in rows]
+    width = max([len(row) for row in rows], default=1)
+    positions = [j for j in range(1, width) if any(len(row) > j and row[j] for row in rows)]
+    records = [[j] + [row[j] if len(row) > j else '' for row in rows] for j in positions]
+    columns = [0] + [row[0] for row in rows]
+    return DataFrame(records, columns=columns, index=range(1, len(records) + 1), dtype=object)
 
 
 def read_investigation_file(fp):
@@ -13,164 +73,88 @@ def read_investigation_file(fp):
     DataFrame being each section of the investigation file. e.g. One DataFrame
     for the INVESTIGATION PUBLICATIONS section
 
+    The file is tokenized in a single pass, and the cells are read as str.
+
     :param fp: A file-like buffer object of the investigation file
     :return: A dictionary holding a set of DataFrames for each section of the
     investigation file. See below implementation for detail
     """
+    df_dict = dict()
+    for _, df_key in _STUDY_SECTIONS:
+        df_dict[df_key] = list()
+
+    sections = _INVESTIGATION_SECTIONS + _STUDY_SECTIONS
+    next_section = 0
+    section_df_key = None
+    section_rows = []
+
+    def _add_section():
+        if section_df_key in df_dict:
+            df_dict[section_df_key].append(_build_section_df(section_rows))
+        else:
+            df_dict[section_df_key] = _build_section_df(section_rows)
+
+    for row in _read_investigation_rows(fp):
+        sec_key, df_key = sections[next_section]
+        if len(row) == 1 and row[0] == sec_key:
+            if section_df_key is not None:
+                _add_section()
+            section_df_key = df_key
+            section_rows = []
+            next_section += 1
+            if next_section == len(sections):  # Iterate through STUDY blocks until end of file
+                next_section = len(_INVESTIGATION_SECTIONS)
+        elif section_df_key is None:
+            raise IOError("Expected: " + sec_key + " section, but got: " + '\t'.join(row))
+        else:
+            section_rows.append(row)
+
+    if section_df_key is not None:
+        _add_section()
+    if next_section != len(_INVESTIGATION_SECTIONS):
+        raise IOError("Expected: " + sections[next_section][0] + " section, but got: end of file")
+    return df_dict
 
-    def _peek(f):
-        """Peek at the next line without moving to the next line. This function
-        get the position of the next line, reads the next line, then resets the
-        file pointer to the original position
-
-        :param f: A file-like buffer object
-        :return: The next line past the current line
-        """
-        position = f.tell()
-        line = f.readline()
-        f.seek(position)
-        return line
-
-    def _read_tab_section(f, sec_key, next_sec_key=None):
-        """Slices a file by section delimited by section keys
-
-        :param f: A file-like buffer object
-        :param sec_key: Delimiter key of beginning of section
-        :param next_sec_key: Delimiter key of end of section
-        :return: A memory file of the section slice, as a string buffer object
-        """
-        line = f.readline()
-        normed_line = line.rstrip()
-        if normed_line[0] == '"':
-            normed_line = normed_line[1:]
-        if normed_line[len(normed_line) - 1] == '"':
-            normed_line = normed_line[:len(normed_line) - 1]
-        if not normed_line == sec_key:
-            raise IOError("Expected: " + sec_key + " section, but got: "
-                          + normed_line)
-        memf = StringIO()
-        while not _peek(f=f).rstrip() == next_sec_key:
-            line = f.readline()
-            if not line:
-                break
-            memf.write(line.rstrip() + '\n')
-        memf.seek(0)
-        return memf
-
-    def _build_section_df(f: StringIO):
-        """Reads a file section into a DataFrame
-
-        :param f: A file-like buffer object
-        :return: A DataFrame corresponding to the file section
-        """
-        df = read_csv(f, names=range(0, 128), sep='\t', engine='python',
-                      encoding='utf-8').dropna(axis=1, how='all')
-        df = df.T
-        df.replace(nan, '', regex=True, inplace=True)
-        #  Strip out the nan entries
-        df.reset_index(inplace=True)
-        #  Reset index so it is accessible as column
-        df.columns = df.iloc[0]
-        #  If all was OK, promote this row to the column headers
-        df = df.reindex(df.index.drop(0))
-        #  Reindex the DataFrame
-        return df
-
-    memory_file = StringIO()
-    line = True
-    while line:
-        line = fp.readline()
-        if not line.lstrip().startswith('#'):
-            memory_file.write(line)
-    memory_file.seek(0)
 
-    df_dict = dict()
+def read_tfile_fp(tfile_fp, index_col=None) -> IsaTabDataFrame:
+    """Read an open table file into a DataFrame
 
-    # Read in investigation file into DataFrames first
-    df_dict['ontology_sources'] = _build_section_df(_read_tab_section(
-        f=memory_file,
-        sec_key='ONTOLOGY SOURCE REFERENCE',
-        next_sec_key='INVESTIGATION'
-    ))
-    df_dict['investigation'] = _build_section_df(_read_tab_section(
-        f=memory_file,
-        sec_key='INVESTIGATION',
-        next_sec_key='INVESTIGATION PUBLICATIONS'
-    ))
-    df_dict['i_publications'] = _build_section_df(_read_tab_section(
-        f=memory_file,
-        sec_key='INVESTIGATION PUBLICATIONS',
-        next_sec_key='INVESTIGATION CONTACTS'
-    ))
-    df_dict['i_contacts'] = _build_section_df(_read_tab_section(
-        f=memory_file,
-        sec_key='INVESTIGATION CONTACTS',
-        next_sec_key='STUDY'
-    ))
-    df_dict['studies'] = list()
-    df_dict['s_design_descriptors'] = list()
-    df_dict['s_publications'] = list()
-    df_dict['s_factors'] = list()
-    df_dict['s_assays'] = list()
-    df_dict['s_protocols'] = list()
-    df_dict['s_contacts'] = list()
-    while _peek(memory_file):  # Iterate through STUDY blocks until end of file
-        df_dict['studies'].append(_build_section_df(_read_tab_section(
-            f=memory_file,
-            sec_key='STUDY',
-            next_sec_key='STUDY DESIGN DESCRIPTORS'
-        )))
-        df_dict['s_design_descriptors'].append(
-            _build_section_df(_read_tab_section(
-                f=memory_file,
-                sec_key='STUDY DESIGN DESCRIPTORS',
-                next_sec_key='STUDY PUBLICATIONS'
-            )))
-        df_dict['s_publications'].append(_build_section_df(_read_tab_section(
-            f=memory_file,
-            sec_key='STUDY PUBLICATIONS',
-            next_sec_key='STUDY FACTORS'
-        )))
-        df_dict['s_factors'].append(_build_section_df(_read_tab_section(
-            f=memory_file,
-            sec_key='STUDY FACTORS',
-            next_sec_key='STUDY ASSAYS'
-        )))
-        df_dict['s_assays'].append(_build_section_df(_read_tab_section(
-            f=memory_file,
-            sec_key='STUDY ASSAYS',
-            next_sec_key='STUDY PROTOCOLS'
-        )))
-        df_dict['s_protocols'].append(_build_section_df(_read_tab_section(
-            f=memory_file,
-            sec_key='STUDY PROTOCOLS',
-            next_sec_key='STUDY CONTACTS'
-        )))
-        df_dict['s_contacts'].append(_build_section_df(_read_tab_section(
-            f=memory_file,
-            sec_key='STUDY CONTACTS',
-            next_sec_key='STUDY'
-        )))
-    return df_dict
+    :param tfile_fp: A table file object, such as a StringIO buffer
+    :param index_col: The column to use as index
+    :return: A table file DataFrame
+    """
+    log.debug("Reading file header")
+    tfile_fp.seek(0)
+    log.debug("Reading file into DataFrame")
+    tfile_fp = strip_comments(tfile_fp)
+    csv = read_csv(tfile_fp, dtype=str, sep='\t', index_col=index_col, encoding='utf-8').fillna('')
+    return IsaTabDataFrame(csv)
 
 
-def read_tfile(tfile_path, index_col=None, factor_filter=None) -> IsaTabDataFrame:
+def read_tfile(tfile_path, index_col=None, factor_filter=None, cache=None) -> IsaTabDataFrame:
     """Read a table file into a DataFrame
 
     :param tfile_path: Path to a table file to load
     :param index_col: The column to use as index
     :param factor_filter: Factor filter tuple, e.g. ('Gender', 'Male') will
     filter on FactorValue[Gender] == Male
+    :param cache: A TableCache or a cache directory to read the parsed table
+    from, False to bypass the cache, or None for the cache set with
+    set_table_cache()
     :return: A table file DataFrame
     """
-    log.debug("Opening %s", tfile_path)
-    with utf8_text_file_open(tfile_path) as tfile_fp:
-        log.debug("Reading file header")
-        tfile_fp.seek(0)
-        log.debug("Reading file into DataFrame")
-        tfile_fp = strip_comments(tfile_fp)
-        csv = read_csv(tfile_fp, dtype=str, sep='\t', index_col=index_col, encoding='utf-8').fillna('')
-        tfile_df = IsaTabDataFrame(csv)
+    table_cache = get_table_cache(cache)
+    reader = 'read_tfile:{!r}'.format(index_col)
+    key = table_cache.key(tfile_path, reader) if table_cache else None
+    cached = table_cache.get(key) if table_cache else None
+    if cached is not None:
+        tfile_df = IsaTabDataFrame(cached[0])
+    else:
+        log.debug("Opening %s", tfile_path)
+        with utf8_text_file_open(tfile_path) as tfile_fp:
+            tfile_df = read_tfile_fp(tfile_fp, index_col=index_col)
+        if table_cache:
+            table_cache.put(key, tfile_df, tfile_df.isatab_header)
     if factor_filter:
         log.debug("Filtering DataFrame contents on Factor Value %s", factor_filter)
         return tfile_df[tfile_df['Factor Value[{}]'.format(factor_filter[0])] == factor_filter[1]]
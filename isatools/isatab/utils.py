@@ -173,6 +173,139 @@ def strip_comments(in_fp):
     return out_fp
 
 
+class ProcessKeyIndex(object):
+    """Per-table index of the process keys of the Protocol REF columns.
+
+    Which columns make up a process key only depends on the table and on the
+    Protocol REF column group, so the Name column lookup, the input/output
+    cardinality decision and the key column selection are worked out once per
+    column group, and the keys of all the rows are computed in one go. See
+    process_keygen() for how a process key is built.
+
+    :param DF: The whole table's DataFrame
+    """
+
+    def __init__(self, DF):
+        self.DF = DF
+        self.node_cols = [i for i, c in enumerate(DF.columns) if c in _LABELS_MATERIAL_NODES + _LABELS_DATA_NODES]
+        self._key_columns = {}
+        self._keys = {}
+
+    def key_columns(self, column_group, object_label_index):
+        """Selects the columns the process keys of a column group are built
+        from.
+
+        :param column_group: List of column headers of the Protocol REF group
+        :param object_label_index: Index of the column group
+        :return: A tuple (name column, node column, Parameter Value columns,
+        Date column, Performer column); unused columns are None
+        """
+        if object_label_index in self._key_columns:
+            return self._key_columns[object_label_index]
+        all_columns = self.DF.columns
+        name_column = None
+        node_column = None
+        pv_cols = []
+        date_column = None
+        performer_column = None
+
+        name_column_hits = [n for n in column_group if n in _LABELS_ASSAY_NODES]
+        if len(name_column_hits) == 1:
+            name_column = name_column_hits[0]
+        else:
+            output_node_index = find_gt(self.node_cols, object_label_index)
+            input_node_index = find_lt(self.node_cols, object_label_index)
+            input_nodes_with_prot_keys = self.DF[[all_columns[object_label_index],
+                                                  all_columns[input_node_index]]].drop_duplicates()
+            output_nodes_with_prot_keys = self.DF[[all_columns[object_label_index],
+                                                   all_columns[output_node_index]]].drop_duplicates()
+            if len(input_nodes_with_prot_keys) > len(output_nodes_with_prot_keys):
+                node_index = output_node_index
+            else:
+                node_index = input_node_index
+            if node_index > -1:
+                node_column = all_columns[node_index]
+
+            pv_cols = [c for c in column_group if c.startswith('Parameter Value[')]
+            date_col_hits = [c for c in column_group if c.startswith('Date')]
+            if len(date_col_hits) == 1:
+                date_column = date_col_hits[0]
+            performer_col_hits = [c for c in column_group if c.startswith('Performer')]
+            if len(performer_col_hits) == 1:
+                performer_column = performer_col_hits[0]
+
+        key_columns = (name_column, node_column, pv_cols, date_column, performer_column)
+        self._key_columns[object_label_index] = key_columns
+        return key_columns
+
+    def key(self, protocol_ref, column_group, object_label_index, series):
+        """Builds the process key of a single row.
+
+        :param protocol_ref: The Protocol REF value
+        :param column_group: List of column headers of the Protocol REF group
+        :param object_label_index: Index of the column group
+        :param series: A DataFrame Series object of the row
+        :return: The process key of the row
+        """
+        name_column, node_column, pv_cols, date_column, performer_column = self.key_columns(
+            column_group, object_label_index)
+        if name_column is not None:
+            return series[name_column]
+
+        node_key = str(series[node_column]) if node_column is not None else ''
+        if len(pv_cols) > 0:
+            process_key = node_key + ':' + protocol_ref + ':' + '/'.join([str(v) for v in series[pv_cols]])
+        else:
+            process_key = node_key + '/' + protocol_ref
+        if date_column is not None:
+            process_key = ':'.join([process_key, series[date_column]])
+        if performer_column is not None:
+            process_key = ':'.join([process_key, series[performer_column]])
+        return process_key
+
+    def keys(self, column_group, object_label_index):
+        """Computes the process keys of all the rows of a column group.
+
+        :param column_group: List of column headers of the Protocol REF group
+        :param object_label_index: Index of the column group
+        :return: A list holding the process key of each row, in table order
+        """
+        if object_label_index in self._keys:
+            return self._keys[object_label_index]
+        DF = self.DF
+        name_column, node_column, pv_cols, date_column, performer_column = self.key_columns(
+            column_group, object_label_index)
+        if name_column is not None:
+            keys = DF[name_column].tolist()
+        else:
+            node_keys = DF[node_column].map(str) if node_column is not None else ''
+            protocol_refs = DF[column_group[0]].map(str)
+            if len(pv_cols) > 0:
+                pv_values = DF[pv_cols[0]].map(str)
+                for pv_col in pv_cols[1:]:
+                    pv_values = pv_values + '/' + DF[pv_col].map(str)
+                process_keys = node_keys + ':' + protocol_refs + ':' + pv_values
+            else:
+                process_keys = node_keys + '/' + protocol_refs
+            if date_column is not None:
+                process_keys = process_keys + ':' + DF[date_column]
+            if performer_column is not None:
+                process_keys = process_keys + ':' + DF[performer_column]
+            keys = process_keys.tolist()
+        self._keys[object_label_index] = keys
+        return keys
+
+    def get(self, column_group, object_label_index, series_index):
+        """Looks up the process key of a row of the table.
+
+        :param column_group: List of column headers of the Protocol REF group
+        :param object_label_index: Index of the column group
+        :param series_index: Row index of the row, as given by DF.iterrows()
+        :return: The process key of the row
+        """
+        return self.keys(column_group, object_label_index)[self.DF.index.get_loc(series_index)]
+
+
 def process_keygen(protocol_ref, column_group, object_label_index, all_columns, series, series_index, DF):
     """Generate the process key.
 
@@ -185,6 +318,9 @@ def process_keygen(protocol_ref, column_group, object_label_index, all_columns,
     If PVs not available we look at the left-most inputs or right-most outputs
     to use as the disambiguation.
 
+    This builds a ProcessKeyIndex over the whole table on every call; when
+    generating the keys of many rows, use a ProcessKeyIndex directly instead.
+
     :param protocol_ref: The Protocol REF value
     :param column_group: List of column headers for the object in context, e.g.
     [Sample Name, Characteristics[Material Type], Comment[My Comment]]
@@ -195,58 +331,7 @@ def process_keygen(protocol_ref, column_group, object_label_index, all_columns,
     :param DF: The whole table's DataFrame
     :return: The process key to disambiguate Processes
     """
-    name_column_hits = [n for n in column_group if n in _LABELS_ASSAY_NODES]
-    if len(name_column_hits) == 1:
-        return series[name_column_hits[0]]
-
-    process_key = protocol_ref
-    node_cols = [i for i, c in enumerate(all_columns) if c in _LABELS_MATERIAL_NODES + _LABELS_DATA_NODES]
-    input_node_value = ''
-    output_node_value = ''
-    output_node_index = find_gt(node_cols, object_label_index)
-    if output_node_index > -1:
-        output_node_label = all_columns[output_node_index]
-        output_node_value = str(series[output_node_label])
-
-    input_node_index = find_lt(node_cols, object_label_index)
-    if input_node_index > -1:
-        input_node_label = all_columns[input_node_index]
-        input_node_value = str(series[input_node_label])
-
-    input_nodes_with_prot_keys = DF[[all_columns[object_label_index], all_columns[input_node_index]]].drop_duplicates()
-    output_nodes_with_prot_keys = DF[[all_columns[object_label_index],
-                                      all_columns[output_node_index]]].drop_duplicates()
-
-    if len(input_nodes_with_prot_keys) > len(output_nodes_with_prot_keys):
-        node_key = output_node_value
-    else:
-        node_key = input_node_value
-
-    if process_key == protocol_ref:
-        process_key += '-' + str(series_index)
-
-    pv_cols = [c for c in column_group if c.startswith('Parameter Value[')]
-    if len(pv_cols) > 0:
-        # 2. else try use protocol REF + Parameter Values as key
-        if node_key is not None:
-            process_key = node_key + ':' + protocol_ref + ':' + '/'.join([str(v) for v in series[pv_cols]])
-        else:
-            process_key = protocol_ref + ':' + '/'.join([str(v) for v in series[pv_cols]])
-    else:
-        # 3. else try use input + protocol REF as key
-        # 4. else try use output + protocol REF as key
-        if node_key is not None:
-            process_key = node_key + '/' + protocol_ref
-
-    date_col_hits = [c for c in column_group if c.startswith('Date')]
-    if len(date_col_hits) == 1:
-        process_key = ':'.join([process_key, series[date_col_hits[0]]])
-
-    performer_col_hits = [c for c in column_group if c.startswith('Performer')]
-    if len(performer_col_hits) == 1:
-        process_key = ':'.join([process_key, series[performer_col_hits[0]]])
-
-    return process_key
+    return ProcessKeyIndex(DF).key(protocol_ref, column_group, object_label_index, series)
 
 
 def find_gt(a, x):
@@ -6,10 +6,10 @@ from glob import glob
 
 from pandas.errors import ParserError
 
-from isatools.utils import utf8_text_file_open
+from isatools.utils import utf8_text_file_open, iter_process_results
 from isatools.isatab.load import read_investigation_file
 from isatools.isatab.defaults import _RX_COMMENT, default_config_dir, log
-from isatools.isatab.validate.store import validator as message_handler
+from isatools.isatab.validate.store import validator as message_handler, ValidationContext
 from isatools.isatab.validate.rules.core import (
     ISAInvestigationValidator, ISAStudyValidator, ISAAssayValidator, build_rules
 )
@@ -181,39 +181,40 @@ def validate(fp: TextIO,
     """
     if not log_level:
         log.disabled = True
-    message_handler.reset_store()
     validated = False
 
     built_rules = build_rules(rules)
-    try:
-        i_df = load_investigation(fp=fp)
-        params = {
-            "investigation_df": i_df,
-            "dir_context": path.dirname(fp.name),
-            "configs": config_dir,
-        }
-        investigation_validator = ISAInvestigationValidator(**params, **built_rules['investigation'])
-
-        for i, study_df in enumerate(i_df['studies']):
-            study_filename = study_df.iloc[0]['Study File Name']
-            study_validator = ISAStudyValidator(validator=investigation_validator, study_index=i,
-                                                study_filename=study_filename, study_df=study_df,
-                                                **built_rules['studies'])
-            assay_tables = list()
-            assay_df = study_validator.params['investigation_df']['s_assays'][i]
-            for x, assay_filename in enumerate(assay_df['Study Assay File Name'].tolist()):
-                ISAAssayValidator(assay_tables=assay_tables, validator=study_validator, assay_index=x,
-                                  assay_df=assay_df, assay_filename=assay_filename, **built_rules['assays'])
-            if mzml:
-                validate_mzml(fp=fp)
-        validated = True
-    except (Exception, ParserError, SystemError, ValueError) as e:
-        spl = "The validator could not identify what the error is: {}".format(str(e))
-        message_handler.add_error(message="Unknown/System Error", supplemental=spl, code=0)
+    with ValidationContext() as context:
+        try:
+            i_df = load_investigation(fp=fp)
+            params = {
+                "investigation_df": i_df,
+                "dir_context": path.dirname(fp.name),
+                "configs": config_dir,
+                "context": context
+            }
+            investigation_validator = ISAInvestigationValidator(**params, **built_rules['investigation'])
+
+            for i, study_df in enumerate(i_df['studies']):
+                study_filename = study_df.iloc[0]['Study File Name']
+                study_validator = ISAStudyValidator(validator=investigation_validator, study_index=i,
+                                                    study_filename=study_filename, study_df=study_df,
+                                                    **built_rules['studies'])
+                assay_tables = list()
+                assay_df = study_validator.params['investigation_df']['s_assays'][i]
+                for x, assay_filename in enumerate(assay_df['Study Assay File Name'].tolist()):
+                    ISAAssayValidator(assay_tables=assay_tables, validator=study_validator, assay_index=x,
+                                      assay_df=assay_df, assay_filename=assay_filename, **built_rules['assays'])
+                if mzml:
+                    validate_mzml(fp=fp)
+            validated = True
+        except (Exception, ParserError, SystemError, ValueError) as e:
+            spl = "The validator could not identify what the error is: {}".format(str(e))
+            context.add_error(message="Unknown/System Error", supplemental=spl, code=0)
     return {
-        "errors": message_handler.errors,
-        "warnings": message_handler.warnings,
-        "info": message_handler.info,
+        "errors": context.errors,
+        "warnings": context.warnings,
+        "info": context.info,
         "validation_finished": validated
     }
 
@@ -231,9 +232,71 @@ def validate_mzml(fp: TextIO) -> None:
         pass
 
 
-def batch_validate(tab_dir_list):
+def _validate_investigation_file(i_file: str) -> dict:
+    """ Validates an investigation file in a batch worker process
+
+    :param i_file: path to the investigation file
+    :return: the validation report
+    """
+    with utf8_text_file_open(i_file) as fp:
+        return validate(fp)
+
+
+def iter_batch_validate(tab_dir_list, workers: int = None, ordered: bool = True, timeout: float = None):
+    """Validate a batch of ISA-Tab archives, yielding the report of each
+    archive as it completes
+
+    :param tab_dir_list: List of file paths to the ISA-Tab archives to validate
+    :param workers: Number of worker processes validating archives
+    concurrently. By default, the archives are validated one after another in
+    this process
+    :param ordered: Whether to yield the reports in the order of tab_dir_list,
+    instead of as soon as they complete. Only used with workers or timeout
+    :param timeout: Time in seconds after which the validation of an archive
+    is stopped and reported as an error. Each archive is then validated in a
+    worker process, even if workers is not set
+    :return: A generator of {"filename": ..., "report": ...} dictionaries
+    """
+    i_files = []
+    for tab_dir in tab_dir_list:
+        log.info("***Validating {}***\n".format(tab_dir))
+        found_files = glob(path.join(tab_dir, 'i_*.txt'))
+        if len(found_files) != 1:
+            log.warning("Could not find an investigation file, skipping {}".format(tab_dir))
+        else:
+            i_files.append(found_files[0])
+    if not (workers or timeout):
+        for i_file in i_files:
+            yield {"filename": i_file, "report": _validate_investigation_file(i_file)}
+        return
+    results = iter_process_results(_validate_investigation_file, i_files,
+                                   workers=workers or 1, timeout=timeout, ordered=ordered)
+    for index, report, error in results:
+        if isinstance(error, TimeoutError):
+            spl = "The validation of {} did not finish within {} seconds".format(i_files[index], timeout)
+            report = {
+                "errors": [{"message": "Validation timed out", "supplemental": spl, "code": 0}],
+                "warnings": [],
+                "info": [],
+                "validation_finished": False
+            }
+        elif error is not None:
+            spl = "The validator could not identify what the error is: {}".format(str(error))
+            report = {
+                "errors": [{"message": "Unknown/System Error", "supplemental": spl, "code": 0}],
+                "warnings": [],
+                "info": [],
+                "validation_finished": False
+            }
+        yield {"filename": i_files[index], "report": report}
+
+
+def batch_validate(tab_dir_list, workers: int = None, ordered: bool = True, timeout: float = None):
     """Validate a batch of ISA-Tab archives
     :param tab_dir_list: List of file paths to the ISA-Tab archives to validate_rules
+    :param workers: Number of worker processes validating archives concurrently
+    :param ordered: Whether to keep the reports in the order of tab_dir_list
+    :param timeout: Time in seconds after which the validation of an archive is stopped and reported as an error
     :return: batch report as JSON
 
     Example:
@@ -242,15 +305,9 @@ def batch_validate(tab_dir_list):
             '/path/to/study1/',
             '/path/to/study2/'
         ]
-        batch_report = isatab.batch_validate(my_tabs, '/path/to/report.txt')
+        batch_report = isatab.batch_validate(my_tabs, workers=4, timeout=600)
     """
     batch_report = {"batch_report": []}
-    for tab_dir in tab_dir_list:
-        log.info("***Validating {}***\n".format(tab_dir))
-        i_files = glob(path.join(tab_dir, 'i_*.txt'))
-        if len(i_files) != 1:
-            log.warning("Could not find an investigation file, skipping {}".format(tab_dir))
-        else:
-            with utf8_text_file_open(i_files[0]) as fp:
-                batch_report['batch_report'].append({"filename": fp.name, "report": validate(fp)})
+    for archive_report in iter_batch_validate(tab_dir_list, workers=workers, ordered=ordered, timeout=timeout):
+        batch_report['batch_report'].append(archive_report)
     return batch_report
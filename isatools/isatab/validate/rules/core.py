@@ -1,13 +1,10 @@
 from __future__ import annotations, absolute_import
 from typing import Callable, List
 
-from os import path
-
 from pandas import DataFrame
 
-from isatools.utils import utf8_text_file_open
 from isatools.isatab.defaults import NUMBER_OF_STUDY_GROUPS
-from isatools.isatab.load import load_table
+from isatools.isatab.validate.store import TableRegistry, Validator, get_validator
 from isatools.isatab.validate.rules.defaults import (
     DEFAULT_INVESTIGATION_RULES,
     INVESTIGATION_RULES_MAPPING,
@@ -112,7 +109,9 @@ class ISAInvestigationValidator:
                  dir_context: str,
                  configs: str,
                  available_rules: list = INVESTIGATION_RULES_MAPPING,
-                 rules_to_run: tuple = DEFAULT_INVESTIGATION_RULES):
+                 rules_to_run: tuple = DEFAULT_INVESTIGATION_RULES,
+                 tables: TableRegistry = None,
+                 context: Validator = None):
         """ The ISA investigation validator class
 
         :param investigation_df: the investigation dataframe
@@ -120,6 +119,8 @@ class ISAInvestigationValidator:
         :param configs: directory of the XML config files
         :param available_rules: a customizable list of all available rules for investigation objects
         :param rules_to_run: a customizable tuple of rules identifiers to run for investigation objects
+        :param tables: the registry of the study and assay tables, shared with the study and assay validators
+        :param context: the message store of the validation run, by default the current one
         """
         self.all_rules = Rules(rules_to_run=rules_to_run, available_rules=available_rules)
         self.has_validated = False
@@ -127,7 +128,9 @@ class ISAInvestigationValidator:
             'investigation_df': investigation_df,
             'dir_context': dir_context,
             'configs': configs,
-            'term_source_refs': None
+            'term_source_refs': None,
+            'tables': tables if tables is not None else TableRegistry(dir_context),
+            'context': context if context is not None else get_validator()
         }
         self.all_rules.validate_rules(validator=self)
 
@@ -158,9 +161,7 @@ class ISAStudyValidator:
             'config': validator.params['configs'][('[sample]', '')],
             'study_filename': study_filename
         }
-        with utf8_text_file_open(path.join(self.params['dir_context'], study_filename)) as s_fp:
-            self.params['study_sample_table'] = load_table(s_fp)
-            self.params['study_sample_table'].filename = study_filename
+        self.params['study_sample_table'] = self.params['tables'].get_table(study_filename)
 
         protocol_names = self.params['investigation_df']['s_protocols'][study_index]['Study Protocol Name'].tolist()
         protocol_types = self.params['investigation_df']['s_protocols'][study_index]['Study Protocol Type'].tolist()
@@ -209,10 +210,8 @@ class ISAAssayValidator:
             lowered_tt = assay_df['Study Assay Technology Type'].tolist()[assay_index].lower()
             self.params['config'] = self.params['configs'].get((lowered_mt, lowered_tt), None)
             if self.params['config']:
-                with utf8_text_file_open(path.join(self.params['dir_context'], assay_filename)) as a_fp:
-                    self.params['assay_table'] = load_table(a_fp)
-                    self.params['assay_table'].filename = assay_filename
-                    self.params['assay_tables'].append(self.params['assay_table'])
+                self.params['assay_table'] = self.params['tables'].get_table(assay_filename)
+                self.params['assay_tables'].append(self.params['assay_table'])
             self.all_rules.validate_rules(validator=self)
 
 
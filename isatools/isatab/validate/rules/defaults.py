@@ -32,10 +32,14 @@ from isatools.isatab.validate.rules.rules_50xx import check_study_groups
 INVESTIGATION_RULES_MAPPING = [
     {'rule': check_table_files_read, 'params': ['investigation_df', 'dir_context'], 'identifier': '0006'},
 
-    {'rule': sample_not_declared, 'params': ['investigation_df', 'dir_context'], 'identifier': '1003'},
-    {'rule': check_protocol_usage, 'params': ['investigation_df', 'dir_context'], 'identifier': '1007'},
-    {'rule': check_study_factor_usage, 'params': ['investigation_df', 'dir_context'], 'identifier': '1008'},
-    {'rule': check_protocol_parameter_usage, 'params': ['investigation_df', 'dir_context'], 'identifier': '1009'},
+    {'rule': sample_not_declared, 'params': ['investigation_df', 'dir_context', 'tables'], 'identifier': '1003'},
+    {'rule': check_protocol_usage, 'params': ['investigation_df', 'dir_context', 'tables'], 'identifier': '1007'},
+    {'rule': check_study_factor_usage, 'params': ['investigation_df', 'dir_context', 'tables'], 'identifier': '1008'},
+    {
+        'rule': check_protocol_parameter_usage,
+        'params': ['investigation_df', 'dir_context', 'tables'],
+        'identifier': '1009'
+    },
     {'rule': check_protocol_names, 'params': ['investigation_df'], 'identifier': '1010'},
     {'rule': check_protocol_parameter_names, 'params': ['investigation_df'], 'identifier': '1011'},
     {'rule': check_study_factor_names, 'params': ['investigation_df'], 'identifier': '1012'},
@@ -51,9 +55,13 @@ INVESTIGATION_RULES_MAPPING = [
 
     # copies
     {'rule': check_table_files_read, 'params': ['investigation_df', 'dir_context'], 'identifier': '0008'},
-    {'rule': check_protocol_usage, 'params': ['investigation_df', 'dir_context'], 'identifier': '1019'},
-    {'rule': check_protocol_parameter_usage, 'params': ['investigation_df', 'dir_context'], 'identifier': '1020'},
-    {'rule': check_study_factor_usage, 'params': ['investigation_df', 'dir_context'], 'identifier': '1021'},
+    {'rule': check_protocol_usage, 'params': ['investigation_df', 'dir_context', 'tables'], 'identifier': '1019'},
+    {
+        'rule': check_protocol_parameter_usage,
+        'params': ['investigation_df', 'dir_context', 'tables'],
+        'identifier': '1020'
+    },
+    {'rule': check_study_factor_usage, 'params': ['investigation_df', 'dir_context', 'tables'], 'identifier': '1021'},
 ]
 
 STUDY_RULES_MAPPING = [
@@ -1,52 +1,54 @@
-from os import path
-
 from pandas import notnull
 
-from isatools.utils import utf8_text_file_open
-from isatools.isatab.load import load_table
 from isatools.isatab.defaults import _RX_FACTOR_VALUE, _RX_PARAMETER_VALUE, log
-from isatools.isatab.validate.store import validator
+from isatools.isatab.validate.store import validator, TableRegistry
 from isatools.isatab.utils import cell_has_value
 
 
-def check_samples_not_declared_in_study_used_in_assay(i_df, dir_context):
+def check_samples_not_declared_in_study_used_in_assay(i_df, dir_context, tables=None):
     """Checks if samples found in assay tables are found in the study-sample table
 
     :param i_df: An investigation DataFrame
     :param dir_context: Path to where the investigation file is found
+    :param tables: The TableRegistry of the validation, by default the tables
+    are read for this check only
     :return: None
     """
+    if tables is None:
+        tables = TableRegistry(dir_context)
     for i, study_df in enumerate(i_df['studies']):
         study_filename = study_df.iloc[0]['Study File Name']
         if study_filename != '':
             try:
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    study_samples = set(study_df['Sample Name'])
+                study_df = tables.get_table(study_filename)
+                study_samples = set(study_df['Sample Name'])
             except FileNotFoundError:
                 pass
         for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
             if assay_filename != '':
                 try:
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        assay_samples = set(assay_df['Sample Name'])
-                        if not assay_samples.issubset(study_samples):
-                            spl = ("Some samples in an assay file {} are not declared in the study file {}: "
-                                   "{}").format(assay_filename, study_filename, list(assay_samples - study_samples))
-                            msg = "Some samples are not declared in the study"
-                            validator.add_error(message=msg, supplemental=spl, code=1013)
+                    assay_df = tables.get_table(assay_filename)
+                    assay_samples = set(assay_df['Sample Name'])
+                    if not assay_samples.issubset(study_samples):
+                        spl = ("Some samples in an assay file {} are not declared in the study file {}: "
+                               "{}").format(assay_filename, study_filename, list(assay_samples - study_samples))
+                        msg = "Some samples are not declared in the study"
+                        validator.add_error(message=msg, supplemental=spl, code=1013)
                 except FileNotFoundError:
                     pass
 
 
-def check_study_factor_usage(i_df, dir_context):
+def check_study_factor_usage(i_df, dir_context, tables=None):
     """Used for rules 1008 and 1021
 
     :param i_df: An investigation DataFrame
     :param dir_context: Path to where the investigation file is found
+    :param tables: The TableRegistry of the validation, by default the tables
+    are read for this check only
     :return: None
     """
+    if tables is None:
+        tables = TableRegistry(dir_context)
     for i, study_df in enumerate(i_df['studies']):
         study_factors_declared = set(i_df['s_factors'][i]['Study Factor Name'].tolist())
         study_filename = study_df.iloc[0]['Study File Name']
@@ -55,52 +57,48 @@ def check_study_factor_usage(i_df, dir_context):
         if study_filename != '':
             try:
                 study_factors_used = set()
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    study_factor_ref_cols = [i for i in study_df.columns if _RX_FACTOR_VALUE.match(i)]
-                    for col in study_factor_ref_cols:
-                        fv = _RX_FACTOR_VALUE.findall(col)
-                        study_factors_used = study_factors_used.union(set(fv))
-                    if not study_factors_used.issubset(study_factors_declared):
-                        spl = error_spl.format(study_filename, list(study_factors_used - study_factors_declared))
-                        validator.add_error(message=error_msg, supplemental=spl, code=1008)
+                study_df = tables.get_table(study_filename)
+                study_factor_ref_cols = [i for i in study_df.columns if _RX_FACTOR_VALUE.match(i)]
+                for col in study_factor_ref_cols:
+                    fv = _RX_FACTOR_VALUE.findall(col)
+                    study_factors_used = study_factors_used.union(set(fv))
+                if not study_factors_used.issubset(study_factors_declared):
+                    spl = error_spl.format(study_filename, list(study_factors_used - study_factors_declared))
+                    validator.add_error(message=error_msg, supplemental=spl, code=1008)
             except FileNotFoundError:
                 pass
         for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
             if assay_filename != '':
                 try:
                     study_factors_used = set()
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        study_factor_ref_cols = set([i for i in assay_df.columns if _RX_FACTOR_VALUE.match(i)])
-                        for col in study_factor_ref_cols:
-                            fv = _RX_FACTOR_VALUE.findall(col)
-                            study_factors_used = study_factors_used.union(set(fv))
-                        if not study_factors_used.issubset(study_factors_declared):
-                            spl = error_spl.format(assay_filename, list(study_factors_used - study_factors_declared))
-                            validator.add_error(message=error_msg, supplemental=spl, code=1008)
+                    assay_df = tables.get_table(assay_filename)
+                    study_factor_ref_cols = set([i for i in assay_df.columns if _RX_FACTOR_VALUE.match(i)])
+                    for col in study_factor_ref_cols:
+                        fv = _RX_FACTOR_VALUE.findall(col)
+                        study_factors_used = study_factors_used.union(set(fv))
+                    if not study_factors_used.issubset(study_factors_declared):
+                        spl = error_spl.format(assay_filename, list(study_factors_used - study_factors_declared))
+                        validator.add_error(message=error_msg, supplemental=spl, code=1008)
                 except FileNotFoundError:
                     pass
         study_factors_used = set()
         if study_filename != '':
             try:
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    study_factor_ref_cols = [i for i in study_df.columns if _RX_FACTOR_VALUE.match(i)]
-                    for col in study_factor_ref_cols:
-                        fv = _RX_FACTOR_VALUE.findall(col)
-                        study_factors_used = study_factors_used.union(set(fv))
+                study_df = tables.get_table(study_filename)
+                study_factor_ref_cols = [i for i in study_df.columns if _RX_FACTOR_VALUE.match(i)]
+                for col in study_factor_ref_cols:
+                    fv = _RX_FACTOR_VALUE.findall(col)
+                    study_factors_used = study_factors_used.union(set(fv))
             except FileNotFoundError:
                 pass
         for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
             if assay_filename != '':
                 try:
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        study_factor_ref_cols = set([i for i in assay_df.columns if _RX_FACTOR_VALUE.match(i)])
-                        for col in study_factor_ref_cols:
-                            fv = _RX_FACTOR_VALUE.findall(col)
-                            study_factors_used = study_factors_used.union(set(fv))
+                    assay_df = tables.get_table(assay_filename)
+                    study_factor_ref_cols = set([i for i in assay_df.columns if _RX_FACTOR_VALUE.match(i)])
+                    for col in study_factor_ref_cols:
+                        fv = _RX_FACTOR_VALUE.findall(col)
+                        study_factors_used = study_factors_used.union(set(fv))
                 except FileNotFoundError:
                     pass
         if len(study_factors_declared - study_factors_used) > 0:
@@ -109,13 +107,17 @@ def check_study_factor_usage(i_df, dir_context):
                         .format(list(study_factors_declared - study_factors_used)))
 
 
-def check_protocol_usage(i_df, dir_context):
+def check_protocol_usage(i_df, dir_context, tables=None):
     """Used for rules 1007 and 1019
 
     :param i_df: An investigation DataFrame
     :param dir_context: Path to where the investigation file is found
+    :param tables: The TableRegistry of the validation, by default the tables
+    are read for this check only
     :return: None
     """
+    if tables is None:
+        tables = TableRegistry(dir_context)
     for i, study_df in enumerate(i_df['studies']):
         protocols_declared = set(i_df['s_protocols'][i]['Study Protocol Name'].tolist())
         protocols_declared.add('')
@@ -123,10 +125,25 @@ def check_protocol_usage(i_df, dir_context):
         if study_filename != '':
             try:
                 protocol_refs_used = set()
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    for protocol_ref_col in [i for i in study_df.columns if i.startswith('Protocol REF')]:
-                        protocol_refs_used = protocol_refs_used.union(study_df[protocol_ref_col])
+                study_df = tables.get_table(study_filename)
+                for protocol_ref_col in [i for i in study_df.columns if i.startswith('Protocol REF')]:
+                    protocol_refs_used = protocol_refs_used.union(study_df[protocol_ref_col])
+                protocol_refs_used = set([r for r in protocol_refs_used if notnull(r)])
+                diff = list(protocol_refs_used - protocols_declared)
+                if len(diff) > 0:
+                    spl = "protocols in study file {} are not declared in the investigation file: {}"
+                    spl = spl.format(study_filename, diff)
+                    validator.add_error(message="Missing Protocol declaration", supplemental=spl, code=1007)
+                    log.error("(E) {}".format(spl))
+            except FileNotFoundError:
+                pass
+        for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
+            if assay_filename != '':
+                try:
+                    protocol_refs_used = set()
+                    assay_df = tables.get_table(assay_filename)
+                    for protocol_ref_col in [i for i in assay_df.columns if i.startswith('Protocol REF')]:
+                        protocol_refs_used = protocol_refs_used.union(assay_df[protocol_ref_col])
                     protocol_refs_used = set([r for r in protocol_refs_used if notnull(r)])
                     diff = list(protocol_refs_used - protocols_declared)
                     if len(diff) > 0:
@@ -134,23 +151,6 @@ def check_protocol_usage(i_df, dir_context):
                         spl = spl.format(study_filename, diff)
                         validator.add_error(message="Missing Protocol declaration", supplemental=spl, code=1007)
                         log.error("(E) {}".format(spl))
-            except FileNotFoundError:
-                pass
-        for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
-            if assay_filename != '':
-                try:
-                    protocol_refs_used = set()
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        for protocol_ref_col in [i for i in assay_df.columns if i.startswith('Protocol REF')]:
-                            protocol_refs_used = protocol_refs_used.union(assay_df[protocol_ref_col])
-                        protocol_refs_used = set([r for r in protocol_refs_used if notnull(r)])
-                        diff = list(protocol_refs_used - protocols_declared)
-                        if len(diff) > 0:
-                            spl = "protocols in study file {} are not declared in the investigation file: {}"
-                            spl = spl.format(study_filename, diff)
-                            validator.add_error(message="Missing Protocol declaration", supplemental=spl, code=1007)
-                            log.error("(E) {}".format(spl))
                 except FileNotFoundError:
                     pass
 
@@ -158,20 +158,18 @@ def check_protocol_usage(i_df, dir_context):
         protocol_refs_used = set()
         if study_filename != '':
             try:
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    for protocol_ref_col in [i for i in study_df.columns if i.startswith('Protocol REF')]:
-                        protocol_refs_used = protocol_refs_used.union(study_df[protocol_ref_col])
+                study_df = tables.get_table(study_filename)
+                for protocol_ref_col in [i for i in study_df.columns if i.startswith('Protocol REF')]:
+                    protocol_refs_used = protocol_refs_used.union(study_df[protocol_ref_col])
             except FileNotFoundError:
                 pass
         for j, assay_filename in enumerate(
                 i_df['s_assays'][i]['Study Assay File Name'].tolist()):
             if assay_filename != '':
                 try:
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        for protocol_ref_col in [i for i in assay_df.columns if i.startswith('Protocol REF')]:
-                            protocol_refs_used = protocol_refs_used.union(assay_df[protocol_ref_col])
+                    assay_df = tables.get_table(assay_filename)
+                    for protocol_ref_col in [i for i in assay_df.columns if i.startswith('Protocol REF')]:
+                        protocol_refs_used = protocol_refs_used.union(assay_df[protocol_ref_col])
                 except FileNotFoundError:
                     pass
         diff = protocols_declared - protocol_refs_used - {''}
@@ -183,13 +181,17 @@ def check_protocol_usage(i_df, dir_context):
             log.warning(warning)
 
 
-def check_protocol_parameter_usage(i_df, dir_context):
+def check_protocol_parameter_usage(i_df, dir_context, tables=None):
     """Used for rules 1009 and 1020
 
     :param i_df: An investigation DataFrame
     :param dir_context: Path to where the investigation file is found
+    :param tables: The TableRegistry of the validation, by default the tables
+    are read for this check only
     :return: None
     """
+    if tables is None:
+        tables = TableRegistry(dir_context)
     for i, study_df in enumerate(i_df['studies']):
         protocol_parameters_declared = set()
         protocol_parameters_per_protocol = set(i_df['s_protocols'][i]['Study Protocol Parameters Name'].tolist())
@@ -203,34 +205,32 @@ def check_protocol_parameter_usage(i_df, dir_context):
         if study_filename != '':
             try:
                 protocol_parameters_used = set()
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    parameter_value_cols = [i for i in study_df.columns if _RX_PARAMETER_VALUE.match(i)]
-                    for col in parameter_value_cols:
-                        pv = _RX_PARAMETER_VALUE.findall(col)
-                        protocol_parameters_used = protocol_parameters_used.union(set(pv))
-                    if not protocol_parameters_used.issubset(protocol_parameters_declared):
-                        remain = list(protocol_parameters_used - protocol_parameters_declared)
-                        error = ("(E) Some protocol parameters referenced in an study file {} are not declared in the "
-                                 "investigation file: {}").format(study_filename, remain)
-                        log.error(error)
+                study_df = tables.get_table(study_filename)
+                parameter_value_cols = [i for i in study_df.columns if _RX_PARAMETER_VALUE.match(i)]
+                for col in parameter_value_cols:
+                    pv = _RX_PARAMETER_VALUE.findall(col)
+                    protocol_parameters_used = protocol_parameters_used.union(set(pv))
+                if not protocol_parameters_used.issubset(protocol_parameters_declared):
+                    remain = list(protocol_parameters_used - protocol_parameters_declared)
+                    error = ("(E) Some protocol parameters referenced in an study file {} are not declared in the "
+                             "investigation file: {}").format(study_filename, remain)
+                    log.error(error)
             except FileNotFoundError:
                 pass
         for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
             if assay_filename != '':
                 try:
                     protocol_parameters_used = set()
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        parameter_value_cols = [i for i in assay_df.columns if _RX_PARAMETER_VALUE.match(i)]
-                        for col in parameter_value_cols:
-                            pv = _RX_PARAMETER_VALUE.findall(col)
-                            protocol_parameters_used = protocol_parameters_used.union(set(pv))
-                        if not protocol_parameters_used.issubset(protocol_parameters_declared):
-                            remain = list(protocol_parameters_used - protocol_parameters_declared)
-                            error = ("(E) Some protocol parameters referenced in an assay file {} are not declared in "
-                                     "the investigation file: {}").format(assay_filename, remain)
-                            log.error(error)
+                    assay_df = tables.get_table(assay_filename)
+                    parameter_value_cols = [i for i in assay_df.columns if _RX_PARAMETER_VALUE.match(i)]
+                    for col in parameter_value_cols:
+                        pv = _RX_PARAMETER_VALUE.findall(col)
+                        protocol_parameters_used = protocol_parameters_used.union(set(pv))
+                    if not protocol_parameters_used.issubset(protocol_parameters_declared):
+                        remain = list(protocol_parameters_used - protocol_parameters_declared)
+                        error = ("(E) Some protocol parameters referenced in an assay file {} are not declared in "
+                                 "the investigation file: {}").format(assay_filename, remain)
+                        log.error(error)
                 except FileNotFoundError:
                     pass
 
@@ -238,23 +238,21 @@ def check_protocol_parameter_usage(i_df, dir_context):
         protocol_parameters_used = set()
         if study_filename != '':
             try:
-                with utf8_text_file_open(path.join(dir_context, study_filename)) as s_fp:
-                    study_df = load_table(s_fp)
-                    parameter_value_cols = [i for i in study_df.columns if _RX_PARAMETER_VALUE.match(i)]
-                    for col in parameter_value_cols:
-                        pv = _RX_PARAMETER_VALUE.findall(col)
-                        protocol_parameters_used = protocol_parameters_used.union(set(pv))
+                study_df = tables.get_table(study_filename)
+                parameter_value_cols = [i for i in study_df.columns if _RX_PARAMETER_VALUE.match(i)]
+                for col in parameter_value_cols:
+                    pv = _RX_PARAMETER_VALUE.findall(col)
+                    protocol_parameters_used = protocol_parameters_used.union(set(pv))
             except FileNotFoundError:
                 pass
         for j, assay_filename in enumerate(i_df['s_assays'][i]['Study Assay File Name'].tolist()):
             if assay_filename != '':
                 try:
-                    with utf8_text_file_open(path.join(dir_context, assay_filename)) as a_fp:
-                        assay_df = load_table(a_fp)
-                        parameter_value_cols = [i for i in assay_df.columns if _RX_PARAMETER_VALUE.match(i)]
-                        for col in parameter_value_cols:
-                            pv = _RX_PARAMETER_VALUE.findall(col)
-                            protocol_parameters_used = protocol_parameters_used.union(set(pv))
+                    assay_df = tables.get_table(assay_filename)
+                    parameter_value_cols = [i for i in assay_df.columns if _RX_PARAMETER_VALUE.match(i)]
+                    for col in parameter_value_cols:
+                        pv = _RX_PARAMETER_VALUE.findall(col)
+                        protocol_parameters_used = protocol_parameters_used.union(set(pv))
                 except FileNotFoundError:
                     pass
         if len(protocol_parameters_declared - protocol_parameters_used) > 0:
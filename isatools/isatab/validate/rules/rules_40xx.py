@@ -1,5 +1,6 @@
 from math import isnan
 import iso8601
+from pandas import Series
 
 from isatools.io import isatab_configurator
 from isatools.isatab.validate.store import validator
@@ -138,8 +139,11 @@ def check_required_fields(table, cfg):
     :param cfg: A ISA Configuration object
     :return: None
     """
+    columns_by_label = {}
+    for column in table.columns:
+        columns_by_label.setdefault(column.lower(), []).append(column)
     for fheader in [i.header for i in cfg.get_isatab_configuration()[0].get_field() if i.is_required]:
-        found_field = [i for i in table.columns if i.lower() == fheader.lower()]
+        found_field = columns_by_label.get(fheader.lower(), [])
         if len(found_field) == 0:
             msg = "A required column in assay table is not present"
             spl = "Required field '{}' not found in the file '{}'".format(fheader, table.filename)
@@ -229,14 +233,68 @@ def check_field_values(table, cfg):
                 log.warning("(W) Value must be one of: " + cfg_field.list_values)
         return is_valid_value
 
+    def get_cells_to_check(values, cfg_field):
+        """Finds the cells of a column that check_single_field() would not
+        pass silently: required cells left empty and invalid values. Cells
+        of an unexpected type are always returned
+
+        :param values: The column values as a Series
+        :param cfg_field: Field configuration
+        :return: A boolean mask of the cells to check
+        """
+        try:
+            stripped = values.str.strip()
+        except AttributeError:
+            return Series(True, index=values.index)
+        to_check = stripped.isna()
+        empty = ~to_check & (stripped == '')
+        if cfg_field.is_required:
+            to_check |= empty
+        filled = ~to_check & ~empty
+        data_type = cfg_field.data_type.lower().strip()
+        if data_type in ['', 'string', 'ontology-term', 'ontology term']:
+            return to_check
+        if 'boolean' == data_type:
+            invalid = ~stripped.isin(['true', 'false'])
+        elif data_type == 'list':
+            list_values = [i.lower() for i in (cfg_field.list_values or '').split(',')]
+            invalid = ~values.str.lower().isin(list_values)
+        elif data_type in ['date', 'integer', 'double']:
+            parse = {'date': iso8601.parse_date, 'integer': int, 'double': float}[data_type]
+            invalid_values = set()
+            for value in values[filled].unique():
+                try:
+                    parse(value)
+                except Exception:
+                    invalid_values.add(value)
+            invalid = values.isin(invalid_values)
+        else:
+            invalid = filled
+        return to_check | (filled & invalid)
+
+    fields_by_header = {}
+    for cfield in cfg.get_isatab_configuration()[0].get_field():
+        fields_by_header.setdefault(cfield.header, []).append(cfield)
+    cells = []
+    for icol, header in enumerate(table.columns):
+        cfields = fields_by_header.get(header, [])
+        if len(cfields) == 1:
+            cfield = cfields[0]
+            if table.columns.get_indexer_for([header]).size == 1:
+                values = table[header]
+                to_check = get_cells_to_check(values, cfield).to_numpy().nonzero()[0]
+            else:
+                values = None
+                to_check = range(len(table.index))
+            cells.extend((irow, icol, cfield, values) for irow in to_check)
+    cells.sort(key=lambda cell: (cell[0], cell[1]))
+
     result = True
-    for irow in range(len(table.index)):
-        ncols = len(table.columns)
-        for icol in range(0, ncols):
-            cfields = [i for i in cfg.get_isatab_configuration()[0].get_field() if i.header == table.columns[icol]]
-            if len(cfields) == 1:
-                cfield = cfields[0]
-                result = result and check_single_field(table.iloc[irow][cfield.header], cfield)
+    for irow, icol, cfield, values in cells:
+        cell_value = table.iloc[irow][cfield.header] if values is None else values.iloc[irow]
+        result = check_single_field(cell_value, cfield)
+        if not result:
+            break
     return result
 
 
@@ -1,3 +1,12 @@
+from contextvars import ContextVar
+from os import path
+
+from pandas import DataFrame
+
+from isatools.utils import utf8_text_file_open
+from isatools.isatab.load import load_table
+
+
 class Validator:
 
     def __init__(self):
@@ -26,4 +35,72 @@ class Validator:
         return str(self.__dict__())
 
 
-validator = Validator()
+class TableRegistry:
+
+    def __init__(self, dir_context: str):
+        """ The study and assay tables of a validation run, each read with load_table() only once
+
+        :param dir_context: the directory of the investigation
+        """
+        self.dir_context = dir_context
+        self.tables = {}
+
+    def get_table(self, filename: str) -> DataFrame:
+        """ Get a study or assay table, reading it on first use. The same DataFrame is returned to every rule,
+        so rules must not modify it
+
+        :param filename: the filename of the table, relative to the investigation directory
+        :return: the table DataFrame, with its filename set
+        :raises FileNotFoundError: if the table file does not exist
+        """
+        if filename not in self.tables:
+            with utf8_text_file_open(path.join(self.dir_context, filename)) as fp:
+                table = load_table(fp)
+            table.filename = filename
+            self.tables[filename] = table
+        return self.tables[filename]
+
+
+class ValidationContext(Validator):
+
+    def __init__(self):
+        """ The messages of a single validation run. Within a `with` block, the context is the one written into by
+        the rules that use the module-level validator, independently of other threads or asyncio tasks
+        """
+        super(ValidationContext, self).__init__()
+        self._tokens = []
+
+    def __enter__(self) -> 'ValidationContext':
+        self._tokens.append(_current_context.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _current_context.reset(self._tokens.pop())
+
+
+_current_context = ContextVar('isatab_validation_context', default=None)
+_default_validator = Validator()
+
+
+def get_validator() -> Validator:
+    """ Get the message store of the current validation run, or the default store outside of a validation run
+
+    :return: the current ValidationContext, or the default Validator
+    """
+    context = _current_context.get()
+    return context if context is not None else _default_validator
+
+
+class _CurrentValidator:
+    """ Forwards to the message store returned by get_validator(), so that rules importing the module-level validator
+    write into the report of the validation run they are part of
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_validator(), name)
+
+    def __str__(self):
+        return str(get_validator())
+
+
+validator = _CurrentValidator()
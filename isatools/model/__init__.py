@@ -32,6 +32,7 @@ from isatools.model.datafile import (
     FreeInductionDecayDataFile
 )
 from isatools.model.factor_value import FactorValue, StudyFactor
+from isatools.model.graph import ProcessGraph
 from isatools.model.investigation import Investigation
 from isatools.model.logger import log
 from isatools.model.material import Material, Extract, LabeledExtract
@@ -50,4 +51,6 @@ from isatools.model.sample import Sample
 from isatools.model.source import Source
 from isatools.model.study import Study
 from isatools.model.logger import log
-from isatools.model.utils import _build_assay_graph, plink, batch_create_assays, batch_create_materials, _deep_copy
+from isatools.model.utils import (
+    _build_assay_graph, _build_process_graph, plink, batch_create_assays, batch_create_materials, _deep_copy
+)
@@ -109,10 +109,12 @@ class Assay(Commentable, StudyAssayMixin, object):
     @property
     def data_files(self):
         """:obj:`list` of :obj:`DataFile`: Container for data files"""
+        self.load_table()
         return self.__data_files
 
     @data_files.setter
     def data_files(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, DataFile) for x in val):
                 self.__data_files = list(val)
@@ -159,7 +161,7 @@ class Assay(Commentable, StudyAssayMixin, object):
             num_comments=len(self.comments), num_units=len(self.units))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, Assay) \
@@ -261,16 +263,16 @@ class Assay(Commentable, StudyAssayMixin, object):
             self.process_sequence.append(process)
             indexes.add_process(process)
 
-            # link processes in process sequence
-            for assay_process_json in assay.get('processSequence', []):
-                try:
-                    previous_process_id = assay_process_json['previousProcess']['@id']
-                    indexes.get_process(assay_process_json["@id"]).prev_process = \
-                        indexes.get_process(previous_process_id)
-                except KeyError:
-                    pass
-                try:
-                    next_process_id = assay_process_json['nextProcess']['@id']
-                    indexes.get_process(assay_process_json["@id"]).next_process = indexes.get_process(next_process_id)
-                except KeyError:
-                    pass
\ No newline at end of file
+        # link processes in process sequence
+        for assay_process_json in assay.get('processSequence', []):
+            try:
+                previous_process_id = assay_process_json['previousProcess']['@id']
+                indexes.get_process(assay_process_json["@id"]).prev_process = \
+                    indexes.get_process(previous_process_id)
+            except KeyError:
+                pass
+            try:
+                next_process_id = assay_process_json['nextProcess']['@id']
+                indexes.get_process(assay_process_json["@id"]).next_process = indexes.get_process(next_process_id)
+            except KeyError:
+                pass
\ No newline at end of file
@@ -21,6 +21,8 @@ class Characteristic(Commentable):
             numeric).
         """
 
+    __slots__ = ('_Commentable__comments', '__category', '__value', '__unit')
+
     def __init__(self, category=None, value=None, unit=None, comments: List[Comment] = None):
 
         super().__init__(comments)
@@ -104,7 +106,7 @@ class Characteristic(Commentable):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.category, self.value))
 
     def __eq__(self, other):
         return isinstance(other, Characteristic) \
@@ -12,6 +12,8 @@ class Comment(LDSerializable, object):
         value: A string value for the comment.
     """
 
+    __slots__ = ('__name', '__value')
+
     def __init__(self, name: str = '', value: str = ''):
         LDSerializable.__init__(self)
         self.__name = name
@@ -46,7 +48,7 @@ class Comment(LDSerializable, object):
         return "Comment(\n\tname={comment.name}\n\tvalue={comment.value})".format(comment=self)
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.name, self.value))
 
     def __eq__(self, other: Any):
         return isinstance(other, Comment) and self.name == other.name and self.value == other.value
@@ -73,13 +75,19 @@ class Commentable(LDSerializable, metaclass=ABCMeta):
         comments: Comments associated with the implementing ISA class.
     """
 
+    # The classes with many instances, such as Sample or OntologyAnnotation, store the attributes of their abstract
+    # classes in __slots__, e.g. _Commentable__comments, and only get a __dict__ when another attribute is set.
+
     def __init__(self, comments: List[Comment] = None, **kwargs):
-        self.__comments = [] if comments is None else comments
+        # most ISA objects have no comments: their list is created when first read
+        self.__comments = comments
         LDSerializable.__init__(self)
 
     @property
     def comments(self) -> List[Comment]:
         """:obj:`list` of :obj:`Comment`: Container for ISA comments"""
+        if self.__comments is None:
+            self.__comments = []
         return self.__comments
 
     @comments.setter
@@ -87,7 +95,7 @@ class Commentable(LDSerializable, metaclass=ABCMeta):
         if not isinstance(val, list):
             raise AttributeError('Commentable.comments must be iterable containing Comments')
         if val == [] or all(isinstance(x, Comment) for x in val):
-            self.__comments = list(val)
+            self.__comments = list(val) if val else None
 
     def add_comment(self, name: str = None, value_: str = None):
         """Adds a new comment to the comment list.
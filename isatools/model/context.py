@@ -137,10 +137,13 @@ def set_context(
 
 
 class LDSerializable(metaclass=ABCMeta):
-    """ A mixin used by ISA objects to provide utility methods for JSON-LD serialization. """
+    """ A mixin used by ISA objects to provide utility methods for JSON-LD serialization. The context is shared by
+    all the ISA objects, as a class attribute. """
+
+    context = context
 
     def __init__(self) -> None:
-        self.context = context
+        pass
 
     def gen_id(self) -> str:
         """ Generate an identifier for the object. """
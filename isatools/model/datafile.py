@@ -15,6 +15,9 @@ class DataFile(Commentable, ProcessSequenceNode, Identifiable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', 'sequence_identifier', '_Identifiable__id', '__filename', '__label',
+                 '__generated_from')
+
     def __init__(self, filename='', id_='', label='', generated_from=None, comments=None):
         # super().__init__(comments)
         Commentable.__init__(self, comments)
@@ -85,7 +88,7 @@ class DataFile(Commentable, ProcessSequenceNode, Identifiable):
                 ).format(data_file=self, num_generated_from=len(self.generated_from), num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, DataFile) \
@@ -118,6 +121,8 @@ class DataFile(Commentable, ProcessSequenceNode, Identifiable):
 class RawDataFile(DataFile):
     """Represents a raw data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -139,7 +144,7 @@ class RawDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, RawDataFile) \
@@ -154,6 +159,8 @@ class RawDataFile(DataFile):
 class DerivedDataFile(DataFile):
     """Represents a derived data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -176,7 +183,7 @@ class DerivedDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, DerivedDataFile) \
@@ -191,6 +198,8 @@ class DerivedDataFile(DataFile):
 class RawSpectralDataFile(DataFile):
     """Represents a raw spectral data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -212,7 +221,7 @@ class RawSpectralDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, RawSpectralDataFile) \
@@ -227,6 +236,8 @@ class RawSpectralDataFile(DataFile):
 class DerivedArrayDataFile(DataFile):
     """Represents a derived array data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -249,7 +260,7 @@ class DerivedArrayDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, DerivedArrayDataFile) \
@@ -264,6 +275,8 @@ class DerivedArrayDataFile(DataFile):
 class ArrayDataFile(DataFile):
     """Represents a array data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -286,7 +299,7 @@ class ArrayDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, ArrayDataFile) \
@@ -301,6 +314,8 @@ class ArrayDataFile(DataFile):
 class DerivedSpectralDataFile(DataFile):
     """Represents a derived spectral data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -323,7 +338,7 @@ class DerivedSpectralDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, DerivedSpectralDataFile) \
@@ -338,6 +353,8 @@ class DerivedSpectralDataFile(DataFile):
 class ProteinAssignmentFile(DataFile):
     """Represents a protein assignment file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -360,7 +377,7 @@ class ProteinAssignmentFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, ProteinAssignmentFile) \
@@ -375,6 +392,8 @@ class ProteinAssignmentFile(DataFile):
 class PeptideAssignmentFile(DataFile):
     """Represents a peptide assignment file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -397,7 +416,7 @@ class PeptideAssignmentFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, PeptideAssignmentFile) \
@@ -412,6 +431,8 @@ class PeptideAssignmentFile(DataFile):
 class DerivedArrayDataMatrixFile(DataFile):
     """Represents a derived array data matrix file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -434,7 +455,7 @@ class DerivedArrayDataMatrixFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, DerivedArrayDataMatrixFile) \
@@ -450,6 +471,8 @@ class PostTranslationalModificationAssignmentFile(DataFile):
     """Represents a post translational modification assignment file in an
     experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -472,7 +495,7 @@ class PostTranslationalModificationAssignmentFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, PostTranslationalModificationAssignmentFile) \
@@ -488,6 +511,8 @@ class AcquisitionParameterDataFile(DataFile):
     """Represents a acquisition parameter data file in an experimental
     graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -510,7 +535,7 @@ class AcquisitionParameterDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, AcquisitionParameterDataFile) \
@@ -525,6 +550,8 @@ class AcquisitionParameterDataFile(DataFile):
 class FreeInductionDecayDataFile(DataFile):
     """Represents a free induction decay data file in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, filename='', id_='',
                  generated_from=None, comments=None):
         super().__init__(filename=filename, id_=id_,
@@ -547,7 +574,7 @@ class FreeInductionDecayDataFile(DataFile):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.filename)
 
     def __eq__(self, other):
         return isinstance(other, FreeInductionDecayDataFile) \
@@ -16,6 +16,8 @@ class FactorValue(Commentable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', '__factor_name', '__value', '__unit')
+
     def __init__(self, factor_name=None, value=None, unit=None, comments=None):
         super().__init__(comments)
         self.__factor_name = None
@@ -79,7 +81,7 @@ class FactorValue(Commentable):
                          unit=self.unit.term if self.unit else '')
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.factor_name, self.value))
 
     def __eq__(self, other):
         return isinstance(other, FactorValue) \
@@ -191,7 +193,7 @@ class StudyFactor(Commentable, Identifiable):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, StudyFactor) \
@@ -0,0 +1,228 @@
+from array import array
+from collections import deque
+
+from isatools.model.datafile import DataFile
+from isatools.model.material import Material
+from isatools.model.process import Process
+from isatools.model.sample import Sample
+from isatools.model.source import Source
+
+
+OTHER = 0
+SOURCE = 1
+SAMPLE = 2
+MATERIAL = 3
+DATA_FILE = 4
+PROCESS = 5
+
+
+def _node_type(node):
+    if isinstance(node, Source):
+        return SOURCE
+    if isinstance(node, Sample):
+        return SAMPLE
+    if isinstance(node, Process):
+        return PROCESS
+    if isinstance(node, DataFile):
+        return DATA_FILE
+    if isinstance(node, Material):
+        return MATERIAL
+    return OTHER
+
+
+def _compressed_rows(num_nodes, edges):
+    offsets = array('i', [0]) * (num_nodes + 1)
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for position in range(num_nodes):
+        offsets[position + 1] += offsets[position]
+    targets = array('i', [0]) * len(edges)
+    next_slots = offsets[:-1]
+    for source, target in edges:
+        targets[next_slots[source]] = target
+        next_slots[source] += 1
+    return offsets, targets
+
+
+class ProcessGraph(object):
+    """A compact directed graph of the nodes of an ISA process sequence.
+
+    The nodes are numbered by position, in the order they are first found in
+    the process sequence, and their adjacency is stored as compressed sparse
+    rows: the successors of the node at position i are
+    successors[successor_offsets[i]:successor_offsets[i + 1]]. The methods
+    used by the ISA-Tab writers and the pooling detection mirror the
+    networkx.DiGraph ones and take sequence identifiers, so either graph can be
+    given to them.
+
+    Attributes:
+        indexes: A dict of the ISA objects by sequence identifier.
+        node_ids: The sequence identifier of each position.
+        node_types: The type of each position: SOURCE, SAMPLE, MATERIAL,
+            DATA_FILE, PROCESS or OTHER.
+        successor_offsets, successors: The successors of each position.
+        predecessor_offsets, predecessors: The predecessors of each position.
+    """
+
+    def __init__(self, edges, indexes):
+        """
+        :param edges: An iterable of (source, target) pairs of sequence
+        identifiers
+        :param indexes: A dict of the ISA objects by sequence identifier,
+        complete once edges is consumed
+        """
+        positions = {}
+        node_ids = []
+        pairs = []
+        seen = set()
+        for edge in edges:
+            for node_id in edge:
+                if node_id not in positions:
+                    positions[node_id] = len(node_ids)
+                    node_ids.append(node_id)
+            pair = (positions[edge[0]], positions[edge[1]])
+            if pair not in seen:
+                seen.add(pair)
+                pairs.append(pair)
+        self.indexes = indexes
+        self.positions = positions
+        self.node_ids = node_ids
+        self.node_types = array('b', [_node_type(indexes[node_id]) for node_id in node_ids])
+        self.successor_offsets, self.successors = _compressed_rows(len(node_ids), pairs)
+        self.predecessor_offsets, self.predecessors = _compressed_rows(
+            len(node_ids), [(target, source) for source, target in pairs])
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __contains__(self, node_id):
+        return node_id in self.positions
+
+    def nodes(self):
+        """:obj:`list` the sequence identifiers of the nodes"""
+        return list(self.node_ids)
+
+    def edges(self):
+        """:obj:`list` the edges as (source, target) pairs of sequence
+        identifiers"""
+        node_ids = self.node_ids
+        return [(node_ids[position], node_ids[successor])
+                for position in range(len(node_ids)) for successor in self._successors(position)]
+
+    def node_type(self, node_id):
+        """Gets the type of a node
+
+        :param node_id: The sequence identifier of the node
+        :return: SOURCE, SAMPLE, MATERIAL, DATA_FILE, PROCESS or OTHER
+        """
+        return self.node_types[self.positions[node_id]]
+
+    def _successors(self, position):
+        return self.successors[self.successor_offsets[position]:self.successor_offsets[position + 1]]
+
+    def _predecessors(self, position):
+        return self.predecessors[self.predecessor_offsets[position]:self.predecessor_offsets[position + 1]]
+
+    def successor_ids(self, node_id):
+        """:obj:`list` the sequence identifiers of the successors of a node"""
+        return [self.node_ids[position] for position in self._successors(self.positions[node_id])]
+
+    def predecessor_ids(self, node_id):
+        """:obj:`list` the sequence identifiers of the predecessors of a node"""
+        return [self.node_ids[position] for position in self._predecessors(self.positions[node_id])]
+
+    def out_edges(self, node_id):
+        return [(node_id, successor) for successor in self.successor_ids(node_id)]
+
+    def in_edges(self, node_id):
+        return [(predecessor, node_id) for predecessor in self.predecessor_ids(node_id)]
+
+    def out_degree(self, node_id):
+        position = self.positions[node_id]
+        return self.successor_offsets[position + 1] - self.successor_offsets[position]
+
+    def in_degree(self, node_id):
+        position = self.positions[node_id]
+        return self.predecessor_offsets[position + 1] - self.predecessor_offsets[position]
+
+    def descendants(self, node_id):
+        """Gets the nodes reachable from a node, in the same breadth-first
+        order as networkx.descendants()
+
+        :param node_id: The sequence identifier of the node
+        :return: A set of sequence identifiers
+        """
+        start = self.positions[node_id]
+        visited = {start}
+        found = []
+        queue = deque([start])
+        while queue:
+            for successor in self._successors(queue.popleft()):
+                if successor not in visited:
+                    visited.add(successor)
+                    found.append(successor)
+                    queue.append(successor)
+        return {self.node_ids[position] for position in found}
+
+    def all_simple_paths(self, source_id, target_id):
+        """Yields the paths from a node to another, depth-first, in the same
+        order as networkx.all_simple_paths()
+
+        :param source_id: The sequence identifier of the first node
+        :param target_id: The sequence identifier of the last node
+        """
+        node_ids = self.node_ids
+        source = self.positions[source_id]
+        target = self.positions[target_id]
+        if source == target:
+            return
+        path = [source]
+        on_path = {source}
+        stack = [iter(self._successors(source))]
+        while stack:
+            successor = next(stack[-1], None)
+            if successor is None:
+                stack.pop()
+                on_path.discard(path.pop())
+            elif successor == target:
+                yield [node_ids[position] for position in path] + [target_id]
+            elif successor not in on_path:
+                path.append(successor)
+                on_path.add(successor)
+                stack.append(iter(self._successors(successor)))
+
+    def topological_order(self):
+        """Gets the nodes in topological order, breaking ties by position
+
+        :return: A list of sequence identifiers
+        :raise ValueError: if the graph has a cycle
+        """
+        in_degrees = array('i', [
+            self.predecessor_offsets[position + 1] - self.predecessor_offsets[position]
+            for position in range(len(self.node_ids))
+        ])
+        queue = deque(position for position, in_degree in enumerate(in_degrees) if in_degree == 0)
+        order = []
+        while queue:
+            position = queue.popleft()
+            order.append(self.node_ids[position])
+            for successor in self._successors(position):
+                in_degrees[successor] -= 1
+                if in_degrees[successor] == 0:
+                    queue.append(successor)
+        if len(order) != len(self.node_ids):
+            raise ValueError('The process graph has a cycle')
+        return order
+
+    def to_networkx(self):
+        """Converts the graph to a networkx.DiGraph with an indexes
+        attribute, as built by _build_assay_graph()
+
+        :return: A networkx.DiGraph
+        """
+        import networkx as nx
+        g = nx.DiGraph()
+        g.indexes = dict(self.indexes)
+        g.add_nodes_from(self.node_ids)
+        g.add_edges_from(self.edges())
+        return g
@@ -7,7 +7,7 @@ from isatools.model.study import Study
 from isatools.model.identifiable import Identifiable
 from isatools.model.person import Person
 from isatools.model.publication import Publication
-from isatools.model.loader_indexes import loader_states as indexes
+from isatools.model.loader_indexes import loader_states as indexes, use_store
 from isatools.graphQL.models import IsaSchema
 
 
@@ -213,7 +213,7 @@ class Investigation(Commentable, MetadataMixin, Identifiable, object):
             num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.filename, self.identifier))
 
     def __eq__(self, other):
         return isinstance(other, Investigation) \
@@ -249,37 +249,44 @@ class Investigation(Commentable, MetadataMixin, Identifiable, object):
     def to_ld(self):
         return self.to_dict(ld=True)
 
-    def from_dict(self, investigation):
-        self.identifier = investigation.get('identifier', '')
-        self.title = investigation.get('title', '')
-        self.public_release_date = investigation.get('publicReleaseDate', '')
-        self.submission_date = investigation.get('submissionDate', '')
-        self.description = investigation.get('description', '')
-        self.load_comments(investigation.get('comments', []))
-
-        # ontology source references
-        for ontology_source_data in investigation.get('ontologySourceReferences', []):
-            ontology_source = OntologySource('')
-            ontology_source.from_dict(ontology_source_data)
-            self.ontology_source_references.append(ontology_source)
-            indexes.add_term_source(ontology_source)
-
-        # people
-        for person_data in investigation.get('people', []):
-            person = Person()
-            person.from_dict(person_data)
-            self.contacts.append(person)
-
-        # publications
-        for publication_data in investigation.get('publications', []):
-            publication = Publication()
-            publication.from_dict(publication_data)
-            self.publications.append(publication)
-
-        # studies
-        for study_data in investigation.get('studies', []):
-            study = Study()
-            study.from_dict(study_data)
-            self.studies.append(study)
-
-        indexes.reset_store()
+    def from_dict(self, investigation, store=None):
+        """Loads the investigation from its ISA-JSON dict
+
+        :param investigation: The ISA-JSON dict
+        :param store: The LoaderStore indexing the objects while loading, or
+        None for a new one
+        """
+        with use_store(store):
+            self.identifier = investigation.get('identifier', '')
+            self.title = investigation.get('title', '')
+            self.public_release_date = investigation.get('publicReleaseDate', '')
+            self.submission_date = investigation.get('submissionDate', '')
+            self.description = investigation.get('description', '')
+            self.load_comments(investigation.get('comments', []))
+
+            # ontology source references
+            for ontology_source_data in investigation.get('ontologySourceReferences', []):
+                ontology_source = OntologySource('')
+                ontology_source.from_dict(ontology_source_data)
+                self.ontology_source_references.append(ontology_source)
+                indexes.add_term_source(ontology_source)
+
+            # people
+            for person_data in investigation.get('people', []):
+                person = Person()
+                person.from_dict(person_data)
+                self.contacts.append(person)
+
+            # publications
+            for publication_data in investigation.get('publications', []):
+                publication = Publication()
+                publication.from_dict(publication_data)
+                self.publications.append(publication)
+
+            # studies
+            for study_data in investigation.get('studies', []):
+                study = Study()
+                study.from_dict(study_data)
+                self.studies.append(study)
+
+            indexes.reset_store()
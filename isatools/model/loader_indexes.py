@@ -19,8 +19,14 @@ Setters are:
     - add_source(itemID)
 After loading a resource, reset the store with self.reset_store()
 
+Each Investigation.from_dict() call loads into a store of its own, made
+current in its context with use_store(). The module-level loader_states
+forwards to that store, or to a default store outside of a load.
+
 Author: Terazus
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 
 def make_init():
@@ -137,9 +143,54 @@ for field_name in FIELDS:
 
 # parameters of type are 1. class name 2. inheritance as tuple 3. methods and attributes
 LoaderStore = type('LoaderStore', (), methods)
-loader_states = LoaderStore()
 
 
 def new_store():
     return LoaderStore()
 
+
+_current_store = ContextVar('isatools_loader_store', default=None)
+_default_store = LoaderStore()
+
+
+def get_store():
+    """ Get the store of the load running in the current context, or the default store outside of a load
+
+    :return: a LoaderStore
+    """
+    store = _current_store.get()
+    return store if store is not None else _default_store
+
+
+@contextmanager
+def use_store(store=None):
+    """ Make a store the current one within a `with` block, independently of other threads or asyncio tasks
+
+    :param store: the LoaderStore to use, or None for a new one
+    :return: the LoaderStore in use
+    """
+    store = store if store is not None else new_store()
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
+
+
+class _CurrentStore:
+    """ Forwards to the store returned by get_store(), so that the from_dict() methods importing the module-level
+    loader_states index the objects of the load they are part of
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_store(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_store(), name, value)
+
+    def __str__(self):
+        return str(get_store())
+
+
+loader_states = _CurrentStore()
+
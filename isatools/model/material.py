@@ -12,6 +12,9 @@ class Material(Commentable, ProcessSequenceNode, Identifiable, metaclass=ABCMeta
     """Represents a generic material in an experimental graph.
     """
 
+    __slots__ = ('_Commentable__comments', 'sequence_identifier', '_Identifiable__id', '__name', '__type',
+                 '__characteristics')
+
     def __init__(self, name='', id_='', type_='', characteristics=None,
                  comments=None):
         Commentable.__init__(self, comments=comments)
@@ -66,6 +69,9 @@ class Material(Commentable, ProcessSequenceNode, Identifiable, metaclass=ABCMeta
             raise AttributeError('{}.characteristics must be iterable containing Characteristics'
                                  .format(type(self).__name__))
 
+    def __hash__(self):
+        return hash(self.name)
+
     def __eq__(self, other):
         return isinstance(other, Material) \
                and self.name == other.name \
@@ -100,6 +106,8 @@ class Material(Commentable, ProcessSequenceNode, Identifiable, metaclass=ABCMeta
 class Extract(Material):
     """Represents a extract material in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, name='', id_='', characteristics=None, comments=None):
         super().__init__(name=name, id_=id_, characteristics=characteristics,
                          comments=comments)
@@ -123,7 +131,7 @@ class Extract(Material):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, Extract) \
@@ -139,6 +147,8 @@ class Extract(Material):
 class LabeledExtract(Material):
     """Represents a labeled extract material in an experimental graph."""
 
+    __slots__ = ()
+
     def __init__(self, name='', id_='', characteristics=None, comments=None):
         super().__init__(name=name, id_=id_, characteristics=characteristics,
                          comments=comments)
@@ -163,7 +173,7 @@ class LabeledExtract(Material):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, LabeledExtract) \
@@ -10,10 +10,10 @@ from isatools.model.ontology_annotation import OntologyAnnotation
 from isatools.model.sample import Sample
 from isatools.model.characteristic import Characteristic
 from isatools.model.material import Material
-from isatools.model.process import Process
+from isatools.model.process import Process, get_links_version
 from isatools.model.context import LDSerializable
 from isatools.model.identifiable import Identifiable
-from isatools.model.utils import find as find_material, _build_assay_graph
+from isatools.model.utils import find as find_material, _build_assay_graph, _build_process_graph
 
 
 class MetadataMixin(metaclass=ABCMeta):
@@ -168,7 +168,15 @@ class StudyAssayMixin(metaclass=ABCMeta):
         process_sequence: A list of Process objects representing the
             experimental graphs.
         graph: Graph representation of the experimental graph.
+        process_graph: Compact graph representation of the experimental
+            graph.
 
+    The attributes built from the ISA-Tab table file can be loaded lazily:
+    see set_table_loader().
+
+    The graphs are built on first access and cached until process_sequence is
+    reassigned or grows or shrinks, or processes are linked with plink(). Call
+    rebuild_graph() after changing the inputs or outputs of its processes.
     """
 
     def __init__(self, filename='',
@@ -195,6 +203,11 @@ class StudyAssayMixin(metaclass=ABCMeta):
         self.__units = []
         self.__process_sequence = []
         self.__characteristic_categories = []
+        self.__table_loader = None
+        self.__graph = None
+        self.__process_graph = None
+        self.__graph_key = None
+        self.__graph_version = 0
 
         if units:
             self.__units = units
@@ -203,6 +216,35 @@ class StudyAssayMixin(metaclass=ABCMeta):
         if characteristic_categories:
             self.__characteristic_categories = characteristic_categories
 
+    def set_table_loader(self, table_loader):
+        """Defers building the attributes found in the table file until one of
+        them is first accessed or set.
+
+        :param table_loader: A callable taking the study or assay to build the
+        sources, samples, other_material, units, characteristic_categories,
+        process_sequence and, for an assay, data_files of, or None to cancel a
+        deferred loading
+        """
+        self.__table_loader = table_loader
+
+    def load_table(self):
+        """Builds the attributes found in the table file now if their loading
+        was deferred with set_table_loader(), and does nothing otherwise"""
+        table_loader = self.__table_loader
+        if table_loader is not None:
+            self.__table_loader = None
+            try:
+                table_loader(self)
+            except Exception:
+                self.__table_loader = table_loader
+                raise
+
+    @property
+    def table_loaded(self):
+        """:obj:`bool`: whether the attributes found in the table file are
+        built, i.e. their loading was not deferred or already happened"""
+        return self.__table_loader is None
+
     @property
     def filename(self):
         """:obj:`str`: the filename of the study or assay"""
@@ -219,10 +261,12 @@ class StudyAssayMixin(metaclass=ABCMeta):
     def units(self):
         """:obj:`list` of :obj:`OntologyAnnotation`: Container for study units
         """
+        self.load_table()
         return self.__units
 
     @units.setter
     def units(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, OntologyAnnotation) for x in val):
                 self.__units = list(val)
@@ -232,10 +276,12 @@ class StudyAssayMixin(metaclass=ABCMeta):
     @property
     def sources(self):
         """:obj:`list` of :obj:`Source`: Container for study sources"""
+        self.load_table()
         return self.__materials['sources']
 
     @sources.setter
     def sources(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, Source) for x in val):
                 self.__materials['sources'] = list(val)
@@ -322,10 +368,12 @@ class StudyAssayMixin(metaclass=ABCMeta):
     @property
     def samples(self):
         """:obj:`list` of :obj:`Sample`: Container for study samples"""
+        self.load_table()
         return self.__materials['samples']
 
     @samples.setter
     def samples(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, Sample) for x in val):
                 self.__materials['samples'] = list(val)
@@ -450,10 +498,12 @@ class StudyAssayMixin(metaclass=ABCMeta):
     def other_material(self):
         """:obj:`list` of :obj:`Material`: Container for study other_material
         """
+        self.load_table()
         return self.__materials['other_material']
 
     @other_material.setter
     def other_material(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, Material) for x in val):
                 self.__materials['other_material'] = list(val)
@@ -503,18 +553,22 @@ class StudyAssayMixin(metaclass=ABCMeta):
         other_material"""
         warn("the `materials` dict property is being deprecated in favour of `sources`, `samples`, "
              "and `other_material` properties.", DeprecationWarning)
+        self.load_table()
         return self.__materials
 
     @property
     def process_sequence(self):
         """:obj:`list` of :obj:`Process`: Container for study Processes"""
+        self.load_table()
         return self.__process_sequence
 
     @process_sequence.setter
     def process_sequence(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, Process) for x in val):
                 self.__process_sequence = list(val)
+                self.__invalidate_graph()
         else:
             raise AttributeError(
                 '{}.process_sequence must be iterable containing Processes'
@@ -524,10 +578,12 @@ class StudyAssayMixin(metaclass=ABCMeta):
     def characteristic_categories(self):
         """:obj:`list` of :obj:`OntologyAnnotation`: Container for study
         characteristic categories used"""
+        self.load_table()
         return self.__characteristic_categories
 
     @characteristic_categories.setter
     def characteristic_categories(self, val):
+        self.load_table()
         if val is not None and hasattr(val, '__iter__'):
             if val == [] or all(isinstance(x, OntologyAnnotation) for x in val):
                 self.__characteristic_categories = list(val)
@@ -540,13 +596,56 @@ class StudyAssayMixin(metaclass=ABCMeta):
         """:obj:`networkx.DiGraph` A graph representation of the study's
         process sequence"""
         if len(self.process_sequence) > 0:
-            return _build_assay_graph(self.process_sequence)
+            self.__check_graph()
+            if self.__graph is None:
+                self.__graph = _build_assay_graph(self.process_sequence)
+            return self.__graph
         return None
 
     @graph.setter
     def graph(self, graph):
         raise AttributeError('{}.graph is not settable'.format(type(self).__name__))
 
+    @property
+    def process_graph(self):
+        """:obj:`ProcessGraph` A compact graph representation of the study's
+        process sequence, see ProcessGraph.to_networkx()"""
+        if len(self.process_sequence) > 0:
+            self.__check_graph()
+            if self.__process_graph is None:
+                self.__process_graph = _build_process_graph(self.process_sequence)
+            return self.__process_graph
+        return None
+
+    @property
+    def graph_version(self):
+        """:obj:`int`: a counter incremented each time the cached graphs are
+        invalidated, to tell whether a graph got earlier is still current"""
+        self.__check_graph()
+        return self.__graph_version
+
+    def rebuild_graph(self):
+        """Drops the cached graphs and builds the graph again from the process
+        sequence
+
+        :return: The rebuilt graph, or None if there are no processes
+        """
+        self.__invalidate_graph()
+        return self.graph
+
+    def __invalidate_graph(self):
+        self.__graph = None
+        self.__process_graph = None
+        self.__graph_key = None
+        self.__graph_version += 1
+
+    def __check_graph(self):
+        graph_key = (len(self.process_sequence), get_links_version())
+        if graph_key != self.__graph_key:
+            if self.__graph_key is not None:
+                self.__invalidate_graph()
+            self.__graph_key = graph_key
+
     def shuffle_materials(self, attribute):
         """
         Shuffles the samples in the Study or Assay
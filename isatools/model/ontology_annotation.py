@@ -17,6 +17,8 @@ class OntologyAnnotation(Commentable, Identifiable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', '_Identifiable__id', '__term', '__term_source', '__term_accession')
+
     def __init__(self,
                  term: str = '',
                  term_source: OntologySource = '',
@@ -96,7 +98,7 @@ class OntologyAnnotation(Commentable, Identifiable):
                              num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.term, self.term_accession))
 
     def __eq__(self, other: Any) -> bool:
         return (isinstance(other, OntologyAnnotation)
@@ -103,7 +103,7 @@ class OntologySource(Commentable):
                 ).format(ontology_source=self, num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, OntologySource) \
@@ -17,6 +17,8 @@ class ParameterValue(Commentable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', '__category', '__value', '__unit')
+
     def __init__(self, category=None, value=None, unit=None, comments=None):
         super().__init__(comments)
 
@@ -88,7 +90,7 @@ class ParameterValue(Commentable):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.category, self.value))
 
     def __eq__(self, other):
         return isinstance(other, ParameterValue) \
@@ -188,7 +188,7 @@ class Person(Commentable, Identifiable):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.last_name, self.first_name, self.email))
 
     def __eq__(self, other):
         return (isinstance(other, Person)
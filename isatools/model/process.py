@@ -14,6 +14,17 @@ from isatools.model.loader_indexes import loader_states as indexes
 
 log = getLogger('isatools')
 
+_links_version = 0
+
+
+def get_links_version():
+    """Gets a counter incremented each time a process is linked to, or
+    unlinked from, a previous or next process, e.g. with plink()
+
+    :return: The counter value
+    """
+    return _links_version
+
 
 class Process(Commentable, ProcessSequenceNode, Identifiable):
     """Process nodes represent the application of a protocol to some input
@@ -37,6 +48,10 @@ class Process(Commentable, ProcessSequenceNode, Identifiable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', 'sequence_identifier', '_Identifiable__id', '__name', '__executes_protocol',
+                 '__date', '__performer', '__parameter_values', '__inputs', '__outputs', '__prev_process',
+                 '__next_process')
+
     # TODO: replace with above but need to debug where behaviour starts varying
 
     def __init__(self, id_='', name='', executes_protocol=None, date_=None,
@@ -184,6 +199,8 @@ class Process(Commentable, ProcessSequenceNode, Identifiable):
                 'Process.prev_process must be a Process '
                 'or None; got {0}:{1}'.format(val, type(val)))
         else:
+            global _links_version
+            _links_version += 1
             self.__prev_process = val
 
     @property
@@ -200,6 +217,8 @@ class Process(Commentable, ProcessSequenceNode, Identifiable):
                 'or None; got {0}:{1}'.format(val, type(val))
             )
         else:
+            global _links_version
+            _links_version += 1
             self.__next_process = val
 
     def __repr__(self):
@@ -211,7 +230,7 @@ class Process(Commentable, ProcessSequenceNode, Identifiable):
         return """{0}(name={1.name})""".format(self.__class__.__name__, self)
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.id)
 
     def __eq__(self, other):
         return isinstance(other, Process) \
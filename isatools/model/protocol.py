@@ -216,7 +216,7 @@ class Protocol(Commentable, Identifiable):
                          num_comments=len(self.comments) if self.comments else 0)
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return (isinstance(other, Protocol)
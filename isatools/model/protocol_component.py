@@ -64,7 +64,7 @@ class ProtocolComponent(Commentable):
         self.component_type else '', num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, ProtocolComponent) \
@@ -47,7 +47,7 @@ class ProtocolParameter(Commentable, Identifiable):
                 ).format(parameter_name=parameter_name, num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.parameter_name)
 
     def __eq__(self, other):
         return (isinstance(other, ProtocolParameter)
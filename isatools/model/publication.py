@@ -106,7 +106,7 @@ class Publication(Commentable):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.pubmed_id, self.doi, self.title))
 
     def __eq__(self, other):
         return isinstance(other, Publication) \
@@ -22,6 +22,9 @@ class Sample(Commentable, ProcessSequenceNode, Identifiable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', 'sequence_identifier', '_Identifiable__id', '__name', '__factor_values',
+                 '__characteristics', '__derives_from')
+
     def __init__(self, name='', id_='', factor_values=None,
                  characteristics=None, derives_from=None, comments=None):
         Commentable.__init__(self, comments)
@@ -131,7 +134,7 @@ class Sample(Commentable, ProcessSequenceNode, Identifiable):
                          num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, Sample) \
@@ -16,6 +16,8 @@ class Source(Commentable, ProcessSequenceNode, Identifiable):
         comments: Comments associated with instances of this class.
     """
 
+    __slots__ = ('_Commentable__comments', 'sequence_identifier', '_Identifiable__id', '__name', '__characteristics')
+
     def __init__(self, name='', id_='', characteristics=None, comments=None):
         # super().__init__(comments)
         Commentable.__init__(self, comments)
@@ -84,7 +86,7 @@ class Source(Commentable, ProcessSequenceNode, Identifiable):
                ).format(source=self, num_characteristics=len(self.characteristics), num_comments=len(self.comments))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self.name)
 
     def __eq__(self, other):
         return isinstance(other, Source) \
@@ -299,7 +299,7 @@ class Study(Commentable, StudyAssayMixin, MetadataMixin, object):
             num_units=len(self.units))
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.filename, self.identifier))
 
     def __eq__(self, other):
         return isinstance(other, Study) \
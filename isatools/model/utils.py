@@ -5,6 +5,7 @@ from isatools.model.process import Process
 from isatools.model.source import Source
 from isatools.model.sample import Sample
 from isatools.model.material import Material
+from isatools.model.graph import ProcessGraph
 
 
 def find(predictor, iterable):
@@ -16,40 +17,62 @@ def find(predictor, iterable):
     return None, it
 
 
-def _build_assay_graph(process_sequence=None):
-    """:obj:`networkx.DiGraph` Returns a directed graph object based on a
-    given ISA process sequence."""
-    g = nx.DiGraph()
-    g.indexes = {}
-    if process_sequence is None:
-        return g
+def _iter_assay_graph_edges(process_sequence, indexes):
+    """Yields the edges of the directed graph of a given ISA process
+    sequence, as pairs of sequence identifiers, and indexes the nodes by
+    their sequence identifier
+
+    :param process_sequence: A list of Process objects
+    :param indexes: A dict filled with the nodes of the graph
+    """
     for process in process_sequence:
-        g.indexes[process.sequence_identifier] = process
+        indexes[process.sequence_identifier] = process
         if process.next_process is not None or len(process.outputs) > 0:
             if len([n for n in process.outputs if not isinstance(n, DataFile)]) > 0:
                 for output in [n for n in process.outputs if
                                not isinstance(n, DataFile)]:
-                    g.add_edge(process.sequence_identifier, output.sequence_identifier)
-                    g.indexes[output.sequence_identifier] = output
+                    yield process.sequence_identifier, output.sequence_identifier
+                    indexes[output.sequence_identifier] = output
             else:
                 next_process_identifier = getattr(process.next_process, "sequence_identifier", None)
                 if next_process_identifier is not None:
-                    g.add_edge(process.sequence_identifier, next_process_identifier)
-                    g.indexes[next_process_identifier] = process.next_process
+                    yield process.sequence_identifier, next_process_identifier
+                    indexes[next_process_identifier] = process.next_process
 
         if process.prev_process is not None or len(process.inputs) > 0:
             if len(process.inputs) > 0:
                 for input_ in process.inputs:
-                    g.add_edge(input_.sequence_identifier, process.sequence_identifier)
-                    g.indexes[input_.sequence_identifier] = input_
+                    yield input_.sequence_identifier, process.sequence_identifier
+                    indexes[input_.sequence_identifier] = input_
             else:
                 previous_process_identifier = getattr(process.prev_process, "sequence_identifier", None)
                 if previous_process_identifier is not None:
-                    g.add_edge(previous_process_identifier, process.sequence_identifier)
-                    g.indexes[previous_process_identifier] = process.prev_process
+                    yield previous_process_identifier, process.sequence_identifier
+                    indexes[previous_process_identifier] = process.prev_process
+
+
+def _build_assay_graph(process_sequence=None):
+    """:obj:`networkx.DiGraph` Returns a directed graph object based on a
+    given ISA process sequence."""
+    g = nx.DiGraph()
+    g.indexes = {}
+    if process_sequence is None:
+        return g
+    for edge in _iter_assay_graph_edges(process_sequence, g.indexes):
+        g.add_edge(*edge)
     return g
 
 
+def _build_process_graph(process_sequence=None):
+    """:obj:`ProcessGraph` Returns a compact directed graph object based on
+    a given ISA process sequence, with the same nodes and edges as
+    _build_assay_graph()"""
+    indexes = {}
+    if process_sequence is None:
+        return ProcessGraph([], indexes)
+    return ProcessGraph(_iter_assay_graph_edges(process_sequence, indexes), indexes)
+
+
 def plink(p1, p2):
     """
     Function to create a link between two processes nodes of the isa graph
@@ -8,7 +8,11 @@ import os
 import re
 import sys
 import uuid
+from collections import deque
 from functools import reduce
+from multiprocessing import cpu_count, get_context
+from multiprocessing.connection import wait
+from time import monotonic
 from zipfile import ZipFile
 import pandas as pd
 import yaml
@@ -46,7 +50,7 @@ def detect_graph_process_pooling(G):
     """Computes whether there is pooling in an experimental graph. This is
     unexpected in some cases so this function is used to flag these cases.
 
-    :param G: DiGraph of the experimental graph
+    :param G: ProcessGraph or DiGraph of the experimental graph
     :return: List of process IDs on which processes are pooling
     """
     report = []
@@ -74,7 +78,7 @@ def detect_isatab_process_pooling(fp):
 
     for study in ISA.studies:
         log.info('Checking {}'.format(study.filename))
-        pooling_list = detect_graph_process_pooling(study.graph)
+        pooling_list = detect_graph_process_pooling(study.process_graph)
 
         if len(pooling_list) > 0:
             report.append({
@@ -83,7 +87,7 @@ def detect_isatab_process_pooling(fp):
 
         for assay in study.assays:
             log.info('Checking {}'.format(assay.filename))
-            pooling_list = detect_graph_process_pooling(assay.graph)
+            pooling_list = detect_graph_process_pooling(assay.process_graph)
 
             if len(pooling_list) > 0:
                 report.append({
@@ -916,6 +920,100 @@ def utf8_text_file_open(path):
     return fp
 
 
+def _send_result(conn, func, arg):
+    """Calls a function in a worker process and sends back its result, or the
+    exception it raised
+
+    :param conn: The sending end of a Pipe
+    :param func: A picklable function
+    :param arg: The argument to call the function with
+    """
+    try:
+        try:
+            conn.send((func(arg), None))
+        except Exception as e:
+            try:
+                conn.send((None, e))
+            except Exception:
+                conn.send((None, RuntimeError(repr(e))))
+    finally:
+        conn.close()
+
+
+def iter_process_results(func, args, workers=None, timeout=None, ordered=True):
+    """Calls a function on each argument in a separate worker process, with at
+    most `workers` processes running at a time, and yields the results as the
+    calls complete
+
+    A call still running after `timeout` seconds has its process terminated,
+    so one argument cannot stall the others.
+
+    :param func: A picklable function taking a single argument
+    :param args: The arguments to call the function with
+    :param workers: Maximum number of worker processes, by default the number
+    of CPUs
+    :param timeout: Timeout of each call in seconds, None for no timeout
+    :param ordered: Whether to yield the results in the order of the
+    arguments, instead of as soon as they complete
+    :return: A generator of (index, result, error) tuples, where index is
+    the position of the argument and error is the exception raised by the call,
+    a TimeoutError, or None
+    """
+    context = get_context()
+    workers = workers or cpu_count()
+    pending = deque(enumerate(args))
+    running = {}
+    completed = {}
+    next_index = 0
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                index, arg = pending.popleft()
+                recv_conn, send_conn = context.Pipe(duplex=False)
+                process = context.Process(target=_send_result, args=(send_conn, func, arg), daemon=True)
+                process.start()
+                send_conn.close()
+                running[recv_conn] = (index, process, monotonic() + timeout if timeout else None)
+
+            deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+            ready = wait(list(running), max(0, min(deadlines) - monotonic()) if deadlines else None)
+            finished = []
+            for conn in ready:
+                index, process, _ = running.pop(conn)
+                try:
+                    result, error = conn.recv()
+                except EOFError:
+                    process.join()
+                    result, error = None, RuntimeError(
+                        "Worker process exited with code {}".format(process.exitcode))
+                conn.close()
+                process.join()
+                finished.append((index, result, error))
+            now = monotonic()
+            for conn, (index, process, deadline) in list(running.items()):
+                if deadline is not None and deadline <= now:
+                    del running[conn]
+                    process.terminate()
+                    process.join()
+                    conn.close()
+                    finished.append((index, None, TimeoutError(
+                        "Did not complete within {} seconds".format(timeout))))
+
+            for index, result, error in sorted(finished, key=lambda x: x[0]):
+                if not ordered:
+                    yield index, result, error
+                    continue
+                completed[index] = (result, error)
+                while next_index in completed:
+                    yield (next_index,) + completed.pop(next_index)
+                    next_index += 1
+    finally:
+        for conn, (_, process, _) in running.items():
+            process.terminate()
+            process.join()
+            conn.close()
+
+
 def n_digits(num):
     length = 0
     while num / 10 >= 1:
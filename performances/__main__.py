@@ -4,6 +4,7 @@ import sys
 
 from performances.isatab import profile_isatab
 from performances.isajson import profile_isajson
+from performances.model import profile_model
 
 
 def main(argv=None):
@@ -22,9 +23,11 @@ def main(argv=None):
     if not args.tab and not args.json:
         profile_isajson()
         profile_isatab()
+        profile_model()
 
     if args.tab:
         profile_isatab(args.tab, args.output)
+        profile_model(args.tab, args.output)
 
     if args.json:
         profile_isajson(args.json, args.output)
@@ -1,10 +1,14 @@
 from cProfile import runctx
-from os import path
+from os import path, devnull
 import json
 
-from isatools.isajson import load, validate
+from isatools.isajson import ISAJSONEncoder, dump, load, validate
+from isatools.isajson.validate import (
+    ISAJSONIndex, check_rules, check_study_and_assay_graphs, default_config_dir, load_config
+)
 from isatools.model import Investigation
 from performances.defaults import OUTPUT_PATH, DEFAULT_JSON_INPUT as DEFAULT_INPUT
+from performances.model import build_assay
 
 
 def profile_json_load(filename=None, output_path=None):
@@ -13,6 +17,9 @@ def profile_json_load(filename=None, output_path=None):
     with open(input_data_path, 'r') as isajson_fp:
         output_data_path = path.join(output_path, 'isajson_load')
         runctx('load(isajson_fp)', globals(), locals(), output_data_path)
+    with open(input_data_path, 'r') as isajson_fp:
+        output_data_path = path.join(output_path, 'isajson_load_incremental')
+        runctx('load(isajson_fp, incremental=True)', globals(), locals(), output_data_path)
 
 
 def profile_json_dump(filename=None, output_path=None):
@@ -24,6 +31,9 @@ def profile_json_dump(filename=None, output_path=None):
     investigation.from_dict(data)
     output_data_path = path.join(output_path, 'isajson_dump')
     runctx('investigation.to_dict()', globals(), locals(), output_data_path)
+    with open(devnull, 'w') as isajson_fp:
+        output_data_path = path.join(output_path, 'isajson_dump_stream')
+        runctx('dump(investigation, isajson_fp, stream=True)', globals(), locals(), output_data_path)
 
 
 def profile_validate(filename=None, output_path=None):
@@ -34,7 +44,48 @@ def profile_validate(filename=None, output_path=None):
         runctx('validate(fp)', globals(), locals(), output_data_path)
 
 
+def profile_validate_rules(filename=None, output_path=None, rows=20000):
+    """Profiles the rules 1002-1022 and 3001-3010 read from the JSON for each
+    rule and evaluated on an ISAJSONIndex. Without a file, such as a
+    MetaboLights study exported to ISA-JSON, a study of the given number of
+    rows is generated."""
+    output_path = output_path if output_path else OUTPUT_PATH
+    if filename:
+        with open(filename, 'r') as fp:
+            isa_json = json.load(fp)
+    else:
+        isa_json = json.loads(json.dumps(Investigation(studies=[build_assay(rows)]), cls=ISAJSONEncoder))
+    output_data_path = path.join(output_path, 'isajson_validate_rules')
+    runctx('check_rules(isa_json)', globals(), locals(), output_data_path)
+    output_data_path = path.join(output_path, 'isajson_validate_rules_index')
+    runctx('ISAJSONIndex(isa_json).check_rules()', globals(), locals(), output_data_path)
+
+
+def profile_validate_graphs(filename=None, output_path=None, rows=20000):
+    """Profiles the rule 4004. Without a file, a study of the given number of
+    rows is generated, whose assay processes are linked in chains of two."""
+    output_path = output_path if output_path else OUTPUT_PATH
+    if filename:
+        with open(filename, 'r') as fp:
+            isa_json = json.load(fp)
+    else:
+        isa_json = json.loads(json.dumps(Investigation(studies=[build_assay(rows)]), cls=ISAJSONEncoder))
+        assay_json = isa_json['studies'][0]['assays'][0]
+        assay_json['measurementType']['annotationValue'] = 'metabolite profiling'
+        assay_json['technologyType']['annotationValue'] = 'NMR spectroscopy'
+        process_sequence_json = assay_json['processSequence']
+        for previous_process_json, process_json in zip(process_sequence_json[::2], process_sequence_json[1::2]):
+            previous_process_json['nextProcess'] = {'@id': process_json['@id']}
+            process_json['previousProcess'] = {'@id': previous_process_json['@id']}
+    configs = load_config(default_config_dir)
+    output_data_path = path.join(output_path, 'isajson_validate_graphs')
+    runctx('for study_json in isa_json["studies"]: check_study_and_assay_graphs(study_json, configs)',
+           globals(), locals(), output_data_path)
+
+
 def profile_isajson(filename=None, output_path=None):
     profile_json_load(filename, output_path)
     profile_json_dump(filename, output_path)
     profile_validate(filename, output_path)
+    profile_validate_rules(filename, output_path)
+    profile_validate_graphs(filename, output_path)
@@ -8,10 +8,11 @@ Author: D. Batista (@Terazus)
 
 from cProfile import runctx
 from os import path
+from io import StringIO
 
 from isatools.isatab.defaults import log
 from isatools.isatab.validate.core import validate as validate
-from isatools.isatab.load import load
+from isatools.isatab.load import load, read_investigation_file
 from performances.defaults import OUTPUT_PATH, DEFAULT_TAB_INPUT as DEFAULT_INPUT
 
 log.disabled = False
@@ -40,6 +41,30 @@ def profile_loader(filename=None, output_path=None):
         runctx('load(data_file)', globals(), locals(), output_data_path)
 
 
+def build_investigation_file(filename=None, copies=300):
+    """Builds a large investigation file in memory by repeating the STUDY
+    blocks of an investigation file
+
+    :param filename: Path to the investigation file to repeat the studies of
+    :param copies: Number of times the STUDY blocks are repeated
+    :return: A file-like buffer object of the built investigation file
+    """
+    input_data_path = filename if filename else DEFAULT_INPUT
+    with open(input_data_path, 'r') as data_file:
+        lines = data_file.readlines()
+    first_study = [line.rstrip() for line in lines].index('STUDY')
+    return StringIO(''.join(lines[:first_study] + lines[first_study:] * copies))
+
+
+def profile_investigation_reader(filename=None, output_path=None, copies=300):
+    if output_path is None:
+        output_path = OUTPUT_PATH
+    output_data_path = path.join(output_path, 'isatab_read_investigation_file')
+    investigation_file = build_investigation_file(filename, copies)
+    runctx('read_investigation_file(investigation_file)', globals(), locals(), output_data_path)
+
+
 def profile_isatab(filename=None, output_path=None):
     profile_validation(filename, output_path)
     profile_loader(filename, output_path)
+    profile_investigation_reader(filename, output_path)
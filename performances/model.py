@@ -0,0 +1,134 @@
+"""
+File to profile the hashing of the ISA model objects, and to measure their memory.
+Do not comment what look like unused imports. They are being called in the form of a string by runctx.
+Profiles are dumped in /performances/profiles/ and can be visualized using the following command:
+`snakeviz ./performances/profiles/` from the project root directory.
+"""
+
+from cProfile import runctx
+from gc import collect
+from os import path
+from tracemalloc import get_traced_memory, start, stop
+
+from isatools.isatab.load import load
+from isatools.model import (
+    Assay, Characteristic, DataFile, Extract, FactorValue, OntologyAnnotation, Process, Protocol, Sample, Source,
+    Study, StudyFactor
+)
+from performances.defaults import OUTPUT_PATH, HERE_PATH
+
+DEFAULT_INPUT = path.join(HERE_PATH, '..', 'tests', 'data', 'tab', 'BII-S-3', 'i_gilbert.txt')
+
+
+def build_assay(rows=20000):
+    """Builds a study with a single assay of the given number of rows, each
+    row going from a source to a sample, an extract and a data file
+
+    :param rows: Number of rows of the assay
+    :return: The built Study
+    """
+    factor = StudyFactor(name='dose', factor_type=OntologyAnnotation(term='dose'))
+    organism = OntologyAnnotation(term='organism')
+    collection = Protocol(name='sample collection', protocol_type=OntologyAnnotation(term='sample collection'))
+    extraction = Protocol(name='extraction', protocol_type=OntologyAnnotation(term='extraction'))
+    study = Study(filename='s_study.txt', factors=[factor], protocols=[collection, extraction])
+    assay = Assay(filename='a_assay.txt')
+    for i in range(rows):
+        source = Source(name='source_{}'.format(i), characteristics=[
+            Characteristic(category=organism, value=OntologyAnnotation(term='Homo sapiens'))
+        ])
+        sample = Sample(name='sample_{}'.format(i), derives_from=[source], factor_values=[
+            FactorValue(factor_name=factor, value=i % 10)
+        ])
+        extract = Extract(name='extract_{}'.format(i))
+        data_file = DataFile(filename='file_{}.raw'.format(i))
+        study.sources.append(source)
+        study.samples.append(sample)
+        study.process_sequence.append(Process(executes_protocol=collection, inputs=[source], outputs=[sample]))
+        assay.samples.append(sample)
+        assay.other_material.append(extract)
+        assay.data_files.append(data_file)
+        assay.process_sequence.append(Process(executes_protocol=extraction, inputs=[sample], outputs=[extract]))
+    study.assays.append(assay)
+    return study
+
+
+def get_objects(studies):
+    """Gets the nodes and processes of the given studies and of their assays,
+    along with the characteristics and factor values of their materials"""
+    objects = []
+    for study in studies:
+        for isa_object in [study] + study.assays:
+            objects.extend(isa_object.process_sequence)
+            materials = list(isa_object.sources) if isa_object is study else []
+            materials.extend(isa_object.samples)
+            materials.extend(isa_object.other_material)
+            objects.extend(materials)
+            objects.extend(getattr(isa_object, 'data_files', []))
+            for material in materials:
+                objects.extend(material.characteristics)
+                objects.extend(getattr(material, 'factor_values', []))
+    return objects
+
+
+def repr_hashes(objects):
+    return set(hash(repr(isa_object)) for isa_object in objects)
+
+
+def profile_hashing(filename=None, output_path=None, rows=20000):
+    input_data_path = filename if filename else DEFAULT_INPUT
+    if output_path is None:
+        output_path = OUTPUT_PATH
+
+    with open(input_data_path, 'r') as data_file:
+        objects = get_objects(load(data_file).studies)
+    runctx('set(objects)', globals(), locals(), path.join(output_path, 'model_hash'))
+    runctx('repr_hashes(objects)', globals(), locals(), path.join(output_path, 'model_repr_hash'))
+
+    objects = get_objects([build_assay(rows)])
+    runctx('set(objects)', globals(), locals(), path.join(output_path, 'model_hash_large_assay'))
+    runctx('repr_hashes(objects)', globals(), locals(), path.join(output_path, 'model_repr_hash_large_assay'))
+
+
+def get_bytes_per_sample(build_studies):
+    """Measures the memory taken by the ISA objects of some studies
+
+    :param build_studies: A function building and returning the studies,
+    called once first so the modules and caches it loads are not measured
+    :return: The bytes allocated by build_studies and still in use once it
+    returns, divided by the number of samples of the studies
+    """
+    build_studies()
+    collect()
+    start()
+    try:
+        studies = build_studies()
+        allocated = get_traced_memory()[0]
+    finally:
+        stop()
+    samples = sum(len(study.samples) for study in studies)
+    return allocated / samples if samples else 0
+
+
+def measure_memory(filename=None, rows=20000):
+    """Prints the memory taken by the studies loaded from an ISA-Tab file and
+    by a generated study of the given number of rows, in bytes per sample.
+    Run it before and after a change of the model to compare."""
+    input_data_path = filename if filename else DEFAULT_INPUT
+
+    def load_studies():
+        with open(input_data_path, 'r') as data_file:
+            return load(data_file).studies
+
+    results = {
+        'model_memory': get_bytes_per_sample(load_studies),
+        'model_memory_large_assay': get_bytes_per_sample(lambda: [build_assay(rows)])
+    }
+    for name, bytes_per_sample in results.items():
+        print('{}: {:.0f} bytes per sample'.format(name, bytes_per_sample))
+    return results
+
+
+def profile_model(filename=None, output_path=None):
+    profile_hashing(filename, output_path)
+    measure_memory(filename)
@@ -1,4 +1,5 @@
 from isatools import isajson
+from isatools.isajson.load import _JSONReader
 from isatools.model import (
     Investigation, Study, Comment, OntologySource, OntologyAnnotation, Person, Publication, Source, Characteristic,
     Sample, batch_create_materials, Protocol, Process, StudyFactor, Assay, Material, DataFile, plink,
@@ -8,6 +9,8 @@ from isatools.tests import utils
 import unittest
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
 
 
 def setUpModule():
@@ -420,6 +423,72 @@ class TestIsaJson(unittest.TestCase):
             self.assertEqual(len(assay_gx['dataFiles']), 29)  # 29 data files  in a_matteo-assay-Gx.txt
             self.assertEqual(len(assay_gx['processSequence']), 116)  # 116 processes in in a_matteo-assay-Gx.txt
 
+    @staticmethod
+    def describe_investigation(investigation):
+        def get_io_name(io):
+            return getattr(io, 'name', None) or getattr(io, 'filename', None)
+
+        description = [investigation.identifier, investigation.title, [x.last_name for x in investigation.contacts],
+                       [x.name for x in investigation.ontology_source_references]]
+        for isa_object in [x for study in investigation.studies for x in [study] + study.assays]:
+            positions = {id(process): i for i, process in enumerate(isa_object.process_sequence)}
+            description.append([(process.executes_protocol.name,
+                                 [get_io_name(x) for x in process.inputs],
+                                 [get_io_name(x) for x in process.outputs],
+                                 positions.get(id(process.prev_process), process.prev_process),
+                                 positions.get(id(process.next_process), process.next_process))
+                                for process in isa_object.process_sequence])
+            description.append([(x.name, [(c.category.term, c.value.term if isinstance(c.value, OntologyAnnotation)
+                                           else c.value) for c in x.characteristics])
+                                for x in isa_object.samples])
+        return description
+
+    def test_json_load_in_threads(self):
+        file_names = ['BII-S-3.json', 'BII-S-3-2.json', 'BII-S-3-with@id.json'] * 2
+
+        def load_and_describe(file_name):
+            with open(os.path.join(utils.JSON_DATA_DIR, 'BII-S-3', file_name)) as isajson_fp:
+                return self.describe_investigation(isajson.load(isajson_fp))
+
+        expected = [load_and_describe(file_name) for file_name in file_names]
+        with ThreadPoolExecutor(max_workers=len(file_names)) as executor:
+            self.assertEqual(list(executor.map(load_and_describe, file_names)), expected)
+
+    def test_json_load_incremental(self):
+        with open(os.path.join(utils.JSON_DATA_DIR, 'BII-S-3', 'BII-S-3.json')) as isajson_fp:
+            investigation_json = json.load(isajson_fp)
+        expected = self.describe_investigation(isajson.load(StringIO(json.dumps(investigation_json))))
+        keys = [x for x in investigation_json.keys() if x != 'studies']
+        orders = [keys + ['studies'],
+                  ['studies'] + keys,
+                  [x for x in keys if x != 'title'] + ['studies', 'title']]
+        for order in orders:
+            text = json.dumps({key: investigation_json[key] for key in order}, indent=2)
+            for isajson_fp in (StringIO(text), BytesIO(text.encode('utf-8'))):
+                investigation = isajson.load(isajson_fp, incremental=True)
+                self.assertEqual(self.describe_investigation(investigation), expected)
+
+    def test_json_reader(self):
+        text = '{"a": 12345, "b": [1, 2.5, {"c": "\u00e9t\u00e9"}, [], "d"], "e": {}, "f": [] }'
+        reader = _JSONReader(BytesIO(text.encode('utf-8')), chunk_size=3)
+        items = {}
+        for key in reader.iter_object_keys():
+            items[key] = list(reader.iter_array()) if key in ('b', 'f') else reader.value()
+        self.assertEqual(items, json.loads(text))
+
+    def test_json_dump_stream(self):
+        with open(os.path.join(utils.JSON_DATA_DIR, 'BII-S-3', 'BII-S-3.json')) as isajson_fp:
+            investigation = isajson.load(isajson_fp)
+        for options in ({}, {'indent': 4}, {'indent': '\t', 'sort_keys': True}, {'separators': (',', ':')}):
+            expected = json.dumps(investigation, cls=isajson.ISAJSONEncoder, **options)
+            for stream in (False, True):
+                isajson_fp = StringIO()
+                isajson.dump(investigation, isajson_fp, stream=stream, **options)
+                self.assertEqual(isajson_fp.getvalue(), expected)
+        isajson_fp = StringIO()
+        isajson.dump(Investigation(), isajson_fp, stream=True)
+        self.assertEqual(isajson_fp.getvalue(), json.dumps(Investigation(), cls=isajson.ISAJSONEncoder))
+
     def test_json_load_from_file_and_create_isa_objects(self):
         # reading from file
         with open(os.path.join(utils.JSON_DATA_DIR, 'ISA-1', 'isa-test1.json')) as isajson_fp:
@@ -7,6 +7,7 @@ import pandas as pd
 import shutil
 import tempfile
 from io import StringIO
+from networkx import algorithms
 
 from isatools import isatab
 from isatools.io import isatab_parser
@@ -19,6 +20,12 @@ from isatools.model import (
 from isatools.tests.utils import assert_tab_content_equal
 from isatools.tests import utils
 from isatools.isatab import IsaTabDataFrame
+from isatools.isatab import utils as isatab_utils
+from isatools.isatab.dump.write import _write_table
+from isatools.isatab.graph import (
+    _iter_end_to_end_paths, _all_end_to_end_paths, _longest_end_to_end_path, _longest_path_and_attrs
+)
+from isatools.model.utils import _build_assay_graph, _build_process_graph
 
 
 def setUpModule():
@@ -94,6 +101,49 @@ class TestIsaTabDump(unittest.TestCase):
         with self.assertRaises(NameError):
             isatab.dump(Investigation(), self._tmp_dir, i_file_name='investigation.txt')
 
+    def test_isatab_dump_with_workers(self):
+        with open(os.path.join(self._tab_data_dir, 'BII-I-1', 'i_investigation.txt')) as fp:
+            investigation = isatab.load(fp)
+        serial_dir = os.path.join(self._tmp_dir, 'serial')
+        concurrent_dir = os.path.join(self._tmp_dir, 'concurrent')
+        os.mkdir(serial_dir)
+        os.mkdir(concurrent_dir)
+        isatab.dump(investigation, serial_dir)
+        isatab.dump(investigation, concurrent_dir, workers=2)
+        file_names = sorted(os.listdir(serial_dir))
+        self.assertEqual(sorted(os.listdir(concurrent_dir)), file_names)
+        self.assertEqual(len(file_names), 7)
+        for file_name in file_names:
+            with open(os.path.join(serial_dir, file_name)) as serial_fp, \
+                    open(os.path.join(concurrent_dir, file_name)) as concurrent_fp:
+                self.assertEqual(concurrent_fp.read(), serial_fp.read())
+
+    def test_isatab_dump_to_sink(self):
+        with open(os.path.join(self._tab_data_dir, 'BII-I-1', 'i_investigation.txt')) as fp:
+            investigation = isatab.load(fp)
+        isatab.dump(investigation, self._tmp_dir)
+        file_names = sorted(os.listdir(self._tmp_dir))
+        buffers = {}
+        isatab.dump(investigation, buffers)
+        self.assertEqual(sorted(buffers.keys()), file_names)
+        concurrent_buffers = {}
+        isatab.dump(investigation, concurrent_buffers, workers=2)
+        self.assertEqual(sorted(concurrent_buffers.keys()), file_names)
+        for file_name in file_names:
+            with open(os.path.join(self._tmp_dir, file_name), encoding='utf-8') as fp:
+                contents = fp.read()
+            self.assertEqual(buffers[file_name].getvalue(), contents)
+            self.assertEqual(concurrent_buffers[file_name].getvalue(), contents)
+
+        dumps_out = isatab.dumps(investigation)
+        self.assertTrue(dumps_out.startswith('i_investigation.txt\n' + buffers['i_investigation.txt'].getvalue()))
+        self.assertIn('--------\na_proteome.txt\n' + buffers['a_proteome.txt'].getvalue(), dumps_out)
+
+        dataframes = isatab.dump_tables_to_dataframes(investigation)
+        self.assertEqual(sorted(dataframes.keys()), [x for x in file_names if not x.startswith('i_')])
+        for file_name, df in dataframes.items():
+            self.assertTrue(df.equals(isatab.read_tfile(os.path.join(self._tmp_dir, file_name), cache=False)))
+
     def test_isatab_dump_source_sample_split(self):
         i = Investigation()
         uberon = OntologySource(name='UBERON',
@@ -1090,6 +1140,54 @@ class TestIsaTabLoad(unittest.TestCase):
             self.assertEqual(len(assay_microarray.data_files), 15)  # 15 data files  in a_microarray.txt
             self.assertEqual(len(assay_microarray.process_sequence), 45)  # 45 processes in in a_microarray.txt
 
+    def test_isatab_load_bii_i_1_with_workers(self):
+        with open(os.path.join(self._tab_data_dir, 'BII-I-1', 'i_investigation.txt')) as fp:
+            ISA = isatab.load(fp)
+        with open(os.path.join(self._tab_data_dir, 'BII-I-1', 'i_investigation.txt')) as fp:
+            ISA_workers = isatab.load(fp, workers=2)
+
+        for study, study_workers in zip(ISA.studies, ISA_workers.studies):
+            for sample, sample_workers in zip(study.samples, study_workers.samples):
+                self.assertEqual(sample.name, sample_workers.name)
+                self.assertEqual(sample.characteristics, sample_workers.characteristics)
+                self.assertEqual(sample.comments, sample_workers.comments)
+                self.assertEqual(sample.derives_from, sample_workers.derives_from)
+                # factor values are kept in set order
+                self.assertSetEqual(set(sample.factor_values), set(sample_workers.factor_values))
+            self.assertListEqual([p.name for p in study.protocols], [p.name for p in study_workers.protocols])
+            for assay, assay_workers in zip(study.assays, study_workers.assays):
+                self.assertEqual(assay.filename, assay_workers.filename)
+                self.assertListEqual([x.name for x in assay.samples], [x.name for x in assay_workers.samples])
+                self.assertListEqual([(x.name, x.characteristics) for x in assay.other_material],
+                                     [(x.name, x.characteristics) for x in assay_workers.other_material])
+                self.assertListEqual([(x.filename, x.label) for x in assay.data_files],
+                                     [(x.filename, x.label) for x in assay_workers.data_files])
+                self.assertEqual(len(assay.process_sequence), len(assay_workers.process_sequence))
+                # assays reference the study objects, not copies of them
+                for sample in assay_workers.samples:
+                    self.assertTrue(any(sample is x for x in study_workers.samples))
+                for process in assay_workers.process_sequence:
+                    self.assertTrue(any(process.executes_protocol is x for x in study_workers.protocols))
+
+    def test_isatab_load_bii_i_1_lazy(self):
+        with open(os.path.join(self._tab_data_dir, 'BII-I-1', 'i_investigation.txt')) as fp:
+            ISA = isatab.load(fp, lazy=True)
+
+        self.assertListEqual([s.filename for s in ISA.studies], ['s_BII-S-1.txt', 's_BII-S-2.txt'])
+        self.assertFalse(any(s.table_loaded or any(a.table_loaded for a in s.assays) for s in ISA.studies))
+
+        study_bii_s_1 = ISA.studies[0]
+        assay_metabolome = [a for a in study_bii_s_1.assays if a.filename == 'a_metabolome.txt'][0]
+        self.assertEqual(len(assay_metabolome.process_sequence), 203)  # 203 processes in in a_metabolome.txt
+        self.assertEqual(len(assay_metabolome.data_files), 111)  # 111 data files  in a_metabolome.txt
+        self.assertTrue(study_bii_s_1.table_loaded)  # assay samples are looked up in the study
+        self.assertEqual(len(study_bii_s_1.samples), 164)  # 164 study samples in s_BII-S-1.txt
+        self.assertTrue(all(any(x is y for y in study_bii_s_1.samples) for x in assay_metabolome.samples))
+        self.assertListEqual([a.table_loaded for a in study_bii_s_1.assays], [False, True, False])
+        self.assertFalse(ISA.studies[1].table_loaded)
+
+        self.assertEqual(len(ISA.studies[1].assays[0].process_sequence), 45)  # 45 processes in in a_microarray.txt
+
     def test_isatab_load_bii_s_3(self):
         with open(os.path.join(self._tab_data_dir, 'BII-S-3', 'i_gilbert.txt')) as fp:
             ISA = isatab.load(fp)
@@ -1842,6 +1940,340 @@ sample1\textraction\te2\tscanning\td2"""
                             in context.exception)
 
 
+class TestColumnarProcessSequenceFactory(unittest.TestCase):
+    """Checks the column-oriented engine of the ProcessSequenceFactory builds
+    the same objects as the row-oriented one"""
+
+    def setUp(self):
+        self._tab_data_dir = utils.TAB_DATA_DIR
+
+    @staticmethod
+    def _describe(result):
+        def value(v):
+            if isinstance(v, OntologyAnnotation):
+                return v.term, v.term_accession, getattr(v.term_source, 'name', v.term_source)
+            return v
+
+        def node(n):
+            description = [type(n).__name__, getattr(n, 'name', None), getattr(n, 'filename', None)]
+            description += [(c.category.term, value(c.value), value(c.unit)) for c in getattr(n, 'characteristics', [])]
+            description += [(c.name, c.value) for c in n.comments]
+            description += sorted(str((fv.factor_name.name, value(fv.value), value(fv.unit)))
+                                  for fv in getattr(n, 'factor_values', []))
+            description += [x.name for x in getattr(n, 'derives_from', [])]
+            description += [x.name for x in getattr(n, 'generated_from', [])]
+            return description
+
+        sources, samples, other_material, data, processes, characteristic_categories, unit_categories = result
+        process_keys = {id(p): k for k, p in processes.items()}
+        return {
+            'nodes': [(k, node(n)) for nodes in (sources, samples, other_material, data) for k, n in nodes.items()],
+            'processes': [
+                (k, p.name, p.executes_protocol, [node(n) for n in p.inputs], [node(n) for n in p.outputs],
+                 [(pv.category.parameter_name.term, value(pv.value), value(pv.unit)) for pv in p.parameter_values],
+                 [(c.name, c.value) for c in p.comments],
+                 process_keys.get(id(p.prev_process)), process_keys.get(id(p.next_process)))
+                for k, p in processes.items()
+            ],
+            'characteristic_categories': list(characteristic_categories.keys()),
+            'unit_categories': [(k, value(u)) for k, u in unit_categories.items()]
+        }
+
+    def _assert_engines_equal(self, table_factory, factory_kwargs):
+        results = [ProcessSequenceFactory(**factory_kwargs()).create_from_df(table_factory(), columnar=columnar)
+                   for columnar in (False, True)]
+        self.assertEqual(self._describe(results[0]), self._describe(results[1]))
+
+    def test_sample_protocol_ref_split_extract_protocol_ref_data(self):
+        table_to_load = """Sample Name\tProtocol REF\tParameter Value[kit]\tExtract Name\tProtocol REF\tAssay Name\t""" \
+                        """Raw Data File\tComment[run]\tFactor Value[dose]\tUnit\tTerm Source REF\tTerm Accession Number
+sample1\textraction\tk1\te1\tscanning\tscan1\td1\tr1\t10\tmg\tUO\tUO_1
+sample1\textraction\tk1\te2\tscanning\tscan2\td2\tr2\t10\tmg\tUO\tUO_1
+sample2\textraction\tk2\te3\tscanning\tscan2\td3\tr3\t20\tmg\tUO\tUO_1"""
+
+        def factory_kwargs():
+            extraction = Protocol(name="extraction",
+                                  parameters=[ProtocolParameter(parameter_name=OntologyAnnotation(term='kit'))])
+            return dict(study_samples=[Sample(name="sample1"), Sample(name="sample2")],
+                        study_protocols=[extraction, Protocol(name="scanning")],
+                        study_factors=[StudyFactor(name='dose')])
+
+        self._assert_engines_equal(
+            lambda: IsaTabDataFrame(pd.read_csv(StringIO(table_to_load), sep='\t', dtype=str).fillna('')),
+            factory_kwargs)
+
+    def test_bii_i_1_tables(self):
+        with open(os.path.join(self._tab_data_dir, 'BII-I-1', 'i_investigation.txt')) as fp:
+            investigation = isatab.load(fp, skip_load_tables=True)
+        for study in investigation.studies:
+            study_table = os.path.join(self._tab_data_dir, 'BII-I-1', study.filename)
+            self._assert_engines_equal(
+                lambda: isatab.read_tfile(study_table),
+                lambda: dict(ontology_sources=investigation.ontology_source_references,
+                             study_protocols=study.protocols, study_factors=study.factors))
+            samples = ProcessSequenceFactory(
+                ontology_sources=investigation.ontology_source_references, study_protocols=study.protocols,
+                study_factors=study.factors).create_from_df(isatab.read_tfile(study_table))[1]
+            for assay in study.assays:
+                assay_table = os.path.join(self._tab_data_dir, 'BII-I-1', assay.filename)
+                self._assert_engines_equal(
+                    lambda: isatab.read_tfile(assay_table),
+                    lambda: dict(ontology_sources=investigation.ontology_source_references,
+                                 study_samples=list(samples.values()), study_protocols=study.protocols,
+                                 study_factors=study.factors))
+
+
+class TestProcessKeyIndex(unittest.TestCase):
+
+    def setUp(self):
+        table_to_load = """Sample Name\tProtocol REF\tParameter Value[kit]\tExtract Name\tProtocol REF\tAssay Name
+sample1\textraction\tk1\te1\tscanning\tscan1
+sample1\textraction\tk1\te2\tscanning\tscan2
+sample2\textraction\tk2\te3\tscanning\tscan2"""
+        self.DF = IsaTabDataFrame(pd.read_csv(StringIO(table_to_load), sep='\t', dtype=str).fillna(''))
+
+    def test_keys_from_input_node_and_parameter_values(self):
+        column_group = list(self.DF.columns[1:3])
+        index = isatab_utils.ProcessKeyIndex(self.DF)
+        self.assertEqual(index.keys(column_group, 1),
+                         ['sample1:extraction:k1', 'sample1:extraction:k1', 'sample2:extraction:k2'])
+        for row_index, series in self.DF.iterrows():
+            self.assertEqual(index.get(column_group, 1, row_index), index.keys(column_group, 1)[row_index])
+            self.assertEqual(isatab_utils.process_keygen('extraction', column_group, 1, self.DF.columns,
+                                                         series, row_index, self.DF),
+                             index.keys(column_group, 1)[row_index])
+
+    def test_keys_from_name_column(self):
+        column_group = list(self.DF.columns[4:6])
+        index = isatab_utils.ProcessKeyIndex(self.DF)
+        self.assertEqual(index.keys(column_group, 3), ['scan1', 'scan2', 'scan2'])
+        self.assertEqual(index.key_columns(column_group, 3), ('Assay Name', None, [], None, None))
+
+
+class TestEndToEndPaths(unittest.TestCase):
+
+    def setUp(self):
+        sources = [Source(name='source{}'.format(i)) for i in range(3)]
+        samples = [Sample(name='sample{}'.format(i)) for i in range(6)]
+        extracts = [Material(name='extract{}'.format(i), type_='Extract Name') for i in range(4)]
+        self.study_processes = [Process(inputs=[sources[i % 3], sources[(i + 1) % 3]], outputs=[sample])
+                                for i, sample in enumerate(samples)]
+        self.assay_processes = [Process(inputs=samples[i:i + 3], outputs=[extract])
+                                for i, extract in enumerate(extracts)]
+        self.assay_processes += [Process(name='scan{}'.format(i), inputs=[extracts[i], extracts[-1]])
+                                 for i in range(len(extracts) - 1)]
+
+    @staticmethod
+    def networkx_paths(G, start_nodes, end_type):
+        paths = []
+        for start in start_nodes:
+            ends = [x for x in algorithms.descendants(G, start) if isinstance(G.indexes[x], end_type) and (
+                G.indexes[x].next_process is None if end_type is Process else len(G.out_edges(x)) == 0)]
+            for end in ends:
+                paths += list(algorithms.all_simple_paths(G, start, end))
+        return paths
+
+    def test_paths_as_networkx(self):
+        for process_sequence, start_type, end_type in ((self.study_processes, Source, Sample),
+                                                       (self.assay_processes, Sample, Process)):
+            nx_graph = _build_assay_graph(process_sequence)
+            start_nodes = [x for x in nx_graph.nodes() if isinstance(nx_graph.indexes[x], start_type)]
+            expected_paths = self.networkx_paths(nx_graph, start_nodes, end_type)
+            expected_longest = _longest_path_and_attrs(expected_paths, nx_graph.indexes)
+            self.assertGreater(len(expected_paths), len(start_nodes))
+            for graph in (nx_graph, _build_process_graph(process_sequence)):
+                paths = _iter_end_to_end_paths(graph, start_nodes)
+                self.assertNotIsInstance(paths, list)
+                self.assertEqual(list(paths), expected_paths)
+                self.assertEqual(_all_end_to_end_paths(graph, start_nodes), expected_paths)
+                self.assertEqual(_longest_end_to_end_path(graph, start_nodes), expected_longest)
+
+    def test_no_paths(self):
+        graph = _build_process_graph(self.assay_processes)
+        self.assertEqual(list(_iter_end_to_end_paths(graph, [])), [])
+        self.assertIsNone(_longest_end_to_end_path(graph, []))
+
+
+class TestWriteTable(unittest.TestCase):
+
+    def setUp(self):
+        self.columns = ['Source Name', 'Empty', 'Integer', 'Mixed', 'Integer or None', 'Text', 'Comment']
+        self.rows = [
+            ['source1', '', 1, 1, 1, 'a', None],
+            ['source1', '', 2, 2.5, None, 'b', ''],
+            ['source1', '', 1, 1, 1, 'a', None],
+            ['source2', None, 3, 3, 3, 4, 'note'],
+            ['source2', '', 4, 1e16, 4, '', ''],
+        ]
+
+    def test_write_table(self):
+        out_fp = StringIO()
+        num_rows = _write_table(out_fp, self.columns, lambda: iter(self.rows))
+        self.assertEqual(num_rows, 4)
+        self.assertEqual(out_fp.getvalue(), '\n'.join([
+            'Source Name\tInteger\tMixed\tInteger or None\tText\tComment',
+            'source1\t1\t1.0\t1.0\ta\t',
+            'source1\t2\t2.5\t\tb\t',
+            'source2\t3\t3.0\t3.0\t4\tnote',
+            'source2\t4\t1e+16\t4.0\t\t',
+            ''
+        ]))
+
+    def test_same_as_dataframe(self):
+        df = pd.DataFrame.from_dict(dict(zip(self.columns, zip(*self.rows))))
+        df = df.drop_duplicates().replace('', float('nan')).dropna(axis=1, how='all')
+        expected = StringIO()
+        df.to_csv(path_or_buf=expected, index=False, sep='\t', lineterminator='\n')
+        out_fp = StringIO()
+        _write_table(out_fp, self.columns, lambda: iter(self.rows))
+        self.assertEqual(out_fp.getvalue(), expected.getvalue())
+
+
+class TestReadInvestigationFile(unittest.TestCase):
+
+    def setUp(self):
+        self.investigation_file = """ONTOLOGY SOURCE REFERENCE
+Term Source Name\tOBI\t\tNCBITAXON
+Term Source Version\t2\t\tNA
+INVESTIGATION
+Investigation Identifier\tI1
+# a comment line
+INVESTIGATION PUBLICATIONS
+Investigation PubMed ID\t
+INVESTIGATION CONTACTS
+Investigation Person Last Name\tA\tB
+STUDY
+Study Identifier\tS1
+Study Description\t"first line
+second line"
+STUDY DESIGN DESCRIPTORS
+Study Design Type\tintervention design
+STUDY PUBLICATIONS
+Study PubMed ID\t123
+STUDY FACTORS
+Study Factor Name\tdose
+STUDY ASSAYS
+Study Assay File Name\ta_1.txt\ta_2.txt
+STUDY PROTOCOLS
+Study Protocol Name\textraction
+STUDY CONTACTS
+Study Person Last Name\tC
+STUDY
+Study Identifier\tS2
+STUDY DESIGN DESCRIPTORS
+STUDY PUBLICATIONS
+STUDY FACTORS
+STUDY ASSAYS
+STUDY PROTOCOLS
+STUDY CONTACTS
+"""
+
+    def test_read_investigation_file(self):
+        df_dict = isatab.read_investigation_file(StringIO(self.investigation_file))
+        self.assertListEqual(list(df_dict['ontology_sources'].columns), [0, 'Term Source Name', 'Term Source Version'])
+        # empty columns are dropped, NA values read as empty
+        self.assertListEqual(df_dict['ontology_sources'].values.tolist(), [[1, 'OBI', '2'], [3, 'NCBITAXON', '']])
+        self.assertEqual(df_dict['investigation'].iloc[0]['Investigation Identifier'], 'I1')
+        self.assertTrue(df_dict['i_publications'].empty)
+        self.assertListEqual(df_dict['i_contacts']['Investigation Person Last Name'].tolist(), ['A', 'B'])
+
+        self.assertEqual(len(df_dict['studies']), 2)
+        self.assertEqual(df_dict['studies'][0].iloc[0]['Study Description'], 'first line\nsecond line')
+        self.assertEqual(df_dict['s_publications'][0].iloc[0]['Study PubMed ID'], '123')
+        self.assertListEqual(df_dict['s_assays'][0]['Study Assay File Name'].tolist(), ['a_1.txt', 'a_2.txt'])
+        self.assertEqual(df_dict['studies'][1].iloc[0]['Study Identifier'], 'S2')
+        self.assertTrue(df_dict['s_assays'][1].empty)
+
+    def test_read_investigation_file_missing_section(self):
+        investigation_file = self.investigation_file.replace('INVESTIGATION PUBLICATIONS\n', '')
+        with self.assertRaises(IOError) as context:
+            isatab.read_investigation_file(StringIO(investigation_file))
+        self.assertEqual(str(context.exception),
+                         'Expected: INVESTIGATION PUBLICATIONS section, but got: end of file')
+
+        with self.assertRaises(IOError) as context:
+            isatab.read_investigation_file(StringIO('INVESTIGATION\n'))
+        self.assertEqual(str(context.exception),
+                         'Expected: ONTOLOGY SOURCE REFERENCE section, but got: INVESTIGATION')
+
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class TestTableCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.table_path = os.path.join(self.tmp_dir, 's_table.txt')
+        self.write_table('Source Name\tCharacteristics [organism]\tTerm Source REF\tSample Name\n'
+                         '# a comment line\n'
+                         'source1\tHomo sapiens\tNCBITAXON\tsample1\n'
+                         'source2\t\t\tsample2\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_table(self, content):
+        with open(self.table_path, 'w') as fp:
+            fp.write(content)
+
+    def test_key(self):
+        cache = isatab.TableCache(self.cache_dir)
+        key = cache.key(self.table_path, 'read_tfile')
+        self.assertEqual(key, cache.key(self.table_path, 'read_tfile'))
+        self.assertNotEqual(key, cache.key(self.table_path, 'load_table'))
+        hashed_key = isatab.TableCache(self.cache_dir, hash_content=True).key(self.table_path, 'read_tfile')
+        self.assertNotEqual(key, hashed_key)
+        self.write_table('Source Name\n')
+        self.assertNotEqual(key, cache.key(self.table_path, 'read_tfile'))
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_read_tfile_cache(self):
+        df = isatab.read_tfile(self.table_path)
+        self.assertTrue(df.equals(isatab.read_tfile(self.table_path, cache=self.cache_dir)))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        cache = isatab.TableCache(self.cache_dir)
+        cached_df, isatab_header = cache.get(cache.key(self.table_path, 'read_tfile:None'))
+        self.assertTrue(df.equals(cached_df))
+        self.assertListEqual(isatab_header, df.isatab_header)
+
+        cached_df = isatab.read_tfile(self.table_path, cache=cache)
+        self.assertIsInstance(cached_df, IsaTabDataFrame)
+        self.assertTrue(df.equals(cached_df))
+        self.assertListEqual(cached_df.isatab_header, df.isatab_header)
+        self.assertTrue(isatab.read_tfile(self.table_path, index_col=0).equals(
+            isatab.read_tfile(self.table_path, index_col=0, cache=cache)))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+        self.write_table('Source Name\tSample Name\nsource3\tsample3\n')
+        self.assertListEqual(isatab.read_tfile(self.table_path, cache=cache)['Source Name'].tolist(), ['source3'])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_load_table_cache(self):
+        isatab.set_table_cache(self.cache_dir)
+        try:
+            with open(self.table_path) as fp:
+                df = isatab.load_table(fp, cache=False)
+            self.assertFalse(os.path.exists(self.cache_dir))
+            with open(self.table_path) as fp:
+                isatab.load_table(fp)
+            with open(self.table_path) as fp:
+                cached_df = isatab.load_table(fp)
+        finally:
+            isatab.set_table_cache(None)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertListEqual(list(cached_df.columns), list(df.columns))
+        self.assertTrue(df.equals(cached_df))
+        # tables read from buffers are never cached
+        self.assertTrue(df.equals(isatab.load_table(StringIO(open(self.table_path).read()), cache=self.cache_dir)))
+
+
 class TestTransposedTabParser(unittest.TestCase):
 
     def setUp(self):
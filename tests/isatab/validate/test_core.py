@@ -1,11 +1,16 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from os import path
+from types import SimpleNamespace
+
+from pandas import DataFrame
 
 from isatools.tests import utils
 from isatools.isatab import validate
 from isatools.isatab.validate.rules.core import Rule, Rules
 from isatools.isatab.validate.rules.defaults import INVESTIGATION_RULES_MAPPING
-from isatools.isatab.validate.store import validator as message_handler
+from isatools.isatab.validate.rules.rules_40xx import check_field_values, check_required_fields
+from isatools.isatab.validate.store import validator as message_handler, TableRegistry, ValidationContext
 
 
 class TestValidators(unittest.TestCase):
@@ -91,3 +96,94 @@ class TestValidators(unittest.TestCase):
     def test_store(self):
         message_handler.reset_store()
         self.assertEqual(str(message_handler), "{'errors': [], 'warnings': [], 'info': []}")
+
+    def test_table_registry(self):
+        data_path = path.join(path.dirname(path.abspath(__file__)), '..', '..', 'data', 'tab', 'BII-S-3')
+        tables = TableRegistry(data_path)
+        study_table = tables.get_table('s_BII-S-3.txt')
+        self.assertEqual(study_table.filename, 's_BII-S-3.txt')
+        self.assertIn('Sample Name', study_table.columns)
+        self.assertIs(tables.get_table('s_BII-S-3.txt'), study_table)
+        with self.assertRaises(FileNotFoundError):
+            tables.get_table('a_missing.txt')
+        self.assertListEqual(list(tables.tables.keys()), ['s_BII-S-3.txt'])
+
+
+class TestCheckFieldValues(unittest.TestCase):
+
+    def setUp(self):
+        fields = [
+            SimpleNamespace(header='Sample Name', data_type='String', is_required=True, list_values=None),
+            SimpleNamespace(header='Parameter Value[count]', data_type='integer', is_required=False, list_values=None),
+            SimpleNamespace(header='Comment[status]', data_type='list', is_required=False, list_values='Done,Todo'),
+            SimpleNamespace(header='Date', data_type='date', is_required=True, list_values=None)
+        ]
+        isatab_configuration = SimpleNamespace(get_field=lambda: fields)
+        self.cfg = SimpleNamespace(get_isatab_configuration=lambda: [isatab_configuration])
+        message_handler.reset_store()
+
+    def tearDown(self):
+        message_handler.reset_store()
+
+    def get_table(self, rows):
+        table = DataFrame(rows, columns=['Sample Name', 'Parameter Value[count]', 'Comment[status]'])
+        table.filename = 's_test.txt'
+        return table
+
+    def test_check_field_values(self):
+        table = self.get_table([['s1', '1', 'done'], [' ', ' 2 ', ''], ['s3', '', 'TODO']])
+        self.assertTrue(check_field_values(table, self.cfg))
+        self.assertEqual(message_handler.warnings, [{
+            'message': 'A required cell value is missing',
+            'supplemental': "Missing value for the required field 'Sample Name' in the file 's_test.txt'",
+            'code': 4012
+        }])
+
+    def test_check_field_values_stops_at_first_invalid_value(self):
+        table = self.get_table([['', '1', 'done'], ['s2', 'two', 'never'], ['', 'three', 'no']])
+        self.assertFalse(check_field_values(table, self.cfg))
+        self.assertEqual([warning['code'] for warning in message_handler.warnings], [4012, 4011])
+        self.assertEqual(message_handler.warnings[1]['supplemental'],
+                         "Invalid value 'two' for type 'integer' of the field 'Parameter Value[count]'")
+
+    def test_check_required_fields(self):
+        table = self.get_table([['s1', '1', 'done']])
+        check_required_fields(table, self.cfg)
+        self.assertEqual(message_handler.warnings, [{
+            'message': 'A required column in assay table is not present',
+            'supplemental': "Required field 'Date' not found in the file 's_test.txt'",
+            'code': 4010
+        }])
+
+
+class TestValidationContext(unittest.TestCase):
+
+    def setUp(self):
+        message_handler.reset_store()
+
+    def test_validation_context(self):
+        with ValidationContext() as context:
+            message_handler.add_warning(code=4007, message='In context')
+            with ValidationContext() as inner_context:
+                message_handler.add_error(code=0, message='In inner context')
+            self.assertIs(message_handler.errors, context.errors)
+        message_handler.add_info(code=5001, message='Outside')
+        self.assertEqual(context.warnings, [{'message': 'In context', 'supplemental': '', 'code': 4007}])
+        self.assertEqual(context.errors, [])
+        self.assertEqual(inner_context.errors, [{'message': 'In inner context', 'supplemental': '', 'code': 0}])
+        self.assertEqual(message_handler.info, [{'message': 'Outside', 'supplemental': '', 'code': 5001}])
+
+    def test_concurrent_validations(self):
+        data_path = path.join(path.dirname(path.abspath(__file__)), '..', '..', 'data', 'tab')
+        i_files = [path.join(data_path, 'BII-S-3', 'i_gilbert.txt'),
+                   path.join(data_path, 'BII-I-1', 'i_investigation.txt')]
+
+        def validate_file(i_file):
+            with open(i_file, 'r') as data_file:
+                return validate(fp=data_file)
+
+        reports = [validate_file(i_file) for i_file in i_files]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent_reports = list(executor.map(validate_file, i_files * 2))
+        self.assertEqual(concurrent_reports, reports * 2)
+        self.assertEqual(str(message_handler), "{'errors': [], 'warnings': [], 'info': []}")
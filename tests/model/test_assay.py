@@ -88,7 +88,7 @@ class TestAssay(TestCase):
                         "other_material=[], characteristic_categories=[], "
                         "comments=[], units=[])")
         self.assertEqual(expected_str, repr(self.assay))
-        self.assertEqual(hash(expected_str), hash(self.assay))
+        self.assertEqual(hash(self.assay.filename), hash(self.assay))
 
     def test_str(self):
         self.assertEqual("""Assay(
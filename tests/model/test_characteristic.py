@@ -51,7 +51,7 @@ class TestCharacteristic(TestCase):
                         "term_source=None, term_accession='', comments=[]), "
                         "value='test_value', unit='test_unit', comments=[])")
         self.assertEqual(self.characteristic.__repr__(), expected_str)
-        self.assertTrue(hash(self.characteristic) == hash(expected_str))
+        self.assertTrue(hash(self.characteristic) == hash((self.characteristic.category, self.characteristic.value)))
 
     def test_repr(self):
         expected_str = ("Characteristic(\n\t"
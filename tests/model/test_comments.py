@@ -26,7 +26,7 @@ class TestComment(unittest.TestCase):
         expected_str = "Comment(\n\tname=test_name\n\tvalue=test_value)"
         self.assertTrue(self.comment.__str__() == expected_str)
 
-        expected_hash = hash(expected_repr)
+        expected_hash = hash(('test_name', 'test_value'))
         self.assertTrue(self.comment.__hash__() == expected_hash)
 
         new_comment = Comment(name='test_name2', value='test_value2')
@@ -76,6 +76,14 @@ class TestCommentable(unittest.TestCase):
         commentable = Commentable()
         self.assertTrue(commentable.comments == [])
 
+    def test_comments_created_when_read(self):
+        commentable = Commentable()
+        commentable.comments.append(self.comment)
+        self.assertEqual(commentable.comments, [self.comment])
+        commentable.comments = []
+        commentable.add_comment(name='test_name2', value_='test_value2')
+        self.assertEqual(commentable.get_comment_names(), ['test_name2'])
+
     def test_properties(self):
         self.assertTrue(self.commentable.comments == [self.comment])
 
@@ -51,7 +51,7 @@ class TestDataFile(TestCase):
     def test_repr(self):
         expected_str = "isatools.model.DataFile(filename='', label='', generated_from=[], comments=[])"
         self.assertEqual(repr(self.datafile), expected_str)
-        self.assertEqual(hash(self.datafile), hash(expected_str))
+        self.assertEqual(hash(self.datafile), hash(self.datafile.filename))
 
     def test_str(self):
         expected_str = ("DataFile(\n\t"
@@ -119,7 +119,7 @@ class TestSubDataFile(TestCase):
             expected_repr = "isatools.model.{0}(filename='{1}', generated_from=[], comments=[])"\
                 .format(filetype, filename)
             self.assertEqual(repr(datafile), expected_repr)
-            self.assertEqual(hash(datafile), hash(expected_repr))
+            self.assertEqual(hash(datafile), hash(filename))
 
     def test_str(self):
         for filetype in self.types:
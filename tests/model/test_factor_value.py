@@ -42,7 +42,7 @@ class TestStudyFactor(TestCase):
         expected_repr = ("isatools.model.StudyFactor(name='', factor_type=isatools.model.OntologyAnnotation(term='', "
                          "term_source=None, term_accession='', comments=[]), comments=[])")
         self.assertTrue(repr(self.study_factor) == expected_repr)
-        self.assertTrue(hash(self.study_factor) == hash(expected_repr))
+        self.assertTrue(hash(self.study_factor) == hash(self.study_factor.name))
 
     def test_str(self):
         expected_str = ("StudyFactor(\n\t"
@@ -120,7 +120,7 @@ class TestFactorValue(TestCase):
         expected_str = "isatools.model.FactorValue(factor_name={0}, value=12, unit={1})".format(factor_name_str,
                                                                                                 unit_str)
         self.assertEqual(repr(self.factor_value), expected_str)
-        self.assertEqual(hash(self.factor_value), hash(expected_str))
+        self.assertEqual(hash(self.factor_value), hash((self.factor_value.factor_name, self.factor_value.value)))
 
     def test_str(self):
         expected_str = ("FactorValue(\n\t"
@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from networkx import DiGraph, algorithms
+
+from isatools.model.datafile import DataFile
+from isatools.model.graph import ProcessGraph, SOURCE, SAMPLE, MATERIAL, PROCESS
+from isatools.model.material import Material
+from isatools.model.process import Process
+from isatools.model.sample import Sample
+from isatools.model.source import Source
+from isatools.model.utils import _build_assay_graph, _build_process_graph, plink
+
+
+class TestProcessGraph(TestCase):
+
+    def setUp(self):
+        sources = [Source(name='source1'), Source(name='source2')]
+        samples = [Sample(name='sample1'), Sample(name='sample2')]
+        extract = Material(name='extract1', type_='Extract Name')
+        collection = Process(name='collection', inputs=sources, outputs=samples)
+        extraction = Process(name='extraction', inputs=samples, outputs=[extract])
+        labeling = Process(name='labeling', inputs=[extract])
+        scan = Process(name='scan', outputs=[DataFile(filename='d1.txt')])
+        plink(labeling, scan)
+        self.process_sequence = [collection, extraction, labeling, scan]
+        self.sources = sources
+        self.scan = scan
+
+    def test_empty_process_sequence(self):
+        graph = _build_process_graph()
+        self.assertEqual(len(graph), 0)
+        self.assertEqual(graph.nodes(), [])
+        self.assertEqual(graph.edges(), [])
+
+    def test_same_as_networkx(self):
+        nx_graph = _build_assay_graph(self.process_sequence)
+        graph = _build_process_graph(self.process_sequence)
+        self.assertEqual(graph.nodes(), list(nx_graph.nodes()))
+        self.assertEqual(graph.edges(), list(nx_graph.edges()))
+        self.assertEqual(graph.indexes, nx_graph.indexes)
+        for node_id in graph.nodes():
+            self.assertEqual(graph.in_edges(node_id), list(nx_graph.in_edges(node_id)))
+            self.assertEqual(graph.out_edges(node_id), list(nx_graph.out_edges(node_id)))
+            self.assertEqual(graph.in_degree(node_id), nx_graph.in_degree(node_id))
+            self.assertEqual(list(graph.descendants(node_id)), list(algorithms.descendants(nx_graph, node_id)))
+
+        start = self.sources[0].sequence_identifier
+        end = self.scan.sequence_identifier
+        self.assertEqual(list(graph.all_simple_paths(start, end)),
+                         list(algorithms.all_simple_paths(nx_graph, start, end)))
+        self.assertEqual(len(list(graph.all_simple_paths(start, end))), 2)
+        self.assertEqual(list(graph.all_simple_paths(start, start)), [])
+
+    def test_node_types(self):
+        graph = _build_process_graph(self.process_sequence)
+        types = [graph.node_type(node_id) for node_id in graph.nodes()]
+        self.assertEqual(types.count(SOURCE), 2)
+        self.assertEqual(types.count(SAMPLE), 2)
+        self.assertEqual(types.count(MATERIAL), 1)
+        self.assertEqual(types.count(PROCESS), 4)
+
+    def test_topological_order(self):
+        graph = _build_process_graph(self.process_sequence)
+        order = graph.topological_order()
+        self.assertEqual(sorted(order), sorted(graph.nodes()))
+        positions = {node_id: i for i, node_id in enumerate(order)}
+        for source, target in graph.edges():
+            self.assertLess(positions[source], positions[target])
+
+        with self.assertRaises(ValueError):
+            ProcessGraph([(1, 2), (2, 1)], {1: None, 2: None}).topological_order()
+
+    def test_to_networkx(self):
+        graph = _build_process_graph(self.process_sequence).to_networkx()
+        nx_graph = _build_assay_graph(self.process_sequence)
+        self.assertIsInstance(graph, DiGraph)
+        self.assertEqual(list(graph.nodes()), list(nx_graph.nodes()))
+        self.assertEqual(list(graph.edges()), list(nx_graph.edges()))
+        self.assertEqual(graph.indexes, nx_graph.indexes)
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
 from unittest import TestCase
 
-from isatools.model.loader_indexes import loader_states as indexes, new_store
+from isatools.model.loader_indexes import loader_states as indexes, new_store, get_store, use_store
 from isatools.model.sample import Sample
 from isatools.model.process import Process
 
@@ -89,3 +91,33 @@ class TestLoaderIndexes(TestCase):
         self.assertEqual(process, indexes.get_process('myprocess'))
         indexes.reset_process()
         self.assertEqual(indexes.processes, {})
+
+    def test_use_store(self):
+        store = new_store()
+        sample = Sample(id_='context_sample')
+        with use_store(store) as current_store:
+            self.assertIs(current_store, store)
+            self.assertIs(get_store(), store)
+            indexes.add_sample(sample)
+            indexes.processes = {'myprocess': None}
+        self.assertIs(store.get_sample('context_sample'), sample)
+        self.assertEqual(store.processes, {'myprocess': None})
+        self.assertNotIn('context_sample', indexes.samples)
+        self.assertNotIn('myprocess', indexes.processes)
+
+        with use_store() as new_current_store:
+            self.assertIsNot(new_current_store, store)
+            self.assertEqual(indexes.samples, {})
+
+    def test_store_per_thread(self):
+        barrier = Barrier(2)
+
+        def add_process(id_):
+            with use_store():
+                indexes.add_process(Process(id_=id_))
+                barrier.wait(timeout=10)
+                return list(indexes.processes.keys())
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            process_ids = list(executor.map(add_process, ['process1', 'process2']))
+        self.assertEqual(process_ids, [['process1'], ['process2']])
@@ -80,7 +80,7 @@ class TestExtract(TestCase):
     def test_repr(self):
         expected_str = "isatools.model.Extract(name='', type='Extract Name', characteristics=[], comments=[])"
         self.assertTrue(repr(self.extract) == expected_str)
-        self.assertEqual(hash(self.extract), hash(expected_str))
+        self.assertEqual(hash(self.extract), hash(self.extract.name))
 
     def test_str(self):
         expected_str = ("Extract(\n\t"
@@ -120,7 +120,7 @@ class TestLabeledExtract(TestCase):
         expected_str = ("isatools.model.LabeledExtract(name='', type='Labeled Extract Name', "
                         "characteristics=[], comments=[])")
         self.assertTrue(repr(self.labeled_extract) == expected_str)
-        self.assertEqual(hash(self.labeled_extract), hash(expected_str))
+        self.assertEqual(hash(self.labeled_extract), hash(self.labeled_extract.name))
 
     def test_str(self):
         expected_str = ("LabeledExtract(\n\t"
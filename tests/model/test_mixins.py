@@ -12,6 +12,8 @@ from isatools.model.sample import Sample
 from isatools.model.material import Material
 from isatools.model.ontology_annotation import OntologyAnnotation
 from isatools.model.process import Process
+from isatools.model.graph import ProcessGraph
+from isatools.model.utils import plink
 from isatools.model.characteristic import Characteristic
 from isatools.model.factor_value import FactorValue
 
@@ -312,13 +314,87 @@ class TestStudyAssayMixin(TestCase):
 
     def test_graph(self):
         self.assertIsNone(self.study_assay_mixin.graph)
+        self.assertIsNone(self.study_assay_mixin.process_graph)
         self.study_assay_mixin.process_sequence = [Process(name='Test process')]
         self.assertIsInstance(self.study_assay_mixin.graph, DiGraph)
+        self.assertIsInstance(self.study_assay_mixin.process_graph, ProcessGraph)
 
         with self.assertRaises(AttributeError) as context:
             self.study_assay_mixin.graph = 1
         self.assertEqual(str(context.exception), "StudyAssayMixin.graph is not settable")
 
+    def test_graph_cache(self):
+        source = Source(name='source')
+        sample = Sample(name='sample')
+        collection = Process(name='collection', inputs=[source], outputs=[sample])
+        self.study_assay_mixin.process_sequence = [collection]
+        graph = self.study_assay_mixin.graph
+        version = self.study_assay_mixin.graph_version
+        self.assertIs(self.study_assay_mixin.graph, graph)
+        self.assertEqual(self.study_assay_mixin.graph_version, version)
+
+        extraction = Process(name='extraction', inputs=[sample])
+        self.study_assay_mixin.process_sequence.append(extraction)
+        self.assertGreater(self.study_assay_mixin.graph_version, version)
+        self.assertIsNot(self.study_assay_mixin.graph, graph)
+        self.assertEqual(len(self.study_assay_mixin.graph.nodes), 4)
+
+        version = self.study_assay_mixin.graph_version
+        graph = self.study_assay_mixin.graph
+        plink(collection, extraction)
+        self.assertGreater(self.study_assay_mixin.graph_version, version)
+        self.assertIsNot(self.study_assay_mixin.graph, graph)
+
+        version = self.study_assay_mixin.graph_version
+        graph = self.study_assay_mixin.graph
+        self.study_assay_mixin.process_sequence = [collection, extraction]
+        self.assertGreater(self.study_assay_mixin.graph_version, version)
+        self.assertIsNot(self.study_assay_mixin.graph, graph)
+
+        version = self.study_assay_mixin.graph_version
+        graph = self.study_assay_mixin.graph
+        extraction.outputs = [Material(name='extract')]
+        self.assertIs(self.study_assay_mixin.graph, graph)
+        process_graph = self.study_assay_mixin.process_graph
+        rebuilt_graph = self.study_assay_mixin.rebuild_graph()
+        self.assertIsNot(self.study_assay_mixin.process_graph, process_graph)
+        self.assertIsNot(rebuilt_graph, graph)
+        self.assertIs(self.study_assay_mixin.graph, rebuilt_graph)
+        self.assertEqual(len(rebuilt_graph.nodes), 5)
+        self.assertGreater(self.study_assay_mixin.graph_version, version)
+
+    def test_table_loader(self):
+        calls = []
+
+        def table_loader(study_assay):
+            calls.append(study_assay)
+            study_assay.samples = [self.sample]
+            study_assay.process_sequence = [self.process]
+
+        self.study_assay_mixin.set_table_loader(table_loader)
+        self.assertFalse(self.study_assay_mixin.table_loaded)
+        self.assertEqual(self.study_assay_mixin.filename, '')
+        self.assertEqual(calls, [])
+        self.assertEqual(self.study_assay_mixin.process_sequence, [self.process])
+        self.assertEqual(self.study_assay_mixin.samples, [self.sample])
+        self.assertEqual(calls, [self.study_assay_mixin])
+        self.assertTrue(self.study_assay_mixin.table_loaded)
+
+        # setting an attribute loads the table first so it does not get overwritten later
+        self.study_assay_mixin.set_table_loader(table_loader)
+        self.study_assay_mixin.samples = []
+        self.assertEqual(self.study_assay_mixin.samples, [])
+        self.assertEqual(len(calls), 2)
+
+    def test_table_loader_error(self):
+        def table_loader(study_assay):
+            raise IOError('Test error')
+
+        self.study_assay_mixin.set_table_loader(table_loader)
+        with self.assertRaises(IOError):
+            self.study_assay_mixin.sources
+        self.assertFalse(self.study_assay_mixin.table_loaded)
+
     def test_shuffle_samples(self):
         samples = [
             Sample(name="Sample1"),
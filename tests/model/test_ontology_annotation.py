@@ -57,7 +57,7 @@ class TestOntologyAnnotation(TestCase):
                         "term_source='test_term_source', "
                         "term_accession='test_term_accession', "
                         "comments=[])")
-        expected_hash = hash(expected_str)
+        expected_hash = hash(('test_term', 'test_term_accession'))
         self.assertTrue(self.ontology_annotation.__repr__() == expected_str)
         self.assertTrue(self.ontology_annotation.__hash__() == expected_hash)
 
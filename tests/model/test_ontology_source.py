@@ -67,7 +67,7 @@ class TestOntologySource(TestCase):
                                     "comments={num} Comment objects\n)")
         expected_output = expected_output_template.format(num=0)
         self.assertTrue(self.ontology_source.__str__() == expected_output)
-        self.assertTrue(self.ontology_source.__hash__() == hash(expected_str))
+        self.assertTrue(self.ontology_source.__hash__() == hash(self.ontology_source.name))
         self.ontology_source.add_comment(name='test_name', value_='test_value')
         expected_output = expected_output_template.format(num=1)
         self.assertTrue(self.ontology_source.__str__() == expected_output)
@@ -66,7 +66,7 @@ class TestParameterValue(TestCase):
         self.assertEqual(str(self.parameter), expected_str)
 
     def test_hash(self):
-        self.assertEqual(hash(self.parameter), hash(expected_repr))
+        self.assertEqual(hash(self.parameter), hash((self.parameter.category, self.parameter.value)))
 
     def test_equalities(self):
         second_parameter = ParameterValue(category=ProtocolParameter(parameter_name=OntologyAnnotation(term='test')))
@@ -174,7 +174,7 @@ class TestProtocol(TestCase):
         self.assertTrue(str(self.protocol) == expected_str)
 
     def test_hash(self):
-        self.assertTrue(hash(self.protocol) == hash(expected_repr_string))
+        self.assertTrue(hash(self.protocol) == hash(self.protocol.name))
 
     def test_equalities(self):
         second_protocol = Protocol(name='test_name', version='1.0')
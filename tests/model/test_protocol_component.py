@@ -38,7 +38,7 @@ class TestProtocolComponent(TestCase):
         expected_str = ("isatools.model.ProtocolComponent(name='', category=isatools.model.OntologyAnnotation(term='', "
                         "term_source=None, term_accession='', comments=[]), comments=[])")
         self.assertEqual(repr(self.protocol_component), expected_str)
-        self.assertEqual(hash(self.protocol_component), hash(expected_str))
+        self.assertEqual(hash(self.protocol_component), hash(self.protocol_component.name))
 
     def test_str(self):
         expected_str = """ProtocolComponent(
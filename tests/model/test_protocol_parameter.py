@@ -32,7 +32,7 @@ class TestProtocolParameter(TestCase):
                       "comments=[])")
         expected_str = "isatools.model.ProtocolParameter(parameter_name={0}, comments=[])".format(param_name)
         self.assertEqual(protocol_parameter.__repr__(), expected_str)
-        self.assertTrue(hash(protocol_parameter) == hash(expected_str))
+        self.assertTrue(hash(protocol_parameter) == hash(protocol_parameter.parameter_name))
 
     def test_str(self):
         protocol_parameter.parameter_name = 'test_parameter_name'
@@ -74,7 +74,7 @@ class TestPublication(TestCase):
         self.assertTrue(str(self.publication) == expected_str)
 
     def test_hash(self):
-        self.assertTrue(hash(self.publication) == hash(expected_repr))
+        self.assertTrue(hash(self.publication) == hash((self.publication.pubmed_id, self.publication.doi, self.publication.title)))
 
     def test_equalities(self):
         second_publication = Publication(doi='123', pubmed_id='123', author_list='123', title='123', status=None)
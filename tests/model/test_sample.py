@@ -1,3 +1,4 @@
+import pickle
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -91,7 +92,7 @@ class TestSample(TestCase):
         expected_str = ("isatools.model.Sample(name='', characteristics=[], factor_values=[],"
                         " derives_from=[], comments=[])")
         self.assertTrue(repr(self.sample) == expected_str)
-        self.assertTrue(hash(self.sample) == hash(expected_str))
+        self.assertTrue(hash(self.sample) == hash(self.sample.name))
 
     def test_str(self):
         expected_str = ("Sample(\n\t"
@@ -108,6 +109,20 @@ class TestSample(TestCase):
         self.assertEqual(first_sample, second_sample)
         self.assertNotEqual(first_sample, self.sample)
 
+    def test_slots(self):
+        source = Source(name='source1')
+        sample = Sample(name='sample1', derives_from=[source],
+                        characteristics=[Characteristic(category='organism', value='Homo sapiens')],
+                        factor_values=[FactorValue(factor_name=StudyFactor(name='dose'), value=1)])
+        self.assertEqual(vars(sample), {})
+        self.assertEqual(vars(sample.characteristics[0]), {})
+        copied_sample = pickle.loads(pickle.dumps(sample))
+        self.assertEqual(copied_sample, sample)
+        self.assertEqual(copied_sample.id, sample.id)
+        self.assertEqual(copied_sample.sequence_identifier, sample.sequence_identifier)
+        sample.derived_from = source
+        self.assertEqual(vars(sample), {'derived_from': source})
+
     @patch('isatools.model.factor_value.uuid4', return_value='test_uuid')
     def test_to_dict(self, mock_uuid):
         self.sample.name = 'test_name'
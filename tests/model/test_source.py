@@ -74,7 +74,7 @@ class TestSource(TestCase):
         self.assertTrue(str(self.source) == expected_str)
 
     def test_hash(self):
-        self.assertTrue(hash(self.source) == hash(expected_repr))
+        self.assertTrue(hash(self.source) == hash(self.source.name))
 
     def test_equalities(self):
         source_a = Source(name='sars-cov2', characteristics=None)
@@ -166,7 +166,7 @@ class StudyTest(TestCase):
                         "samples=[], process_sequence=[], other_material=[], "
                         "characteristic_categories=[], comments=[], units=[])")
         self.assertEqual(expected_str, repr(self.study))
-        self.assertEqual(hash(expected_str), hash(self.study))
+        self.assertEqual(hash((self.study.filename, self.study.identifier)), hash(self.study))
 
     def test_str(self):
         self.assertEqual("""Study(
@@ -6,6 +6,7 @@ import logging
 import os
 import shutil
 import tempfile
+import time
 import unittest
 from io import StringIO
 from jsonschema.exceptions import ValidationError
@@ -70,6 +71,21 @@ class TestIsaGraph(unittest.TestCase):
                 log.error('jsonschema ValidationError, skipping...')
 
 
+class TestIterProcessResults(unittest.TestCase):
+
+    def test_iter_process_results(self):
+        results = list(utils.iter_process_results(os.path.basename, ['a/b', 'c/d', 1], workers=2))
+        self.assertListEqual([(index, result) for index, result, _ in results], [(0, 'b'), (1, 'd'), (2, None)])
+        self.assertIsNone(results[0][2])
+        self.assertIsInstance(results[2][2], TypeError)
+
+    def test_iter_process_results_timeout(self):
+        results = list(utils.iter_process_results(time.sleep, [30, 0], workers=2, timeout=1, ordered=False))
+        self.assertListEqual([(index, result) for index, result, _ in results], [(1, None), (0, None)])
+        self.assertIsNone(results[0][2])
+        self.assertIsInstance(results[1][2], TimeoutError)
+
+
 class TestOlsSearch(unittest.TestCase):
 
     def test_get_ontologies(self):
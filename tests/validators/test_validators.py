@@ -1,10 +1,15 @@
 import unittest
 from isatools import isajson, isatab
+from isatools.isajson.validate import default_isa_json_schemas_dir, get_schema_validator
 import os
+import json
 from isatools.tests import utils
 import tempfile
 import shutil
 import logging
+from importlib import import_module
+
+from jsonschema import ValidationError
 
 from isatools.isatab.defaults import log
 log.disabled = True
@@ -51,6 +56,121 @@ class TestValidateIsaJson(unittest.TestCase):
             if 3 not in [e['code'] for e in report['errors']]:
                 self.fail("NO error raised when validating against some non-ISA-JSON conforming JSON!")
 
+    def test_validate_isajson_schema_validator_cache(self):
+        """Tests the validator used for 0003 and 4003"""
+        schema_path = os.path.join(default_isa_json_schemas_dir, 'investigation_schema.json')
+        schema_validator = get_schema_validator(schema_path)
+        self.assertIs(get_schema_validator(os.path.abspath(schema_path)), schema_validator)
+        with open(os.path.join(utils.JSON_DATA_DIR, 'BII-S-3', 'BII-S-3.json')) as fp:
+            isa_json = json.load(fp)
+        schema_validator.validate(isa_json)
+        isa_json['studies'] = {}
+        with self.assertRaises(ValidationError):
+            schema_validator.validate(isa_json)
+
+    def test_validate_isajson_index_rules(self):
+        """Tests the rules 1002-1022 and 3001-3010 evaluated on an ISAJSONIndex"""
+        with open(os.path.join(utils.JSON_DATA_DIR, 'BII-S-3', 'BII-S-3.json')) as fp:
+            isa_json = json.load(fp)
+        study_json = isa_json['studies'][0]
+        study_json['publicReleaseDate'] = '15/08/2008'
+        study_json['protocols'][0]['name'] = ''
+        study_json['processSequence'][0]['previousProcess'] = {'@id': '#process/missing'}
+        study_json['assays'][0]['processSequence'][0]['inputs'].append({'@id': '#material/missing'})
+        isa_json['publications'].append({'doi': 'not a doi', 'pubMedID': '123'})
+        # the isajson package exports the validate function under the name of the module
+        validate = import_module('isatools.isajson.validate')
+
+        def findings(check):
+            validate.errors, validate.warnings = [], []
+            check()
+            return validate.errors, validate.warnings
+
+        expected = findings(lambda: validate.check_rules(isa_json))
+        self.assertEqual(findings(lambda: validate.ISAJSONIndex(isa_json).check_rules()), expected)
+        self.assertEqual({error['code'] for error in expected[0]}, {1005, 1006})
+        self.assertTrue({1010, 3001, 3002, 3003}.issubset({warning['code'] for warning in expected[1]}))
+        annotations = []
+        validate.walk_and_get_annotations(isa_json, annotations)
+        self.assertEqual(list(validate._iter_annotations(isa_json)), annotations)
+
+    def test_validate_isajson_parse_once(self):
+        """Tests the study groups and 0010 when the JSON is parsed once"""
+        file_path = os.path.join(utils.JSON_DATA_DIR, 'BII-S-3', 'BII-S-3.json')
+        with open(file_path) as fp:
+            isa_json = json.load(fp)
+        isa_json['studies'][0]['comments'].append({'name': 'Number of Study Groups', 'value': '3'})
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            groups_path = os.path.join(tmp_dir, 'study_groups.json')
+            with open(groups_path, 'w') as fp:
+                json.dump(isa_json, fp)
+            latin1_path = os.path.join(tmp_dir, 'latin1.json')
+            with open(latin1_path, 'w', encoding='latin-1') as fp:
+                json.dump(dict(isa_json, title='Caf\u00e9'), fp, ensure_ascii=False)
+            for path in (file_path, groups_path):
+                with open(path) as fp:
+                    expected = isajson.validate(fp)
+                with open(path) as fp:
+                    self.assertEqual(isajson.validate(fp, parse_once=True), expected)
+            self.assertIn(5002, [warning['code'] for warning in expected['warnings']])
+            with open(latin1_path) as fp:
+                report = isajson.validate(fp, parse_once=True)
+            self.assertEqual([warning['code'] for warning in report['warnings']], [10])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_validate_isajson_study_and_assay_graphs(self):
+        """Tests against 4004 on chains of processes sharing their first processes, or forming a loop"""
+        validate = import_module('isatools.isajson.validate')
+
+        def process(process_id, protocol_id, previous_id=None, next_id=None):
+            process_json = {'@id': process_id, 'executesProtocol': {'@id': protocol_id},
+                            'inputs': [{'@id': '#material/' + process_id}], 'outputs': []}
+            if previous_id:
+                process_json['previousProcess'] = {'@id': previous_id}
+            if next_id:
+                process_json['nextProcess'] = {'@id': next_id}
+            return process_json
+
+        study_json = {
+            'protocols': [{'@id': protocol_id, 'protocolType': {'annotationValue': protocol_type}}
+                          for protocol_id, protocol_type in [('#collection', 'sample collection'),
+                                                             ('#extraction', 'extraction'),
+                                                             ('#labeling', 'labeling')]],
+            'processSequence': [process('#s1', '#collection')],
+            'assays': [{
+                'measurementType': {'annotationValue': 'm'},
+                'technologyType': {'annotationValue': 't'},
+                'processSequence': [
+                    process('#a0', '#collection', next_id='#a1'),
+                    process('#a1', '#extraction', '#a0', '#a2'),
+                    process('#a2', '#labeling', '#a1'),
+                    process('#a3', '#labeling', '#a1'),
+                    process('#a4', '#labeling', '#a5'),
+                    process('#a5', '#extraction', '#a4', '#a4'),
+                    process('#a6', '#labeling', '#a7'),
+                    process('#a7', '#extraction', '#a8', '#a6'),
+                    process('#a8', '#labeling', '#a9', '#a7'),
+                    process('#a9', '#collection', next_id='#a8')
+                ]
+            }]
+        }
+        configs = {
+            'study': {'description': 'study', 'protocols': [{'protocol': 'sample collection'}]},
+            ('m', 't'): {'description': 'assay', 'protocols': [{'protocol': 'extraction'}, {'protocol': 'labeling'}]}
+        }
+        protocol_sequences = {}
+        validate.warnings = []
+        validate.check_study_and_assay_graphs(study_json, configs, protocol_sequences)
+        self.assertEqual(validate.warnings, [{
+            'message': 'Process sequence is not valid against configuration',
+            'supplemental': "Config protocol sequence ['extraction', 'labeling'] does not in assay protocol "
+                            "sequence ['labeling', 'extraction', 'labeling']",
+            'code': 4004
+        }])
+        self.assertEqual(protocol_sequences, {'study': ['sample collection'], ('m', 't'): ['extraction', 'labeling']})
+
     def test_validate_isajson_utf8_encoding_check(self):
         """Tests against 0010"""
         with open(os.path.join(self._unit_json_data_dir, 'minimal_syntax.json')) as fp:
@@ -461,6 +581,24 @@ class TestBatchValidateIsaTab(unittest.TestCase):
         batch_report = isatab.batch_validate(self._bii_tab_dir_list)
         self.assertTrue(len([f['filename'] for f in batch_report['batch_report']]) == len(self._bii_tab_dir_list))
 
+    def test_batch_validate_bii_with_workers(self):
+        batch_report = isatab.batch_validate(self._bii_tab_dir_list)
+        parallel_batch_report = isatab.batch_validate(self._bii_tab_dir_list, workers=2)
+        self.assertListEqual([f['filename'] for f in parallel_batch_report['batch_report']],
+                             [f['filename'] for f in batch_report['batch_report']])
+        for file_report, parallel_file_report in zip(batch_report['batch_report'],
+                                                     parallel_batch_report['batch_report']):
+            self.assertEqual(len(parallel_file_report['report']['errors']), len(file_report['report']['errors']))
+            self.assertEqual(len(parallel_file_report['report']['warnings']),
+                             len(file_report['report']['warnings']))
+
+    def test_batch_validate_timeout(self):
+        batch_report = isatab.batch_validate(self._bii_tab_dir_list, workers=3, timeout=0.001, ordered=False)
+        self.assertEqual(len(batch_report['batch_report']), len(self._bii_tab_dir_list))
+        for file_report in batch_report['batch_report']:
+            self.assertFalse(file_report['report']['validation_finished'])
+            self.assertEqual(file_report['report']['errors'][0]['message'], 'Validation timed out')
+
 
 class TestBatchValidateIsaJson(unittest.TestCase):
 
@@ -479,3 +617,10 @@ class TestBatchValidateIsaJson(unittest.TestCase):
     def test_batch_validate_bii(self):
         batch_report = isajson.batch_validate(self._bii_json_files)
         self.assertListEqual([f['filename'] for f in batch_report['batch_report']], self._bii_json_files)
+
+    def test_batch_validate_bii_s_3_with_workers(self):
+        json_files = [self._bii_json_files[1]] * 2
+        batch_report = isajson.batch_validate(json_files, workers=2)
+        self.assertListEqual([f['filename'] for f in batch_report['batch_report']], json_files)
+        self.assertEqual(batch_report['batch_report'][0]['report'],
+                         isajson.batch_validate(json_files[:1])['batch_report'][0]['report'])